@@ -24,7 +24,7 @@ CRITICAL RULES:
 - Be conservative: flag risks early, explain clearly.
 
 YOUR JOB:
-1. Detect concentration risk (single pool dominates an agent's backing).
+1. Detect concentration risk (single pool dominates an agent's backing; concentration_risk gives HHI per agent).
 2. Identify potential manipulation patterns (wash trading, pump-and-dump).
 3. Calculate cascade probability (if one agent crashes, how many follow?).
 4. Flag bubble conditions (price disconnected from fundamentals).
@@ -2,7 +2,8 @@
 Tool implementations for Bedrock agents.
 
 These are called when Bedrock returns a tool_use block.
-market_snapshot() → current market state
+market_snapshot()    → current market state
+concentration_risk() → Herfindahl concentration of agent / pool backing
 """
 
 import logging
@@ -42,6 +43,28 @@ TOOL_DEFINITIONS = [
             },
         }
     },
+    {
+        "toolSpec": {
+            "name": "concentration_risk",
+            "description": (
+                "Returns Herfindahl (HHI) concentration of capital backing. Lists agents whose "
+                "HHI is above 0.4 (a few pools dominate their backing) with their largest pool, "
+                "and the named pools whose holdings are most concentrated in few agents."
+            ),
+            "inputSchema": {
+                "json": {
+                    "type": "object",
+                    "properties": {
+                        "limit": {
+                            "type": "integer",
+                            "description": "Maximum agents and pools to return (default 10)",
+                        },
+                    },
+                    "required": [],
+                }
+            },
+        }
+    },
 ]
 
 
@@ -65,7 +88,11 @@ class ToolExecutor:
 
         try:
             if tool_name == "market_snapshot":
-                result = self._market_snapshot(tool_input)
+                return self._market_snapshot(tool_input)
+            elif tool_name == "concentration_risk":
+                result = self.engine.concentration.report(
+                    self.engine.state.agents, min(int(tool_input.get("limit", 10)), 100),
+                )
             else:
                 result = {"error": f"Unknown tool: {tool_name}"}
         except Exception as e:
@@ -74,18 +101,10 @@ class ToolExecutor:
 
         return json.dumps(result)
 
-    def _market_snapshot(self, tool_input: dict) -> dict:
-        snapshot = self.engine.get_snapshot()
-        sector_filter = tool_input.get("sector_filter")
-
-        if sector_filter:
-            snapshot["agents"] = [
-                a for a in snapshot["agents"] if a["sector"] == sector_filter
-            ]
-
-        if not tool_input.get("include_history", False):
-            # Strip price_history to keep response concise
-            for agent in snapshot["agents"]:
-                agent.pop("price_history", None)
-
-        return snapshot
+    def _market_snapshot(self, tool_input: dict) -> str:
+        # Shares the tick's cached encoding with REST and other agents.
+        snapshot = self.engine.latest_snapshot
+        return snapshot.json(
+            sector=tool_input.get("sector_filter") or None,
+            include_history=bool(tool_input.get("include_history", False)),
+        ).decode()
@@ -0,0 +1,295 @@
+"""
+WebSocket connection management.
+
+Every connection gets its own writer task draining a bounded outbound queue,
+so broadcasting is a non-blocking enqueue of a shared Frame and one stalled
+socket never holds up the others. A Frame is encoded at most once per wire
+format (JSON text, or MessagePack for `aex.msgpack` clients), whichever
+connection sends it first.
+
+A connection whose queue fills up is lagging. What happens next depends on
+WS_SLOW_CLIENT_POLICY:
+
+  downgrade  v1 clients keep only the newest frame (each is a full state);
+             v2 clients drop to keyframe-only until their queue drains, then
+             get a fresh keyframe and resume deltas. A client that still
+             can't keep up with keyframes alone is evicted.
+  evict      close the connection
+
+Clients subscribed to topics (see api/topics.py) skip the full tick stream
+and get one shared, pre-encoded frame per subscribed topic instead. When
+such a client lags under `downgrade`, its queue is coalesced per topic: the
+newest frame of each topic stays queued and older ones are dropped.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Iterable
+
+from fastapi import WebSocket
+
+from backend.services.market_engine.snapshot import MarketSnapshot
+from .delta_stream import DeltaStream
+from .encoding import Frame, WS_MSGPACK_SUBPROTOCOL
+from .topics import is_tick_topic, topic_frame
+
+logger = logging.getLogger(__name__)
+
+SEND_QUEUE_SIZE = int(os.environ.get("WS_SEND_QUEUE_SIZE", 8))
+SLOW_CLIENT_POLICY = os.environ.get("WS_SLOW_CLIENT_POLICY", "downgrade")   # downgrade | evict
+
+_CLOSE_TRY_AGAIN_LATER = 1013
+
+
+class Connection:
+    __slots__ = (
+        "ws", "protocol", "binary", "queue", "task", "topics",
+        "wants_keyframe", "keyframe_only", "closed",
+        "sent", "dropped",
+    )
+
+    def __init__(self, ws: WebSocket, protocol: int, queue_size: int, binary: bool = False):
+        self.ws = ws
+        self.protocol = protocol
+        self.binary = binary            # MessagePack frames (aex.msgpack subprotocol)
+        self.queue: asyncio.Queue[Frame] = asyncio.Queue(maxsize=queue_size)
+        self.task: asyncio.Task | None = None
+        self.topics: set[str] = set()   # empty = full tick stream
+        self.wants_keyframe = False     # v2: send a keyframe in place of the next delta
+        self.keyframe_only = False      # v2: downgraded while lagging
+        self.closed = False
+        self.sent = 0
+        self.dropped = 0
+
+    @property
+    def lag(self) -> int:
+        return self.queue.qsize()
+
+    def offer(self, frame: Frame) -> bool:
+        """Enqueue without waiting. Returns False if the queue is full."""
+        try:
+            self.queue.put_nowait(frame)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def clear(self) -> None:
+        while not self.queue.empty():
+            self.queue.get_nowait()
+            self.dropped += 1
+
+    def coalesce(self, latest: Frame) -> None:
+        """Keep only the newest queued frame per topic, with `latest` as the newest of its topic."""
+        newest: dict[str, Frame] = {}
+        drained = 0
+        while not self.queue.empty():
+            frame = self.queue.get_nowait()
+            newest.pop(_topic_of(frame), None)      # re-insert so order stays oldest first
+            newest[_topic_of(frame)] = frame
+            drained += 1
+        newest.pop(_topic_of(latest), None)
+        newest[_topic_of(latest)] = latest
+        keep = list(newest.values())[-self.queue.maxsize:]
+        self.dropped += drained + 1 - len(keep)
+        for frame in keep:
+            self.queue.put_nowait(frame)
+
+
+def _topic_of(frame: Frame) -> str:
+    """Topic frames carry their topic; events (e.g. shocks) are keyed by type."""
+    message = frame.message
+    return message.get("topic") or message.get("type", "")
+
+
+class ConnectionManager:
+    def __init__(self, queue_size: int = SEND_QUEUE_SIZE, slow_client_policy: str = SLOW_CLIENT_POLICY):
+        self.queue_size = queue_size
+        self.slow_client_policy = slow_client_policy
+        self.connections: dict[WebSocket, Connection] = {}
+        self.topic_subscribers: dict[str, set[Connection]] = {}
+        self.delta_stream = DeltaStream()
+        self.evicted = 0
+
+    @property
+    def active(self) -> list[WebSocket]:
+        return list(self.connections)
+
+    @property
+    def has_full_clients(self) -> bool:
+        return any(c.protocol == 1 and not c.topics for c in self.connections.values())
+
+    @property
+    def delta_client_count(self) -> int:
+        return sum(1 for c in self.connections.values() if c.protocol >= 2 and not c.topics)
+
+    @property
+    def has_delta_clients(self) -> bool:
+        return any(c.protocol >= 2 and not c.topics for c in self.connections.values())
+
+    async def connect(self, ws: WebSocket, protocol: int = 1, subprotocol: str | None = None) -> Connection:
+        await ws.accept(subprotocol=subprotocol)
+        conn = Connection(ws, protocol, self.queue_size, binary=subprotocol == WS_MSGPACK_SUBPROTOCOL)
+        self.attach(conn)
+        logger.info("WS client connected (v%d%s). Total: %d",
+                    protocol, ", binary" if conn.binary else "", len(self.connections))
+        return conn
+
+    def attach(self, conn: Connection) -> None:
+        """Register an accepted connection and start its writer task."""
+        self.connections[conn.ws] = conn
+        conn.task = asyncio.create_task(self._writer(conn))
+
+    def disconnect(self, ws: WebSocket) -> None:
+        conn = self.connections.pop(ws, None)
+        if conn is None:
+            return
+        conn.closed = True
+        self._drop_topics(conn, list(conn.topics))
+        if conn.task and conn.task is not asyncio.current_task():
+            conn.task.cancel()
+        logger.info("WS client disconnected. Total: %d", len(self.connections))
+
+    def request_keyframe(self, ws: WebSocket) -> None:
+        conn = self.connections.get(ws)
+        if conn is not None:
+            conn.wants_keyframe = True
+
+    # ── Topic subscriptions ──────────────────────────────────────────────────
+
+    def subscribe(self, conn: Connection, topics: Iterable[str]) -> list[str]:
+        """Add validated topics to a connection. Returns the ones that were new."""
+        added = [t for t in dict.fromkeys(topics) if t not in conn.topics]
+        for topic in added:
+            conn.topics.add(topic)
+            self.topic_subscribers.setdefault(topic, set()).add(conn)
+        return added
+
+    def unsubscribe(self, conn: Connection, topics: Iterable[str]) -> None:
+        self._drop_topics(conn, [t for t in topics if t in conn.topics])
+        if not conn.topics:
+            # Back on the full stream; v2 deltas need a fresh baseline.
+            conn.wants_keyframe = True
+
+    def _drop_topics(self, conn: Connection, topics: list[str]) -> None:
+        for topic in topics:
+            conn.topics.discard(topic)
+            subs = self.topic_subscribers.get(topic)
+            if subs is not None:
+                subs.discard(conn)
+                if not subs:
+                    del self.topic_subscribers[topic]
+
+    # ── Fan-out (never awaits a client) ──────────────────────────────────────
+
+    def broadcast(self, frame: Frame) -> None:
+        """Queue one event frame for every client."""
+        for conn in list(self.connections.values()):
+            if not conn.offer(frame):
+                self._on_lagging(conn, frame)
+
+    def publish_event(self, topic: str, frame: Frame) -> None:
+        """Queue an event for full-stream clients and for subscribers of `topic`."""
+        for conn in list(self.connections.values()):
+            if (not conn.topics or topic in conn.topics) and not conn.offer(frame):
+                self._on_lagging(conn, frame)
+
+    def broadcast_topics(self, snapshot: MarketSnapshot) -> None:
+        """Queue each subscribed tick topic's frame, encoded once per topic."""
+        for topic, subs in list(self.topic_subscribers.items()):
+            if not is_tick_topic(topic):
+                continue
+            frame = topic_frame(snapshot, topic)
+            if frame is None:
+                continue
+            for conn in list(subs):
+                if not conn.offer(frame):
+                    self._on_lagging(conn, frame)
+
+    def broadcast_full(self, frame: Frame) -> None:
+        """Queue this tick's v1 frame for every full-snapshot client."""
+        for conn in list(self.connections.values()):
+            if conn.protocol == 1 and not conn.topics and not conn.offer(frame):
+                self._on_lagging(conn, frame)
+
+    def broadcast_delta(self, frame: Frame) -> None:
+        """
+        Queue this tick's v2 frame. Clients that asked to resync, or are
+        recovering from a downgrade, get the current keyframe instead.
+        """
+        stream = self.delta_stream
+        for conn in list(self.connections.values()):
+            if conn.protocol < 2 or conn.topics:
+                continue
+            if conn.keyframe_only:
+                if not stream.at_keyframe:
+                    continue
+                if not conn.offer(frame):
+                    self._evict(conn, "lagging in keyframe-only mode")
+                continue
+            out = frame
+            if conn.wants_keyframe:
+                conn.wants_keyframe = False
+                out = stream.keyframe()
+            if not conn.offer(out):
+                self._on_lagging(conn, stream.keyframe())
+
+    def _on_lagging(self, conn: Connection, latest: Frame) -> None:
+        if self.slow_client_policy == "evict":
+            self._evict(conn, "send queue full")
+            return
+        if conn.topics:
+            # Each topic frame is a full state for that topic alone, so keep
+            # the newest one per topic rather than only the last frame sent.
+            conn.coalesce(latest)
+            return
+        conn.clear()
+        if conn.protocol >= 2 and not conn.topics:
+            # The dropped deltas can't be replayed; restart from a keyframe
+            # once the client has drained what it already has.
+            conn.keyframe_only = True
+            logger.info("WS client downgraded to keyframe-only (lag %d)", self.queue_size)
+        conn.offer(latest)
+
+    def _evict(self, conn: Connection, reason: str) -> None:
+        self.evicted += 1
+        logger.warning("Evicting WS client: %s", reason)
+        self.disconnect(conn.ws)
+        asyncio.create_task(self._close(conn.ws))
+
+    @staticmethod
+    async def _close(ws: WebSocket) -> None:
+        try:
+            await ws.close(code=_CLOSE_TRY_AGAIN_LATER)
+        except Exception:
+            pass
+
+    async def _writer(self, conn: Connection) -> None:
+        try:
+            while True:
+                frame = await conn.queue.get()
+                if conn.binary:
+                    await conn.ws.send_bytes(frame.binary())
+                else:
+                    await conn.ws.send_text(frame.text())
+                conn.sent += 1
+                if conn.keyframe_only and conn.queue.empty():
+                    conn.keyframe_only = False
+                    conn.wants_keyframe = True
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.disconnect(conn.ws)
+
+    def stats(self) -> dict:
+        conns = list(self.connections.values())
+        return {
+            "connections": len(conns),
+            "delta_clients": self.delta_client_count,
+            "topic_clients": sum(1 for c in conns if c.topics),
+            "topics": {t: len(subs) for t, subs in self.topic_subscribers.items()},
+            "keyframe_only": sum(1 for c in conns if c.keyframe_only),
+            "max_lag": max((c.lag for c in conns), default=0),
+            "dropped_frames": sum(c.dropped for c in conns),
+            "evicted": self.evicted,
+        }
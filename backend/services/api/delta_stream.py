@@ -0,0 +1,158 @@
+"""
+Delta-encoded WebSocket tick stream (protocol v2).
+
+Protocol v1 sends every agent every tick. v2 keeps one shared baseline (the
+agent values clients last received) and per tick sends either:
+
+  keyframe  every agent's baseline values; sent on connect, on resync, every
+            WS_KEYFRAME_INTERVAL ticks and whenever the agent universe changes
+  delta     only agents whose fields moved beyond tolerance since the baseline
+
+Every frame carries a `seq` that increases by exactly one per broadcast
+frame. A client that sees a gap sends {"type": "resync"} and gets a keyframe
+in place of its next delta. Because the baseline is shared, each frame is
+encoded once per tick no matter how many clients are connected.
+"""
+
+import os
+
+import numpy as np
+
+from backend.services.market_engine.snapshot import MarketSnapshot
+from .encoding import Frame
+
+PROTOCOL_VERSION = 2
+KEYFRAME_INTERVAL = int(os.environ.get("WS_KEYFRAME_INTERVAL", 30))
+PRICE_TOLERANCE = float(os.environ.get("WS_DELTA_PRICE_TOLERANCE", 0.001))  # relative
+
+# Absolute tolerances for the derived fields. Both drift a little every tick
+# (window slide, inflow decay), so they only trigger on visible moves.
+CHANGE_PCT_TOLERANCE = 0.25
+INFLOW_TOLERANCE = 0.01
+
+_DIRECTION_CODES = {"down": -1, "flat": 0, "up": 1}
+
+
+def _entry(agent: dict) -> dict:
+    return {
+        "id": agent["id"],
+        "price": agent["price"],
+        "price_change_pct": agent["price_change_pct"],
+        "inflow_velocity": agent["inflow_velocity"],
+        "inflow_direction": agent["inflow_direction"],
+    }
+
+
+class DeltaStream:
+    def __init__(self, keyframe_interval: int = KEYFRAME_INTERVAL,
+                 price_tolerance: float = PRICE_TOLERANCE):
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.price_tolerance = price_tolerance
+
+        self.seq = 0
+        self._since_keyframe = 0
+        self._ids: list[str] = []
+        self._entries: list[dict] = []
+        self._price = np.empty(0)
+        self._change = np.empty(0)
+        self._inflow = np.empty(0)
+        self._direction = np.empty(0, dtype=np.int8)
+        self._market: dict = {}
+        self._keyframe: Frame | None = None
+
+    @property
+    def at_keyframe(self) -> bool:
+        """True if the most recent frame was a keyframe."""
+        return self._since_keyframe == 0
+
+    def rebase(self, snapshot: MarketSnapshot) -> None:
+        """Reset the baseline to `snapshot`. Only safe when no v2 client is connected."""
+        self._set_baseline(snapshot.data)
+        self.seq += 1
+
+    def advance(self, snapshot: MarketSnapshot) -> Frame:
+        """
+        Produce this tick's frame and move the baseline forward.
+        Call exactly once per broadcast tick.
+        """
+        data = snapshot.data
+        agents = data["agents"]
+        self.seq += 1
+        self._since_keyframe += 1
+
+        if (self._since_keyframe >= self.keyframe_interval
+                or len(agents) != len(self._ids)
+                or [a["id"] for a in agents] != self._ids):
+            self._set_baseline(data)
+            return self.keyframe()
+
+        price, change, inflow, direction = self._columns(agents)
+        changed = (
+            (np.abs(price - self._price) > self.price_tolerance * np.maximum(np.abs(self._price), 1e-9))
+            | (np.abs(change - self._change) > CHANGE_PCT_TOLERANCE)
+            | (np.abs(inflow - self._inflow) > INFLOW_TOLERANCE)
+            | (direction != self._direction)
+        )
+        idx = np.flatnonzero(changed)
+        self._price[idx] = price[idx]
+        self._change[idx] = change[idx]
+        self._inflow[idx] = inflow[idx]
+        self._direction[idx] = direction[idx]
+
+        updates = []
+        for i in idx.tolist():
+            self._entries[i] = _entry(agents[i])
+            updates.append(self._entries[i])
+        self._market = self._market_fields(data)
+        self._keyframe = None
+
+        return Frame({
+            "type": "delta",
+            "v": PROTOCOL_VERSION,
+            "seq": self.seq,
+            **self._market,
+            "agents": updates,
+        })
+
+    def keyframe(self) -> Frame:
+        """Full baseline at the current seq; one Frame (and encoding) per seq."""
+        if self._keyframe is None:
+            self._keyframe = Frame({
+                "type": "keyframe",
+                "v": PROTOCOL_VERSION,
+                "seq": self.seq,
+                "keyframe_interval": self.keyframe_interval,
+                **self._market,
+                # Copy: later deltas replace entries in place, and the frame
+                # may be encoded after that.
+                "agents": list(self._entries),
+            })
+        return self._keyframe
+
+    def _set_baseline(self, data: dict) -> None:
+        agents = data["agents"]
+        self._ids = [a["id"] for a in agents]
+        self._entries = [_entry(a) for a in agents]
+        self._price, self._change, self._inflow, self._direction = self._columns(agents)
+        self._market = self._market_fields(data)
+        self._since_keyframe = 0
+        self._keyframe = None
+
+    @staticmethod
+    def _columns(agents: list[dict]) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        n = len(agents)
+        return (
+            np.fromiter((a["price"] for a in agents), np.float64, n),
+            np.fromiter((a["price_change_pct"] for a in agents), np.float64, n),
+            np.fromiter((a["inflow_velocity"] for a in agents), np.float64, n),
+            np.fromiter((_DIRECTION_CODES[a["inflow_direction"]] for a in agents), np.int8, n),
+        )
+
+    @staticmethod
+    def _market_fields(data: dict) -> dict:
+        return {
+            "tick_number": data["tick_number"],
+            "total_market_cap": data["total_market_cap"],
+            "active_shocks": len(data["active_shocks"]),
+            "cascade_probability": data["cascade_probability"],
+        }
@@ -0,0 +1,168 @@
+"""
+Wire encodings for REST and WebSocket payloads.
+
+JSON stays the default. Clients that send `Accept: application/msgpack` (REST)
+or request the `aex.msgpack` WebSocket subprotocol get MessagePack instead,
+with agent lists packed column-wise:
+
+    "agents": {
+        "columnar": true,
+        "count": N,
+        "dtypes": {"price": "<f4", "market_cap": "<f8", ...},
+        "columns": {"id": [...], "price": <bin>, "market_cap": <bin>, ...}
+    }
+
+Numeric columns listed in `dtypes` are raw little-endian arrays (decode with
+Float32Array / Float64Array); everything else is a plain array. Prices,
+percentages, scores and rates fit float32; market cap and backing are
+dollar totals and stay float64.
+
+msgpack is optional. Without it every client gets JSON.
+"""
+
+import json
+import logging
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+    logger.info("msgpack not installed — binary encoding disabled, serving JSON only")
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+_MSGPACK_MEDIA_TYPES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack", "application/vnd.msgpack")
+WS_MSGPACK_SUBPROTOCOL = "aex.msgpack"
+
+FLOAT32_FIELDS = frozenset({
+    "price", "price_change_pct", "inflow_velocity", "volatility",
+    "usage_score", "performance_score", "reliability_score", "risk_score",
+})
+FLOAT64_FIELDS = frozenset({"market_cap", "total_backing"})
+
+
+def wants_msgpack(accept: str | None) -> bool:
+    """
+    True if the Accept header prefers MessagePack to JSON and we can produce
+    it. Only an explicit msgpack media range counts (wildcards mean JSON),
+    q=0 refuses, and a tie goes to JSON.
+    """
+    if not MSGPACK_AVAILABLE or not accept:
+        return False
+    ranges = _media_ranges(accept)
+    msgpack_q = max((q for media, q in ranges if media in _MSGPACK_MEDIA_TYPES), default=0.0)
+    return msgpack_q > 0.0 and msgpack_q > _quality(ranges, JSON_MEDIA_TYPE)
+
+
+def _media_ranges(accept: str) -> list[tuple[str, float]]:
+    """(media range, q) pairs from an Accept header; ranges with a malformed q are skipped."""
+    ranges = []
+    for part in accept.split(","):
+        media, *params = (p.strip() for p in part.split(";"))
+        if not media:
+            continue
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = min(max(float(value), 0.0), 1.0)
+                except ValueError:
+                    q = None
+        if q is not None:
+            ranges.append((media.lower(), q))
+    return ranges
+
+
+def _quality(ranges: list[tuple[str, float]], media_type: str) -> float:
+    """q of the most specific range matching `media_type` (type/subtype, type/*, */*); 0 if none."""
+    family = media_type.split("/")[0] + "/*"
+    best, specificity = 0.0, -1
+    for media, q in ranges:
+        rank = 2 if media == media_type else 1 if media == family else 0 if media == "*/*" else -1
+        if rank > specificity:
+            best, specificity = q, rank
+    return best
+
+
+def ws_wants_msgpack(subprotocols: list[str]) -> bool:
+    return MSGPACK_AVAILABLE and WS_MSGPACK_SUBPROTOCOL in subprotocols
+
+
+def pack(message: Any) -> bytes:
+    """MessagePack-encode a message, packing any `agents` lists column-wise."""
+    return msgpack.packb(_columnarize(message), use_bin_type=True)
+
+
+def decode_client_message(message: dict) -> Any:
+    """Decode an ASGI websocket.receive message (JSON text, or MessagePack bytes). None if undecodable."""
+    try:
+        if message.get("text") is not None:
+            return json.loads(message["text"])
+        if message.get("bytes") is not None and MSGPACK_AVAILABLE:
+            return msgpack.unpackb(message["bytes"], raw=False)
+    except ValueError:
+        pass
+    return None
+
+
+def _columnarize(obj: Any) -> Any:
+    if not isinstance(obj, dict):
+        return obj
+    out = {}
+    for key, value in obj.items():
+        if key == "agents" and isinstance(value, list) and value and isinstance(value[0], dict):
+            out[key] = _agent_columns(value)
+        elif isinstance(value, dict):
+            out[key] = _columnarize(value)
+        else:
+            out[key] = value
+    return out
+
+
+def _agent_columns(agents: list[dict]) -> dict:
+    columns: dict[str, Any] = {}
+    dtypes: dict[str, str] = {}
+    for name in agents[0]:
+        values = [a.get(name) for a in agents]
+        dtype = "<f4" if name in FLOAT32_FIELDS else "<f8" if name in FLOAT64_FIELDS else None
+        if dtype is not None:
+            try:
+                columns[name] = np.asarray(values, dtype=dtype).tobytes()
+                dtypes[name] = dtype
+                continue
+            except (TypeError, ValueError):
+                pass
+        columns[name] = values
+    return {"columnar": True, "count": len(agents), "dtypes": dtypes, "columns": columns}
+
+
+class Frame:
+    """
+    One outbound WebSocket message, encoded lazily and at most once per
+    encoding no matter how many connections send it.
+    """
+
+    __slots__ = ("message", "_text", "_binary")
+
+    def __init__(self, message: dict, text: str | None = None):
+        self.message = message
+        self._text = text
+        self._binary: bytes | None = None
+
+    def text(self) -> str:
+        if self._text is None:
+            self._text = json.dumps(self.message)
+        return self._text
+
+    def binary(self) -> bytes:
+        if self._binary is None:
+            self._binary = pack(self.message)
+        return self._binary
@@ -11,6 +11,11 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from backend.services.market_engine.engine import MarketEngine
+from backend.services.market_engine.snapshot import MarketSnapshot
+from backend.services.market_engine.history_store import build_history_store
+from backend.services.market_engine.seed_data import get_seed_agents, generate_synthetic_agents
+from backend.services.market_engine.loader import load_agents
+from backend.services.shock_engine.stress import shutdown_pool as shutdown_stress_pool
 from backend.services.agents.tools import ToolExecutor
 from backend.services.agents.market_analyst import MarketAnalystAgent
 from backend.services.agents.risk_agent import RiskAgent
@@ -18,21 +23,46 @@ from backend.services.agents.risk_agent import RiskAgent
 from backend.services.observability.datadog_client import init_client
 from backend.services.observability.metrics import (
     emit_agent_metrics, emit_market_metrics,
-    emit_tick_latency, emit_ws_connections, flush_metrics,
+    emit_tick_latency, emit_tick_schedule, emit_dispatch_metrics,
+    emit_ws_connections, flush_metrics,
 )
 from backend.services.observability.tracing import init_llm_obs
-from backend.services.observability.events import emit_market_anomaly
+from backend.services.observability.events import emit_concentration_event, emit_market_anomaly
 from backend.services.observability.middleware import DatadogRequestMetrics
 from backend.services.observability.dashboard import create_dashboard
 from backend.services.observability.monitors import get_monitor_definitions
 from backend.services.observability.correlation import new_run_id
 
-from .routes import market, shock, analysis, graph, tests
+from .routes import market, shock, analysis, graph, tests, admin
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-engine = MarketEngine(tick_interval_ms=int(os.environ.get("MARKET_TICK_INTERVAL_MS", 2000)))
+
+def _build_engine() -> MarketEngine:
+    """
+    MARKET_ENGINE=vectorized selects the NumPy struct-of-arrays engine.
+    MARKET_AGENTS_FILE replaces the seed roster with agents from a CSV / NDJSON / Parquet file.
+    MARKET_AGENT_COUNT pads the roster with synthetic agents.
+    TICK_HISTORY_DIR enables the on-disk tick history store.
+    """
+    tick_ms = int(os.environ.get("MARKET_TICK_INTERVAL_MS", 2000))
+    agents_file = os.environ.get("MARKET_AGENTS_FILE")
+    agents = load_agents(agents_file) if agents_file else get_seed_agents()
+    extra = int(os.environ.get("MARKET_AGENT_COUNT", 0)) - len(agents)
+    if extra > 0:
+        agents.update(generate_synthetic_agents(extra))
+
+    if os.environ.get("MARKET_ENGINE", "scalar").lower() == "vectorized":
+        from backend.services.market_engine.vector_engine import VectorMarketEngine
+        built: MarketEngine = VectorMarketEngine(tick_interval_ms=tick_ms, agents=agents)
+    else:
+        built = MarketEngine(tick_interval_ms=tick_ms, agents=agents)
+    built.history_store = build_history_store()
+    return built
+
+
+engine = _build_engine()
 tool_executor = ToolExecutor(engine)
 analyst_agent = MarketAnalystAgent(tool_executor)
 risk_agent_instance = RiskAgent(tool_executor)
@@ -48,16 +78,19 @@ async def lifespan(app: FastAPI):
     init_client()
     init_llm_obs()
 
-    async def on_market_tick(state):
+    async def emit_tick_telemetry(tick: MarketSnapshot):
         global _prev_cascade
         tick_rid = new_run_id("tick")
+        snapshot = tick.data
 
-        snapshot = state.to_snapshot()
         for agent_dict in snapshot["agents"]:
             emit_agent_metrics(agent_dict)
         emit_market_metrics(snapshot)
         emit_ws_connections(len(market.manager.active))
         emit_tick_latency(round(app.state.engine.last_tick_latency_ms, 1))
+        scheduler = app.state.engine.scheduler
+        emit_tick_schedule(round(scheduler.last_jitter_ms, 1), scheduler.overruns, scheduler.skipped_ticks)
+        emit_dispatch_metrics(app.state.engine.dispatcher.stats())
 
         cascade = snapshot["cascade_probability"]
         if cascade > 0.5 and _prev_cascade <= 0.5:
@@ -70,16 +103,23 @@ async def lifespan(app: FastAPI):
             )
         _prev_cascade = cascade
 
+        for crossing in app.state.engine.concentration.drain():
+            emit_concentration_event(crossing.agent_id, crossing.herfindahl, crossing.above,
+                                     app.state.engine.concentration.threshold)
+
         flush_metrics()
-        await market.broadcast_tick(snapshot)
 
-    engine.on_tick(on_market_tick)
+    # Separate subscribers: a slow WebSocket client can't hold up telemetry,
+    # and neither can delay the tick loop.
+    engine.on_tick(emit_tick_telemetry, name="telemetry")
+    engine.on_tick(market.broadcast_tick, name="ws_broadcast")
     engine.start()
     logger.info("Market engine started")
 
     yield
 
     engine.stop()
+    shutdown_stress_pool()
     logger.info("AEX shutdown complete")
 
 
@@ -108,6 +148,7 @@ app.include_router(shock.router,    prefix="/shock",    tags=["Shock"])
 app.include_router(analysis.router, prefix="/analysis", tags=["Analysis"])
 app.include_router(graph.router,    prefix="/graph",    tags=["Graph"])
 app.include_router(tests.router,    prefix="/tests",    tags=["Tests"])
+app.include_router(admin.router,    prefix="/admin",    tags=["Admin"])
 
 
 @app.get("/health")
@@ -116,10 +157,15 @@ async def health():
         "status": "ok",
         "tick": engine.state.tick_number,
         "agents": len(engine.state.agents),
+        "universe_version": engine.universe_version,
         "active_shocks": len(engine.state.active_shocks),
         "ws_connections": len(market.manager.active),
+        "ws": market.manager.stats(),
         "drawdown_pct": round(engine.drawdown_pct, 4),
         "peak_market_cap": round(engine.peak_market_cap, 2),
+        "tick_latency_ms": round(engine.last_tick_latency_ms, 3),
+        "tick_schedule": engine.scheduler.stats(),
+        "tick_subscribers": engine.dispatcher.stats(),
     }
 
 
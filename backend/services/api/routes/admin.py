@@ -0,0 +1,112 @@
+"""
+Admin routes: list and delist agents, reload the sector / shock taxonomy.
+
+Changes are validated up front and queued on the engine. They take effect
+together at the next tick boundary; responses say which tick that is.
+"""
+
+import logging
+from typing import Any
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from pydantic import BaseModel, Field
+
+from backend.services.market_engine.loader import (
+    FORMATS, AgentLoadError, agents_from_records, format_for_media_type, parse_agents,
+)
+from backend.services.market_engine.models import AgentFundamentals
+from backend.services.market_engine.universe import UniverseError
+from backend.services.shock_engine.taxonomy import TAXONOMY_CONFIG, TaxonomyError, load_taxonomy
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+class ListAgentsRequest(BaseModel):
+    agents: list[dict[str, Any]] = Field(..., description="Agent records (agent_id/id, sector, optional scores and price)")
+
+
+class DelistAgentsRequest(BaseModel):
+    agent_ids: list[str]
+
+
+def _queue(engine, add: list[AgentFundamentals] = (), remove: list[str] = ()) -> dict:
+    try:
+        effective_tick = engine.queue_agent_changes(add=add, remove=remove)
+    except UniverseError as e:
+        raise HTTPException(status_code=409, detail={"error": str(e), "agent_ids": e.agent_ids[:100]})
+    logger.info("Queued agent changes: +%d -%d for tick %d", len(add), len(remove), effective_tick)
+    return {
+        "queued_add": len(add),
+        "queued_remove": len(remove),
+        "effective_tick": effective_tick,
+        "pending": engine.pending_agent_changes,
+    }
+
+
+@router.get("/agents")
+async def get_universe(request: Request) -> dict:
+    engine = request.app.state.engine
+    return {
+        "tick": engine.state.tick_number,
+        "agents": len(engine.state.agents),
+        "universe_version": engine.universe_version,
+        "pending": engine.pending_agent_changes,
+    }
+
+
+@router.post("/agents")
+async def list_agents(body: ListAgentsRequest, request: Request) -> dict:
+    try:
+        agents = agents_from_records(body.agents)
+    except AgentLoadError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return _queue(request.app.state.engine, add=agents)
+
+
+@router.post("/agents/import")
+async def import_agents(
+    request: Request,
+    format: str | None = Query(None, pattern=f"^({'|'.join(FORMATS)})$",
+                               description="Payload format (default: from Content-Type)"),
+) -> dict:
+    """Bulk listing from a raw CSV, NDJSON or Parquet request body."""
+    fmt = format or format_for_media_type(request.headers.get("content-type"))
+    if fmt is None:
+        raise HTTPException(status_code=415, detail=f"Send text/csv, application/x-ndjson or "
+                                                    f"application/vnd.apache.parquet, or pass ?format= ({', '.join(FORMATS)})")
+    try:
+        agents = parse_agents(await request.body(), fmt)
+    except (AgentLoadError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return _queue(request.app.state.engine, add=agents)
+
+
+@router.post("/agents/delist")
+async def delist_agents(body: DelistAgentsRequest, request: Request) -> dict:
+    return _queue(request.app.state.engine, remove=body.agent_ids)
+
+
+@router.get("/taxonomy")
+async def get_taxonomy(request: Request) -> dict:
+    engine = request.app.state.engine
+    return {"config": TAXONOMY_CONFIG, **engine.taxonomy.summary()}
+
+
+@router.post("/taxonomy/reload")
+async def reload_taxonomy(request: Request) -> dict:
+    """Recompile TAXONOMY_CONFIG and swap it in at the next tick."""
+    if not TAXONOMY_CONFIG:
+        raise HTTPException(status_code=409, detail="TAXONOMY_CONFIG is not set; using the built-in taxonomy")
+    engine = request.app.state.engine
+    try:
+        taxonomy = load_taxonomy(TAXONOMY_CONFIG, version=engine.taxonomy.version + 1)
+        effective_tick = engine.queue_taxonomy(taxonomy)
+    except TaxonomyError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {
+        "version": taxonomy.version,
+        "sectors": len(taxonomy.sectors),
+        "shock_types": len(taxonomy.shock_types),
+        "effective_tick": effective_tick,
+    }
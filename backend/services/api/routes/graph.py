@@ -1,31 +1,93 @@
 """
-Graph data routes — stub (Neo4j removed). Returns empty graph data for UI compatibility.
+Graph routes, served from the engine's in-process capital graph (graph/).
+
+Shapes follow the node / edge model in docs/GRAPH_SCHEMA.md: /contagion
+returns a subgraph for the UI, the raw query rows and, for a shock, its
+cached weighted reach (graph/contagion.py); /query/{query_type} runs one of
+the five schema queries.
 """
 
-from fastapi import APIRouter, Query
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request
+
+from backend.services.graph import queries
+from backend.services.market_engine.models import ShockEvent
 
 router = APIRouter()
 
 
+def _shock(engine, shock_id: str) -> ShockEvent:
+    shock = engine.find_shock(shock_id)
+    if shock is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired shock: {shock_id}")
+    return shock
+
+
 @router.get("/contagion")
 async def get_contagion(
-    shock_id: Optional[str] = Query(None, description="Filter contagion path for specific shock"),
+    request: Request,
+    shock_id: str | None = Query(None, description="Filter contagion path for specific shock"),
+    limit: int = Query(25, ge=1, le=500, description="Agents in the subgraph"),
 ) -> dict:
-    """Returns empty graph data (graph backend removed)."""
-    return {
-        "nodes": [],
-        "edges": [],
-        "query_type": "contagion_path" if shock_id else "top_inflow",
-        "raw": [],
-    }
+    """
+    Contagion subgraph for a shock, or the top-inflow subgraph without one.
+    With a shock, `reach` lists the agents, pools and users it reaches
+    (directly or through shared backing) and by how much.
+    """
+    engine = request.app.state.engine
+    graph, agents = engine.graph, engine.state.agents
+    if shock_id:
+        shock = _shock(engine, shock_id)
+        reach = engine.contagion.get(shock, engine.taxonomy)
+        raw = queries.contagion_path(graph, agents, engine.taxonomy, shock, limit)
+        view = queries.subgraph(graph, agents, reach.top_agents(limit), shock, engine.taxonomy)
+        view["reach"] = reach.to_dict(graph, agents, limit)
+    else:
+        raw = queries.top_inflow(graph, agents, limit)
+        slots = [graph.agent_index[r["agent_id"]] for r in raw]
+        view = queries.subgraph(graph, agents, slots)
+    return {**view, "query_type": "contagion_path" if shock_id else "top_inflow", "raw": raw}
 
 
 @router.get("/query/{query_type}")
 async def run_graph_query(
     query_type: str,
-    shock_id: Optional[str] = Query(None),
-    limit: int = Query(10),
+    request: Request,
+    shock_id: str | None = Query(None),
+    limit: int = Query(10, ge=1, le=1000),
 ) -> dict:
-    """Returns empty results (graph backend removed)."""
-    return {"query_type": query_type, "results": []}
+    """Run one of the schema queries: top_inflow, concentration, contagion_path, cross_sector, impacted_users."""
+    if query_type not in queries.QUERIES:
+        raise HTTPException(status_code=404, detail=f"Unknown query {query_type!r}; expected one of {', '.join(queries.QUERIES)}")
+    engine = request.app.state.engine
+    graph, agents = engine.graph, engine.state.agents
+
+    if query_type in queries.SHOCK_QUERIES:
+        if not shock_id:
+            raise HTTPException(status_code=422, detail=f"{query_type} needs shock_id")
+        shock = _shock(engine, shock_id)
+        if query_type == "contagion_path":
+            results = queries.contagion_path(graph, agents, engine.taxonomy, shock, limit)
+        else:
+            results = queries.impacted_users(graph, engine.taxonomy, shock, limit)
+    elif query_type == "top_inflow":
+        results = queries.top_inflow(graph, agents, limit)
+    elif query_type == "concentration":
+        results = queries.concentration(graph, agents, limit=limit)
+    else:
+        results = queries.cross_sector(graph, limit)
+    return {"query_type": query_type, "results": results}
+
+
+@router.get("/stats")
+async def get_graph_stats(request: Request) -> dict:
+    graph = request.app.state.engine.graph
+    return {
+        "nodes": graph.node_count,
+        "edges": graph.edge_count,
+        "users": len(graph.users),
+        "pools": len(graph.pools),
+        "agents": graph.n_agents,
+        "sectors": len(graph.sectors),
+        "contagion_cache": request.app.state.engine.contagion.stats(),
+        "exposure": request.app.state.engine.exposure.stats(),
+    }
@@ -5,43 +5,28 @@ Market routes: agent prices, snapshot, WebSocket stream.
 import asyncio
 import json
 import logging
-from fastapi import APIRouter, Request, WebSocket, WebSocketDisconnect
+from typing import Any, Callable
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect
+
+from backend.services.market_engine.snapshot import MarketSnapshot
+from backend.services.api.connections import Connection, ConnectionManager
+from backend.services.api.encoding import (
+    Frame, JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, WS_MSGPACK_SUBPROTOCOL,
+    decode_client_message, pack, wants_msgpack, ws_wants_msgpack,
+)
+from backend.services.api.topics import TopicError, is_tick_topic, parse_topic, topic_frame
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 # ── WebSocket connection manager ──────────────────────────────────────────────
 
-class ConnectionManager:
-    def __init__(self):
-        self.active: list[WebSocket] = []
-
-    async def connect(self, ws: WebSocket):
-        await ws.accept()
-        self.active.append(ws)
-        logger.info(f"WS client connected. Total: {len(self.active)}")
-
-    def disconnect(self, ws: WebSocket):
-        self.active.remove(ws)
-        logger.info(f"WS client disconnected. Total: {len(self.active)}")
-
-    async def broadcast(self, data: dict):
-        dead = []
-        for ws in self.active:
-            try:
-                await ws.send_text(json.dumps(data))
-            except Exception:
-                dead.append(ws)
-        for ws in dead:
-            self.active.remove(ws)
-
-
 manager = ConnectionManager()
 
 
-async def broadcast_tick(snapshot: dict) -> None:
-    """Called by MarketEngine after each tick."""
-    msg = {
+def _tick_message(snapshot: dict) -> Frame:
+    return Frame({
         "type": "tick",
         "tick_number": snapshot["tick_number"],
         "agents": [
@@ -57,16 +42,43 @@ async def broadcast_tick(snapshot: dict) -> None:
         "total_market_cap": snapshot["total_market_cap"],
         "active_shocks": len(snapshot["active_shocks"]),
         "cascade_probability": snapshot["cascade_probability"],
-    }
-    await manager.broadcast(msg)
+    })
+
+
+async def broadcast_tick(snapshot: MarketSnapshot) -> None:
+    """Called by MarketEngine after each tick. Each frame is built once per tick."""
+    if manager.has_full_clients:
+        manager.broadcast_full(snapshot.memo("ws_tick", lambda: _tick_message(snapshot.data)))
+    if manager.has_delta_clients:
+        manager.broadcast_delta(manager.delta_stream.advance(snapshot))
+    if manager.topic_subscribers:
+        manager.broadcast_topics(snapshot)
 
 
 # ── REST endpoints ────────────────────────────────────────────────────────────
 
+def _negotiated(request: Request, snapshot: MarketSnapshot, name: str,
+                payload: Callable[[], Any], json_body: Callable[[], bytes]) -> Response:
+    """JSON or MessagePack per the Accept header, encoded once per tick and cached on the snapshot."""
+    if wants_msgpack(request.headers.get("accept")):
+        body = snapshot.memo(("msgpack", name), lambda: pack(payload()))
+        media_type = MSGPACK_MEDIA_TYPE
+    else:
+        body = json_body()
+        media_type = JSON_MEDIA_TYPE
+    return Response(body, media_type=media_type, headers={"Vary": "Accept"})
+
+
 @router.get("/agents")
-async def get_agents(request: Request) -> list[dict]:
-    """Returns all agents with current state."""
-    return request.app.state.engine.get_agents()
+async def get_agents(request: Request) -> Response:
+    """Returns all agents as of the latest tick. Accepts application/msgpack."""
+    snapshot = request.app.state.engine.latest_snapshot
+    agents = snapshot.data["agents"]
+    return _negotiated(
+        request, snapshot, "agents",
+        payload=lambda: {"agents": agents},
+        json_body=lambda: snapshot.memo(("json", "agents"), lambda: json.dumps(agents).encode()),
+    )
 
 
 @router.get("/agents/{agent_id}")
@@ -74,57 +86,228 @@ async def get_agent(agent_id: str, request: Request) -> dict:
     """Returns a single agent with full details."""
     agents = request.app.state.engine.state.agents
     if agent_id not in agents:
-        from fastapi import HTTPException
         raise HTTPException(status_code=404, detail=f"Agent {agent_id} not found")
     agent = agents[agent_id]
     detail = agent.to_dict()
-    detail["price_history"] = agent.price_history
+    detail["price_history"] = list(agent.price_history)
     return detail
 
 
+@router.get("/agents/{agent_id}/history")
+async def get_agent_history(
+    agent_id: str,
+    request: Request,
+    from_tick: int | None = Query(None, alias="from", description="First tick (inclusive, default: oldest)"),
+    to_tick: int | None = Query(None, alias="to", description="Last tick (inclusive, default: latest)"),
+    limit: int = Query(10_000, ge=1, le=100_000, description="Max points; keeps the most recent"),
+    points: int | None = Query(None, ge=3, le=10_000, description="Downsample the whole range to this many points"),
+    method: str = Query("lttb", pattern="^(lttb|minmax)$", description="Downsampling method"),
+) -> dict:
+    """
+    Per-tick price, market cap, inflow and volatility from the on-disk tick
+    history store. With `points`, the full range is downsampled server-side
+    (LTTB or min/max buckets) instead of truncated to `limit`.
+    """
+    store = request.app.state.engine.history_store
+    if store is None:
+        raise HTTPException(status_code=503, detail="Tick history store disabled (set TICK_HISTORY_DIR)")
+    if store.last_tick is None:
+        raise HTTPException(status_code=404, detail="No ticks recorded yet")
+
+    lo = store.first_tick if from_tick is None else from_tick
+    hi = store.last_tick if to_tick is None else to_tick
+    if lo > hi:
+        raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+
+    if points is not None:
+        columns = store.read_downsampled(agent_id, lo, hi, points, method)
+        limit = points
+    else:
+        columns = store.read(agent_id, lo, hi)
+    if columns is None:
+        raise HTTPException(status_code=404, detail=f"No history for agent {agent_id} in [{lo}, {hi}]")
+    truncated = len(columns["tick"]) > limit
+    return {
+        "agent_id": agent_id,
+        "from": lo,
+        "to": hi,
+        "points": min(len(columns["tick"]), limit),
+        "truncated": truncated,
+        "downsampled": method if points is not None else None,
+        **{name: col[-limit:].tolist() for name, col in columns.items()},
+    }
+
+
+@router.get("/agents/{agent_id}/candles")
+async def get_agent_candles(
+    agent_id: str,
+    request: Request,
+    resolution: str = Query("1m", description="Bar size, e.g. 10t, 1m, 5m, 1h"),
+    limit: int = Query(100, ge=1, description="Newest N bars"),
+) -> dict:
+    """OHLC + volume / net inflow bars, maintained incrementally by the engine."""
+    candles = request.app.state.engine.candles
+    if candles is None:
+        raise HTTPException(status_code=503, detail="Candles disabled (set CANDLE_RESOLUTIONS)")
+    if resolution not in candles.series:
+        raise HTTPException(status_code=400,
+                            detail=f"Unknown resolution {resolution}; available: {candles.resolutions}")
+    bars = candles.candles(agent_id, resolution, limit)
+    if bars is None:
+        raise HTTPException(status_code=404, detail=f"Agent {agent_id} not found")
+    return {
+        "agent_id": agent_id,
+        "resolution": resolution,
+        "bar_ticks": candles.series[resolution].bar_ticks,
+        "count": len(bars["start_tick"]),
+        **bars,
+    }
+
+
 @router.get("/snapshot")
-async def get_snapshot(request: Request) -> dict:
-    """Returns full market snapshot: all agents, sectors, shocks."""
-    return request.app.state.engine.get_snapshot()
+async def get_snapshot(request: Request) -> Response:
+    """Returns full market snapshot: all agents, sectors, shocks. Accepts application/msgpack."""
+    snapshot = request.app.state.engine.latest_snapshot
+    return _negotiated(request, snapshot, "snapshot", payload=snapshot.view, json_body=snapshot.json)
+
+
+def _pool_flow(flow: Callable[..., None], agent_id: str, amount: float, pool_id: str | None) -> None:
+    try:
+        flow(agent_id, amount, pool_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown capital pool: {pool_id}")
 
 
 @router.post("/agents/{agent_id}/buy")
-async def buy_agent(agent_id: str, amount: float, request: Request) -> dict:
+async def buy_agent(
+    agent_id: str, amount: float, request: Request,
+    pool_id: str | None = Query(None, description="Capital pool making the buy (default: open market)"),
+) -> dict:
     """Simulate a buy event (capital inflow) for an agent."""
-    request.app.state.engine.simulate_buy(agent_id, amount)
-    return {"status": "ok", "agent_id": agent_id, "amount": amount, "action": "buy"}
+    _pool_flow(request.app.state.engine.simulate_buy, agent_id, amount, pool_id)
+    return {"status": "ok", "agent_id": agent_id, "amount": amount, "action": "buy", "pool_id": pool_id}
 
 
 @router.post("/agents/{agent_id}/sell")
-async def sell_agent(agent_id: str, amount: float, request: Request) -> dict:
+async def sell_agent(
+    agent_id: str, amount: float, request: Request,
+    pool_id: str | None = Query(None, description="Capital pool making the sale (default: open market)"),
+) -> dict:
     """Simulate a sell event (capital outflow) for an agent."""
-    request.app.state.engine.simulate_sell(agent_id, amount)
-    return {"status": "ok", "agent_id": agent_id, "amount": amount, "action": "sell"}
+    _pool_flow(request.app.state.engine.simulate_sell, agent_id, amount, pool_id)
+    return {"status": "ok", "agent_id": agent_id, "amount": amount, "action": "sell", "pool_id": pool_id}
+
+
+# ── Risk ──────────────────────────────────────────────────────────────────────
+
+@router.get("/risk/concentration")
+async def get_concentration(request: Request, limit: int = Query(10, ge=1, le=100)) -> dict:
+    """Herfindahl concentration of backing: agents above the 0.4 threshold and the most concentrated pools."""
+    engine = request.app.state.engine
+    return engine.concentration.report(engine.state.agents, limit)
+
+
+@router.get("/risk/var")
+async def get_value_at_risk(
+    request: Request,
+    limit: int = Query(20, ge=1, le=500),
+    sector: str | None = Query(None, description="Only rank agents in this sector"),
+    agent_id: str | None = Query(None, description="Return a single agent's figures"),
+) -> dict:
+    """
+    Rolling historical and parametric VaR / CVaR per sector and per agent, as
+    of the latest tick. Figures are null until a row has `min_observations`
+    returns in the window (after startup, listing, or a taxonomy change).
+    """
+    engine = request.app.state.engine
+    result = engine.risk.result()
+    sectors = engine.taxonomy.sectors
+    if agent_id is not None:
+        j = engine.risk.index.get(agent_id)
+        if j is None:
+            raise HTTPException(status_code=404, detail=f"Agent {agent_id} not found")
+        return {**result.header(), "agent": result.agent_row(j, sectors, engine.state.agents)}
+    if sector is not None and sector not in {s.value for s in sectors}:
+        raise HTTPException(status_code=404, detail=f"Unknown sector: {sector}")
+    return result.to_dict(sectors, engine.state.agents, limit, sector)
 
 
 # ── WebSocket stream ──────────────────────────────────────────────────────────
 
 @router.websocket("/stream")
-async def websocket_stream(websocket: WebSocket):
+async def websocket_stream(websocket: WebSocket, v: int = 1, topics: str | None = None):
     """
     Real-time market price stream.
     Client receives a message every market tick (default 2s).
     Also receives shock events when they are injected.
+
+    Connect with ?v=2 for the delta-encoded protocol (see api/delta_stream.py).
+    Request the `aex.msgpack` subprotocol for binary MessagePack frames.
+    Send subscribe/unsubscribe messages, or pass ?topics=a,b, to receive only
+    selected agents, sectors, shocks or market aggregates (see api/topics.py).
     """
-    await manager.connect(websocket)
+    subprotocol = WS_MSGPACK_SUBPROTOCOL if ws_wants_msgpack(websocket.scope.get("subprotocols", [])) else None
+    conn = await manager.connect(websocket, protocol=2 if v >= 2 else 1, subprotocol=subprotocol)
+    engine = websocket.app.state.engine  # type: ignore
     try:
-        # Send current snapshot immediately on connect
-        engine = websocket.app.state.engine  # type: ignore
-        snapshot = engine.get_snapshot()
-        await websocket.send_text(json.dumps({
-            "type": "connected",
-            "snapshot": snapshot,
-        }))
-
-        # Keep connection alive — data flows via broadcast_tick
+        if topics:
+            _subscribe(conn, engine, topics.split(","))
+
+        # First frame is queued before any await, so it always precedes tick frames.
+        if conn.topics:
+            pass    # topic clients got their current frames from _subscribe
+        elif conn.protocol >= 2:
+            stream = manager.delta_stream
+            if manager.delta_client_count == 1:
+                # Nobody else is reading the baseline, so start it from the current tick.
+                stream.rebase(engine.latest_snapshot)
+            conn.offer(stream.keyframe())
+        else:
+            snapshot = engine.latest_snapshot
+            conn.offer(snapshot.memo("ws_connected", lambda: Frame(
+                {"type": "connected", "snapshot": snapshot.data},
+                text='{"type": "connected", "snapshot": ' + snapshot.json().decode() + "}",
+            )))
+
+        # Data flows via broadcast_tick; this loop handles keep-alive, resync and subscriptions.
         while True:
-            await asyncio.sleep(30)
-            await websocket.send_text(json.dumps({"type": "ping"}))
+            try:
+                raw = await asyncio.wait_for(websocket.receive(), timeout=30)
+            except asyncio.TimeoutError:
+                conn.offer(Frame({"type": "ping"}))
+                continue
+            if raw["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(raw.get("code", 1000))
+            msg = decode_client_message(raw)
+            if not isinstance(msg, dict):
+                continue
+            if msg.get("type") == "resync":
+                manager.request_keyframe(websocket)
+            elif msg.get("type") == "subscribe":
+                _subscribe(conn, engine, msg.get("topics") or [])
+            elif msg.get("type") == "unsubscribe":
+                manager.unsubscribe(conn, msg.get("topics") or [])
+                conn.offer(Frame({"type": "subscribed", "topics": sorted(conn.topics)}))
 
     except WebSocketDisconnect:
+        pass
+    finally:
         manager.disconnect(websocket)
+
+
+def _subscribe(conn: Connection, engine, topics: list) -> None:
+    """Validate and add topics, ack, then queue current frames for the new ones."""
+    valid = []
+    for topic in topics:
+        try:
+            valid.append(parse_topic(str(topic), engine.state.agents))
+        except TopicError as e:
+            conn.offer(Frame({"type": "error", "detail": str(e)}))
+    added = manager.subscribe(conn, valid)
+    conn.offer(Frame({"type": "subscribed", "topics": sorted(conn.topics)}))
+
+    snapshot = engine.latest_snapshot
+    for topic in added:
+        frame = topic_frame(snapshot, topic) if is_tick_topic(topic) else None
+        if frame is not None:
+            conn.offer(frame)
@@ -3,13 +3,16 @@ Shock injection routes.
 """
 
 import logging
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel, Field
 
 from backend.services.market_engine.models import ShockType
+from backend.services.shock_engine.stress import ScheduledShock, StressTooLarge, run_stress_async
 from backend.services.observability.metrics import emit_shock_metric, flush_metrics
 from backend.services.observability.events import emit_shock_event
 from backend.services.observability.correlation import new_run_id
+from backend.services.api.encoding import Frame
+from backend.services.api.topics import SHOCKS
 from .market import manager
 
 logger = logging.getLogger(__name__)
@@ -22,6 +25,19 @@ class InjectShockRequest(BaseModel):
     description: str | None = None
 
 
+class StressShock(BaseModel):
+    tick: int = Field(0, ge=0, description="Tick offset at which the shock lands")
+    shock_type: ShockType
+    severity: float | None = Field(None, ge=0.0, le=1.0)
+
+
+class StressRequest(BaseModel):
+    shocks: list[StressShock]
+    ticks: int = Field(30, ge=1, le=5000)
+    paths: int = Field(200, ge=1, le=5000)
+    seed: int | None = None
+
+
 @router.post("/inject")
 async def inject_shock(body: InjectShockRequest, request: Request) -> dict:
     run_id = new_run_id("shock")
@@ -41,6 +57,23 @@ async def inject_shock(body: InjectShockRequest, request: Request) -> dict:
     emit_shock_event(shock_dict, agent_count=agent_count)
     flush_metrics()
 
-    await manager.broadcast({"type": "shock", "shock": shock_dict})
+    manager.publish_event(SHOCKS, Frame({"type": "shock", "shock": shock_dict}))
 
     return {**shock_dict, "run_id": run_id}
+
+
+@router.post("/stress")
+async def stress_test(body: StressRequest) -> dict:
+    """
+    Monte Carlo stress test: runs `paths` independent simulations from the seed
+    state under the given shock schedule in a process pool. The live engine is
+    not touched. `paths` × `ticks` is bounded by STRESS_MAX_RESULT_MB (422 if
+    exceeded), on top of the per-field limits.
+    """
+    run_id = new_run_id("stress")
+    schedule = [ScheduledShock(s.tick, s.shock_type, s.severity) for s in body.shocks]
+    try:
+        result = await run_stress_async(schedule, ticks=body.ticks, paths=body.paths, seed=body.seed)
+    except StressTooLarge as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {**result, "run_id": run_id}
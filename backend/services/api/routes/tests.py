@@ -25,13 +25,16 @@ async def run_tests(body: RunTestsRequest, request: Request) -> dict:
     engine = request.app.state.engine
     results = []
 
-    tests_to_run = ["inflow_price_rule", "shock_sector_rule"] if body.test_name == "all" else [body.test_name]
+    tests_to_run = (["inflow_price_rule", "shock_sector_rule", "tick_recording_rule"]
+                    if body.test_name == "all" else [body.test_name])
 
     for test in tests_to_run:
         if test == "inflow_price_rule":
             result = await _test_inflow_price_rule(engine)
         elif test == "shock_sector_rule":
             result = await _test_shock_sector_rule(engine)
+        elif test == "tick_recording_rule":
+            result = await _test_tick_recording_rule(engine)
         else:
             result = {"test_name": test, "status": "ERROR", "duration_ms": 0, "details": {}, "error": f"Unknown test: {test}"}
         results.append(result)
@@ -58,7 +61,7 @@ async def _test_inflow_price_rule(engine) -> dict:
     for _ in range(5):
         engine.simulate_buy(test_agent_id, 1000.0)
     for _ in range(3):
-        engine._tick()
+        engine.step()
 
     price_after = agent.price
     price_change_pct = ((price_after - price_before) / price_before) * 100
@@ -85,7 +88,7 @@ async def _test_shock_sector_rule(engine) -> dict:
     start = time.time()
 
     def sector_avg_price(sector: Sector) -> float:
-        agents = [a for a in engine.state.agents.values() if a.sector == sector]
+        agents = engine.state.agents_in_sector(sector.value)
         return sum(a.price for a in agents) / len(agents) if agents else 0.0
 
     compliance_before = sector_avg_price(Sector.COMPLIANCE)
@@ -93,7 +96,7 @@ async def _test_shock_sector_rule(engine) -> dict:
 
     engine.inject_shock(ShockType.REGULATION, severity=0.7, source="test")
     for _ in range(5):
-        engine._tick()
+        engine.step()
 
     compliance_after = sector_avg_price(Sector.COMPLIANCE)
     fraud_aml_after = sector_avg_price(Sector.FRAUD_AML)
@@ -115,3 +118,29 @@ async def _test_shock_sector_rule(engine) -> dict:
             "threshold_spread_pct": 3.0,
         },
     }
+
+
+async def _test_tick_recording_rule(engine) -> dict:
+    """Every tick the engine has run is recorded by candles and the history store (no _tick() bypass)."""
+    start = time.time()
+    for _ in range(3):
+        engine.step()
+
+    tick = engine.state.tick_number
+    details = {"tick_number": tick}
+    passed = True
+    if engine.candles is not None:
+        details["candle_ticks"] = engine.candles.ticks_recorded
+        passed &= engine.candles.ticks_recorded == tick
+    if engine.history_store is not None:
+        details["history_last_tick"] = engine.history_store.last_tick
+        passed &= engine.history_store.last_tick == tick
+    details["risk_tick"] = engine.risk.tick_number
+    passed &= engine.risk.tick_number == tick
+
+    return {
+        "test_name": "tick_recording_rule",
+        "status": "PASS" if passed else "FAIL",
+        "duration_ms": round((time.time() - start) * 1000),
+        "details": details,
+    }
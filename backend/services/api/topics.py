@@ -0,0 +1,97 @@
+"""
+WebSocket topic subscriptions.
+
+A /market/stream client can narrow what it receives:
+
+  {"type": "subscribe",   "topics": ["sector:FRAUD_AML", "agent:aex_001"]}
+  {"type": "unsubscribe", "topics": ["agent:aex_001"]}
+
+Topics:
+
+  market        market aggregates and sector summaries, every tick
+  shocks        shock events as they are injected
+  sector:<id>   every agent in one sector, every tick
+  agent:<id>    one agent's full record, every tick
+
+A client with at least one topic receives only its topics' frames instead of
+the full tick stream; unsubscribing from everything restores the full stream.
+Each topic's frame is built once per tick and shared by all its subscribers.
+"""
+
+from typing import Collection
+
+from backend.services.market_engine.snapshot import MarketSnapshot
+from backend.services.shock_engine.taxonomy import current as current_taxonomy
+from .encoding import Frame
+
+MARKET = "market"
+SHOCKS = "shocks"
+
+
+class TopicError(ValueError):
+    pass
+
+
+def parse_topic(topic: str, agent_ids: Collection[str]) -> str:
+    """Validate a client-supplied topic name; raises TopicError if unknown."""
+    topic = topic.strip()
+    if topic in (MARKET, SHOCKS):
+        return topic
+    kind, _, key = topic.partition(":")
+    if kind == "sector" and key in current_taxonomy().sector_index:
+        return topic
+    if kind == "agent" and key in agent_ids:
+        return topic
+    raise TopicError(f"Unknown topic: {topic}")
+
+
+def is_tick_topic(topic: str) -> bool:
+    """Topics published every tick (everything except event-only topics)."""
+    return topic != SHOCKS
+
+
+def topic_frame(snapshot: MarketSnapshot, topic: str) -> Frame | None:
+    """This tick's frame for `topic`, or None if it has no data (e.g. agent removed)."""
+    return snapshot.memo(("topic", topic), lambda: _build(snapshot, topic))
+
+
+def _build(snapshot: MarketSnapshot, topic: str) -> Frame | None:
+    data = snapshot.data
+    if topic == MARKET:
+        payload = {
+            "total_market_cap": data["total_market_cap"],
+            "cascade_probability": data["cascade_probability"],
+            "active_shocks": len(data["active_shocks"]),
+            "drawdown_pct": data.get("drawdown_pct"),
+            "peak_market_cap": data.get("peak_market_cap"),
+            "sectors": data["sectors"],
+        }
+    else:
+        kind, _, key = topic.partition(":")
+        if kind == "sector":
+            summary = next((s for s in data["sectors"] if s["id"] == key), None)
+            payload = {"sector": summary, "agents": _agents_by_sector(snapshot).get(key, [])}
+        else:
+            payload = _agents_by_id(snapshot).get(key)
+            if payload is None:
+                return None
+
+    return Frame({
+        "type": "topic",
+        "topic": topic,
+        "tick_number": snapshot.tick_number,
+        "data": payload,
+    })
+
+
+def _agents_by_id(snapshot: MarketSnapshot) -> dict[str, dict]:
+    return snapshot.memo("agents_by_id", lambda: {a["id"]: a for a in snapshot.data["agents"]})
+
+
+def _agents_by_sector(snapshot: MarketSnapshot) -> dict[str, list[dict]]:
+    def build() -> dict[str, list[dict]]:
+        groups: dict[str, list[dict]] = {}
+        for a in snapshot.data["agents"]:
+            groups.setdefault(a["sector"], []).append(a)
+        return groups
+    return snapshot.memo("agents_by_sector", build)
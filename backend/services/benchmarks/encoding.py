@@ -0,0 +1,57 @@
+"""
+Wire encoding benchmark.
+
+Compares payload size and encode time of a full market snapshot as JSON,
+row-wise MessagePack and the columnar float32 MessagePack served to
+`Accept: application/msgpack` / `aex.msgpack` clients.
+
+    python -m backend.services.benchmarks.encoding [--agents 1000 10000 100000]
+"""
+
+import argparse
+import json
+import time
+
+from backend.services.api.encoding import MSGPACK_AVAILABLE, pack
+from backend.services.market_engine.seed_data import generate_synthetic_agents
+from backend.services.market_engine.vector_engine import VectorMarketEngine
+
+
+def _time(fn, repeat: int) -> tuple[float, int]:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        out = fn()
+    return (time.perf_counter() - start) / repeat * 1000, len(out)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--agents", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if not MSGPACK_AVAILABLE:
+        raise SystemExit("msgpack is not installed (pip install msgpack)")
+    import msgpack
+
+    encoders = {
+        "json": lambda d: json.dumps(d).encode(),
+        "msgpack rows": lambda d: msgpack.packb(d, use_bin_type=True),
+        "msgpack columnar": pack,
+    }
+
+    print(f"{'agents':>8} {'encoding':>18} {'bytes':>12} {'encode ms':>10} {'size vs json':>13}")
+    for count in args.agents:
+        engine = VectorMarketEngine(agents=generate_synthetic_agents(count), seed=1)
+        engine.step()
+        data = engine.get_snapshot()
+
+        json_size = None
+        for name, encode in encoders.items():
+            ms, size = _time(lambda: encode(data), args.repeat)
+            json_size = json_size or size
+            print(f"{count:>8} {name:>18} {size:>12,} {ms:>10.2f} {size / json_size:>12.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Memory benchmark for agent, shock and signal objects.
+
+Allocates N instances of each model under tracemalloc and reports bytes per
+object for the slotted classes in market_engine/models.py against
+dict-backed copies of the same dataclasses (the previous layout). Agent
+figures include the price history buffer, which is also compared against
+the plain list of floats it replaced. The last row is the column-wise
+layout the vector engine uses (AgentArrays plus one AgentView per agent).
+
+    python -m backend.services.benchmarks.memory [--count 100000]
+"""
+
+import argparse
+import dataclasses
+import gc
+import random
+import time
+import tracemalloc
+from typing import Callable
+
+from backend.services.market_engine.arrays import AgentArrays
+from backend.services.market_engine.models import (
+    PRICE_HISTORY_WINDOW, AgentFundamentals, ShockEvent, ShockType, SignalEvent,
+)
+from backend.services.shock_engine.taxonomy import current as current_taxonomy
+from backend.services.market_engine.price_history import PriceHistory
+
+
+def _dict_backed(cls: type) -> type:
+    """The same dataclass without slots: fields, defaults and methods copied over."""
+    ns: dict = {"__annotations__": {f.name: f.type for f in dataclasses.fields(cls)}}
+    for f in dataclasses.fields(cls):
+        ns[f.name] = dataclasses.field(default=f.default, default_factory=f.default_factory, init=f.init)
+    for name, value in vars(cls).items():
+        if name in ns or name in getattr(cls, "__slots__", ()) or name.startswith("__dataclass"):
+            continue
+        if name in ("__slots__", "__dict__", "__weakref__", "__init__", "__repr__", "__eq__",
+                    "__match_args__", "__getstate__", "__setstate__"):
+            continue
+        ns[name] = value
+    return dataclasses.dataclass(type(cls.__name__, (), ns))
+
+
+def _traced_bytes(build: Callable[[], object]) -> int:
+    """Bytes still allocated by `build()` while its result is alive."""
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    result = build()
+    used = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del result
+    return used
+
+
+def _bytes_per_object(make: Callable[[int], object], count: int) -> float:
+    objects = [None] * count
+
+    def build() -> list:
+        for i in range(count):
+            objects[i] = make(i)
+        return objects
+
+    return _traced_bytes(build) / count
+
+
+def _makers(agent_cls: type, shock_cls: type, signal_cls: type) -> dict[str, Callable[[int], object]]:
+    sectors = list(current_taxonomy().sectors)
+    rng = random.Random(1)
+    now = time.time()
+    return {
+        "agent": lambda i: agent_cls(
+            agent_id=f"agent_{i:06d}", name=f"Agent {i}", sector=sectors[i % len(sectors)],
+            usage_score=rng.random(), performance_score=rng.random(),
+            reliability_score=rng.random(), risk_score=rng.random(),
+            total_backing=1000.0 + i, price=50.0 + rng.random() * 100,
+        ),
+        "shock": lambda i: shock_cls(
+            shock_id=f"shock_{i:06d}", shock_type=ShockType.CYBER,
+            severity=rng.random(), description="Synthetic shock",
+        ),
+        "signal": lambda i: signal_cls(
+            signal_id=f"sig_{i:06d}", source="GDELT", signal_type="NEWS",
+            timestamp=now + i, severity_hint=rng.random(),
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=100_000)
+    args = parser.parse_args()
+
+    legacy = _makers(*(_dict_backed(c) for c in (AgentFundamentals, ShockEvent, SignalEvent)))
+    slotted = _makers(AgentFundamentals, ShockEvent, SignalEvent)
+
+    print(f"{'object':>16} {'dict-backed B':>14} {'slotted B':>10} {'saved':>7}")
+    for kind in slotted:
+        before = _bytes_per_object(legacy[kind], args.count)
+        after = _bytes_per_object(slotted[kind], args.count)
+        print(f"{kind:>16} {before:>14,.0f} {after:>10,.0f} {1 - after / before:>7.0%}")
+
+    before = _bytes_per_object(lambda i: [100.0 + i + k for k in range(PRICE_HISTORY_WINDOW)], args.count)
+    after = _bytes_per_object(lambda i: PriceHistory(PRICE_HISTORY_WINDOW, [100.0 + i] * PRICE_HISTORY_WINDOW), args.count)
+    print(f"{'price history':>16} {before:>14,.0f} {after:>10,.0f} {1 - after / before:>7.0%}")
+
+    agents = [slotted["agent"](i) for i in range(args.count)]
+    columnar = _traced_bytes(lambda: (lambda a: (a, a.views()))(AgentArrays(agents))) / args.count
+    print(f"{'agent (arrays)':>16} {'':>14} {columnar:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Shock-impact scaling benchmark.
+
+Compares the original per-shock × per-agent loop against the sector-level
+reduction (`sector_impact_vector` + broadcast by sector index) as the number
+of concurrent shocks grows.
+
+    python -m backend.services.benchmarks.shock_scaling [--agents 10000]
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from backend.services.market_engine.models import ShockEvent, ShockType
+from backend.services.market_engine.seed_data import generate_synthetic_agents
+from backend.services.shock_engine.sector_betas import (
+    get_beta, MAX_TICK_IMPACT, DECAY_SCHEDULE, sector_impact_vector,
+)
+from backend.services.shock_engine.taxonomy import current as current_taxonomy
+
+SHOCK_COUNTS = (1, 10, 100, 500)
+
+
+def _make_shocks(count: int, rng: random.Random) -> list[ShockEvent]:
+    types = list(current_taxonomy().shock_types)
+    return [
+        ShockEvent(
+            shock_id=f"bench_{i}",
+            shock_type=rng.choice(types),
+            severity=rng.uniform(0.2, 1.0),
+            description="benchmark shock",
+            ticks_remaining=rng.randint(1, 4),
+        )
+        for i in range(count)
+    ]
+
+
+def per_agent_loop(shocks, agents) -> dict[str, float]:
+    """The pre-aggregation implementation, kept here as the baseline."""
+    impacts = {aid: 0.0 for aid in agents}
+    for shock in shocks:
+        decay = DECAY_SCHEDULE[min(4 - shock.ticks_remaining, 3)]
+        for agent in agents.values():
+            raw = shock.severity * get_beta(shock.shock_type, agent.sector) * decay
+            impacts[agent.agent_id] += max(-MAX_TICK_IMPACT, min(MAX_TICK_IMPACT, raw))
+    return impacts
+
+
+def _time(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--agents", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    agents = generate_synthetic_agents(args.agents)
+    sector_index = current_taxonomy().sector_index
+    sector_idx = np.array([sector_index[a.sector] for a in agents.values()], dtype=np.intp)
+
+    print(f"agents={args.agents}")
+    print(f"{'shocks':>8} {'per-agent ms':>14} {'sector-vector ms':>18} {'speedup':>9}")
+    for count in SHOCK_COUNTS:
+        shocks = _make_shocks(count, rng)
+
+        legacy = per_agent_loop(shocks, agents)
+        vector = sector_impact_vector(shocks)[sector_idx]
+        assert np.allclose(list(legacy.values()), vector), "impact mismatch"
+
+        t_loop = _time(lambda: per_agent_loop(shocks, agents), args.repeat)
+        t_vec = _time(lambda: sector_impact_vector(shocks)[sector_idx], args.repeat)
+        print(f"{count:>8} {t_loop:>14.2f} {t_vec:>18.3f} {t_loop / t_vec:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
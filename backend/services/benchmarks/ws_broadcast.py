@@ -0,0 +1,119 @@
+"""
+WebSocket broadcast load benchmark.
+
+Drives ConnectionManager with simulated clients (no sockets) and compares it
+against the previous broadcast, which awaited each client's send in turn and
+re-encoded the payload per client. A fraction of clients are stalled to show
+that slow consumers no longer hold up the tick.
+
+    python -m backend.services.benchmarks.ws_broadcast [--clients 1000] [--agents 200]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from backend.services.api.connections import Connection, ConnectionManager
+from backend.services.api.routes.market import _tick_message
+from backend.services.market_engine.engine import MarketEngine
+from backend.services.market_engine.seed_data import generate_synthetic_agents
+
+
+class FakeSocket:
+    """Stands in for a WebSocket: each send takes `latency` seconds (None = stalls forever)."""
+
+    def __init__(self, latency: float | None):
+        self.latency = latency
+        self.received = 0
+
+    async def send_text(self, text: str) -> None:
+        if self.latency is None:
+            await asyncio.Event().wait()
+        await asyncio.sleep(self.latency)
+        self.received += 1
+
+    async def close(self, code: int = 1000) -> None:
+        pass
+
+
+def _make_sockets(clients: int, stalled: float, latency: float) -> list[FakeSocket]:
+    n_stalled = int(clients * stalled)
+    return [FakeSocket(None) for _ in range(n_stalled)] + [FakeSocket(latency) for _ in range(clients - n_stalled)]
+
+
+async def legacy_broadcast(sockets: list[FakeSocket], snapshot: dict) -> float:
+    """Sequential await + per-client json.dumps, as before. Returns seconds for one tick."""
+    start = time.perf_counter()
+    for ws in sockets:
+        await ws.send_text(json.dumps(snapshot))
+    return time.perf_counter() - start
+
+
+async def run_manager(sockets: list[FakeSocket], engine: MarketEngine, ticks: int,
+                      protocol: int, tick_interval: float) -> dict:
+    manager = ConnectionManager()
+    for ws in sockets:
+        manager.attach(Connection(ws, protocol, manager.queue_size))
+    manager.delta_stream.rebase(engine.latest_snapshot)
+
+    fanout_ms = []
+    for _ in range(ticks):
+        engine.step()
+        snapshot = engine.latest_snapshot
+        start = time.perf_counter()
+        if protocol >= 2:
+            manager.broadcast_delta(manager.delta_stream.advance(snapshot))
+        else:
+            manager.broadcast_full(snapshot.memo("ws_tick", lambda: _tick_message(snapshot.data)))
+        fanout_ms.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(tick_interval)
+
+    stats = manager.stats()
+    for ws in list(manager.active):
+        manager.disconnect(ws)
+    await asyncio.sleep(0)
+
+    healthy = [ws for ws in sockets if ws.latency is not None]
+    fanout_ms.sort()
+    return {
+        "fanout_p50_ms": fanout_ms[len(fanout_ms) // 2],
+        "fanout_max_ms": fanout_ms[-1],
+        "healthy_min_frames": min((ws.received for ws in healthy), default=0),
+        **stats,
+    }
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    engine = MarketEngine(agents=generate_synthetic_agents(args.agents), seed=1)
+    sockets = _make_sockets(args.clients, args.stalled, args.latency)
+    print(f"clients={args.clients} stalled={int(args.clients * args.stalled)} "
+          f"agents={args.agents} ticks={args.ticks}")
+
+    # With any stalled client the legacy loop never finishes, so time it on the healthy ones only.
+    healthy = [ws for ws in sockets if ws.latency is not None]
+    t = await legacy_broadcast(healthy, engine.get_snapshot())
+    print(f"legacy sequential broadcast ({len(healthy)} healthy clients): {t * 1000:.1f} ms per tick")
+
+    for protocol in (1, 2):
+        for ws in sockets:
+            ws.received = 0
+        r = await run_manager(sockets, engine, args.ticks, protocol, args.tick_interval)
+        print(f"manager v{protocol}: fan-out p50 {r['fanout_p50_ms']:.2f} ms, max {r['fanout_max_ms']:.2f} ms; "
+              f"healthy clients got >= {r['healthy_min_frames']}/{args.ticks} frames; "
+              f"keyframe-only {r['keyframe_only']}, evicted {r['evicted']}, dropped {r['dropped_frames']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--agents", type=int, default=200)
+    parser.add_argument("--ticks", type=int, default=40)
+    parser.add_argument("--stalled", type=float, default=0.05, help="Fraction of clients that never finish a send")
+    parser.add_argument("--latency", type=float, default=0.001, help="Per-send latency of healthy clients (s)")
+    parser.add_argument("--tick-interval", type=float, default=0.05, help="Seconds between simulated ticks")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
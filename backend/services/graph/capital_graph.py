@@ -0,0 +1,168 @@
+"""
+In-process capital flow graph: User → CapitalPool → Agent → Sector.
+
+Replaces the removed Neo4j backend (docs/GRAPH_SCHEMA.md). Nodes of each
+kind have dense integer ids; edges live in EdgeTables (CSR):
+
+    allocates   users × pools    ALLOCATES amounts
+    backs       pools × agents   BACKS amounts
+    agent_sector                 IN_SECTOR, one taxonomy sector index per agent
+
+Agent node ids are the engine's frame order (MarketEngine.agent_ids()) and
+follow the same swap-remove rule on delisting, so per-agent arrays from
+the engine line up with graph columns without a lookup.
+
+Pool 0 is the open market: flows without a pool_id (passive flows, plain
+/buy and /sell calls) are attributed to it. It has an edge to every agent,
+and row 0 comes first in the CSR arrays, so agent j's open-market edge is
+always `backs.data[j]` and batched passive flows are one vector add.
+
+Buys and sells move BACKS weights incrementally. A sell removes at most the
+pool's position, and the engine caps it beforehand so the agent keeps
+MIN_BACKING (engine.py). The engine then moves total_backing by the
+returned old - new, so an agent's BACKS column sums to its total_backing.
+
+User allocations are seeded (seed.py) and stay fixed. A user's exposure to
+an agent is their share of a pool times the pool's backing of that agent.
+"""
+
+import numpy as np
+
+from backend.services.market_engine.models import Sector
+from backend.services.market_engine.universe import swap_remove
+from .csr import EdgeTable
+
+OPEN_MARKET = "open_market"
+
+
+class CapitalGraph:
+    def __init__(
+        self,
+        agent_ids: list[str],
+        agent_sector: np.ndarray,
+        sectors: tuple[Sector, ...],
+        pools: list[dict],
+        users: list[dict],
+        backs: tuple[list[str], list[str], list[float]],
+        allocations: tuple[list[str], list[str], list[float]],
+        open_market_backing: np.ndarray,
+    ):
+        """
+        `pools` / `users` are attribute dicts with an "id" key; the open-market
+        pool is prepended. `backs` and `allocations` are (src ids, dst ids,
+        amounts) over named pools. `open_market_backing` is aligned with
+        `agent_ids`.
+        """
+        self.sectors = tuple(sectors)
+        self.agent_ids = list(agent_ids)
+        self.agent_index = {aid: j for j, aid in enumerate(self.agent_ids)}
+        self.agent_sector = np.asarray(agent_sector, dtype=np.intp).copy()
+
+        self.pools = [{"id": OPEN_MARKET, "name": "Open Market", "strategy": "open_market"}] + list(pools)
+        self.pool_index = {p["id"]: i for i, p in enumerate(self.pools)}
+        self.users = list(users)
+        self.user_index = {u["id"]: i for i, u in enumerate(self.users)}
+
+        n = len(self.agent_ids)
+        pool_src, agent_dst, amounts = backs
+        self.backs = EdgeTable(
+            len(self.pools), n,
+            np.concatenate([np.zeros(n, dtype=np.intp), [self.pool_index[p] for p in pool_src]]).astype(np.intp),
+            np.concatenate([np.arange(n), [self.agent_index[a] for a in agent_dst]]).astype(np.intp),
+            np.concatenate([np.asarray(open_market_backing, dtype=np.float64), amounts]),
+        )
+        user_src, pool_dst, amounts = allocations
+        self.allocates = EdgeTable(
+            len(self.users), len(self.pools),
+            [self.user_index[u] for u in user_src], [self.pool_index[p] for p in pool_dst], amounts,
+        )
+
+    @property
+    def n_agents(self) -> int:
+        return len(self.agent_ids)
+
+    @property
+    def edge_count(self) -> int:
+        return self.backs.nnz + self.allocates.nnz + self.n_agents
+
+    @property
+    def node_count(self) -> int:
+        return len(self.users) + len(self.pools) + self.n_agents + len(self.sectors)
+
+    # ── Flows ────────────────────────────────────────────────────────────────
+
+    def record_flow(self, agent_id: str, amount: float, pool_id: str | None = None) -> tuple[float, float] | None:
+        """
+        Signed flow (+ buy, - sell) from a pool into an agent; returns the
+        edge's (old, new) weight, or None for an unknown agent. Raises
+        KeyError for an unknown pool.
+        """
+        j = self.agent_index.get(agent_id)
+        if j is None:
+            return None
+        if pool_id is None or pool_id == OPEN_MARKET:
+            old = float(self.backs.data[j])
+            new = max(0.0, old + amount)
+            self.backs.data[j] = new
+            self.backs.touch(0)
+            return old, new
+        return self.backs.add(self.pool_index[pool_id], j, amount)
+
+    def record_open_market_flows(self, net: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Batched signed open-market flows aligned with `agent_ids`; returns the (old, new) weights."""
+        n = self.n_agents
+        old = self.backs.data[:n].copy()
+        np.maximum(old + net, 0.0, out=self.backs.data[:n])
+        self.backs.touch(0)
+        return old, self.backs.data[:n]
+
+    # ── Agent universe and taxonomy changes (mirrors the engine) ────────────
+
+    def remove_agents(self, agent_ids: list[str]) -> None:
+        if not agent_ids:
+            return
+        n_old = self.n_agents
+        dst, src = swap_remove(self.agent_ids, self.agent_index, agent_ids)
+        origin = np.arange(self.n_agents, dtype=np.intp)     # new slot -> old slot
+        origin[dst] = src
+        mapping = np.full(n_old, -1, dtype=np.intp)
+        mapping[origin] = np.arange(self.n_agents, dtype=np.intp)
+        self.agent_sector = self.agent_sector[origin]
+        self.backs.remap_dst(mapping, self.n_agents)
+
+    def add_agents(self, agent_ids: list[str], sector_idx: np.ndarray, backing: np.ndarray) -> None:
+        """Append agents; their initial backing is attributed to the open market."""
+        if not agent_ids:
+            return
+        start = self.n_agents
+        for aid in agent_ids:
+            self.agent_index[aid] = len(self.agent_ids)
+            self.agent_ids.append(aid)
+        self.agent_sector = np.concatenate([self.agent_sector, np.asarray(sector_idx, dtype=np.intp)])
+        self.backs.grow(n_dst=self.n_agents)
+        self.backs.extend(np.zeros(len(agent_ids), dtype=np.intp),
+                          np.arange(start, self.n_agents), backing)
+
+    def remap_sectors(self, sector_idx: np.ndarray, sectors: tuple[Sector, ...]) -> None:
+        self.sectors = tuple(sectors)
+        self.agent_sector = np.asarray(sector_idx, dtype=np.intp).copy()
+
+    # ── Derived quantities ───────────────────────────────────────────────────
+
+    def agent_backing(self) -> np.ndarray:
+        """Total BACKS amount per agent."""
+        return self.backs.column_sums()
+
+    def pool_value(self) -> np.ndarray:
+        """Total BACKS amount per pool (CapitalPool.total_value)."""
+        return self.backs.row_sums()
+
+    def pool_user_shares(self) -> EdgeTable:
+        """ALLOCATES amounts normalised per pool: each user's share of each pool."""
+        totals = self.allocates.column_sums()
+        src, dst, weight = self.allocates.coo()
+        return EdgeTable(len(self.users), len(self.pools), src, dst,
+                         weight / np.maximum(totals[dst], 1e-12))
+
+    def sector_of(self, j: int) -> Sector:
+        return self.sectors[self.agent_sector[j]]
@@ -0,0 +1,149 @@
+"""
+Herfindahl concentration of capital, per agent and per pool, kept current
+flow by flow.
+
+An agent's HHI is the sum of its pools' squared shares of its backing:
+
+    HHI_j = Σ_p (W[p, j] / T_j)² = S_j / T_j²     T_j = Σ_p W[p, j],  S_j = Σ_p W[p, j]²
+
+and a pool's HHI is the same sum over the agents it backs. The tracker
+stores T and S rather than the shares, so a flow that moves edge (p, j)
+from w to w' is O(1): T_j and T_p change by w' - w, S_j and S_p by
+w'² - w². The open market counts as one pool, as in
+queries.concentration(). Batched open-market flows are one vector update.
+
+resync() recomputes everything from the BACKS table. The engines call it
+after agent universe changes and every AGGREGATE_RESYNC_TICKS to cancel
+float drift.
+
+Agents crossing HHI_THRESHOLD ("Concentrated Backing", docs/MARKET_MODEL.md)
+in either direction are queued as crossings. api/main.py drains them after
+each tick and sends them to the Datadog event stream.
+"""
+
+from collections import deque
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+import numpy as np
+
+from backend.services.market_engine.models import AgentFundamentals
+from .capital_graph import CapitalGraph
+from .queries import HHI_THRESHOLD, top_indices
+
+MAX_PENDING_CROSSINGS = 1024
+
+
+@dataclass(slots=True)
+class Crossing:
+    agent_id: str
+    herfindahl: float
+    above: bool          # True: crossed above the threshold, False: fell back below
+
+
+def _hhi(squares: np.ndarray, total: np.ndarray) -> np.ndarray:
+    return np.divide(squares, total * total, out=np.zeros_like(total), where=total > 0)
+
+
+class ConcentrationTracker:
+    def __init__(self, graph: CapitalGraph, threshold: float = HHI_THRESHOLD):
+        self.graph = graph
+        self.threshold = threshold
+        self.crossings: deque[Crossing] = deque(maxlen=MAX_PENDING_CROSSINGS)
+        self.resync()
+
+    def resync(self) -> None:
+        """Recompute all sums from the edge table (no crossings are reported)."""
+        b = self.graph.backs
+        src, w = b.sources(), b.data
+        self.agent_total = np.bincount(b.indices, weights=w, minlength=b.n_dst)
+        self.agent_squares = np.bincount(b.indices, weights=w * w, minlength=b.n_dst)
+        self.pool_total = np.bincount(src, weights=w, minlength=b.n_src)
+        self.pool_squares = np.bincount(src, weights=w * w, minlength=b.n_src)
+        self._above = self.agent_hhi() > self.threshold
+
+    # ── Updates ──────────────────────────────────────────────────────────────
+
+    def record(self, agent_id: str, pool_id: str | None, change: tuple[float, float] | None) -> None:
+        """Fold in one edge update; `change` is CapitalGraph.record_flow()'s (old, new)."""
+        if change is None:
+            return
+        old, new = change
+        j = self.graph.agent_index[agent_id]
+        p = self.graph.pool_index[pool_id] if pool_id is not None else 0
+        dw, dsq = new - old, new * new - old * old
+        self.agent_total[j] += dw
+        self.agent_squares[j] += dsq
+        self.pool_total[p] += dw
+        self.pool_squares[p] += dsq
+
+        t = self.agent_total[j]
+        hhi = self.agent_squares[j] / (t * t) if t > 0 else 0.0
+        above = hhi > self.threshold
+        if above != self._above[j]:
+            self._above[j] = above
+            self.crossings.append(Crossing(agent_id, float(hhi), bool(above)))
+
+    def record_open_market(self, old: np.ndarray, new: np.ndarray) -> None:
+        """Fold in a batch of open-market edge updates aligned with the agent columns."""
+        dw, dsq = new - old, new * new - old * old
+        self.agent_total += dw
+        self.agent_squares += dsq
+        self.pool_total[0] += dw.sum()
+        self.pool_squares[0] += dsq.sum()
+
+        hhi = self.agent_hhi()
+        above = hhi > self.threshold
+        ids = self.graph.agent_ids
+        for j in np.flatnonzero(above != self._above).tolist():
+            self.crossings.append(Crossing(ids[j], float(hhi[j]), bool(above[j])))
+        self._above = above
+
+    def drain(self) -> list[Crossing]:
+        crossings = list(self.crossings)
+        self.crossings.clear()
+        return crossings
+
+    # ── Reads ────────────────────────────────────────────────────────────────
+
+    def agent_hhi(self) -> np.ndarray:
+        return _hhi(self.agent_squares, self.agent_total)
+
+    def pool_hhi(self) -> np.ndarray:
+        return _hhi(self.pool_squares, self.pool_total)
+
+    def report(self, agents: Mapping[str, AgentFundamentals], limit: int = 10) -> dict:
+        """Agents over the threshold and the most concentrated named pools, highest HHI first."""
+        graph = self.graph
+        hhi = self.agent_hhi()
+        flagged = np.where(self._above, hhi, -1.0)
+        agent_rows = []
+        for j in top_indices(flagged, min(limit, int(self._above.sum()))).tolist():
+            aid = graph.agent_ids[j]
+            agent = agents.get(aid)
+            pools, amounts = graph.backs.column(j)
+            top = int(pools[np.argmax(amounts)]) if len(amounts) else 0
+            agent_rows.append({
+                "agent_id": aid,
+                "name": agent.name if agent else aid,
+                "sector": graph.sector_of(j).value,
+                "herfindahl": round(float(hhi[j]), 4),
+                "total_backing": round(float(self.agent_total[j]), 2),
+                "top_pool": graph.pools[top]["id"],
+                "top_pool_share": round(float(amounts.max() / self.agent_total[j]), 4) if len(amounts) else 0.0,
+            })
+
+        pool_hhi = self.pool_hhi()
+        pool_hhi[0] = -1.0      # the open market backs every agent; its spread is not a risk signal
+        pool_rows = [
+            {"pool_id": graph.pools[p]["id"], "pool": graph.pools[p]["name"],
+             "herfindahl": round(float(pool_hhi[p]), 4), "total_value": round(float(self.pool_total[p]), 2)}
+            for p in top_indices(pool_hhi, min(limit, len(graph.pools) - 1)).tolist()
+        ]
+        return {
+            "threshold": self.threshold,
+            "agents_flagged": int(self._above.sum()),
+            "agent_count": graph.n_agents,
+            "agents": agent_rows,
+            "pools": pool_rows,
+        }
@@ -0,0 +1,184 @@
+"""
+Weighted shock reachability over the capital graph, cached per shock.
+
+A shock hits agents directly through its sector betas:
+
+    direct[j] = severity × beta[type, sector_j]
+
+and spreads through shared backing. A pool's stress is the holdings-weighted
+average stress of the agents it backs; an agent's indirect stress is the
+backing-weighted average stress of its pools, damped once per hop:
+
+    pool[p]    = Σ_j W[p, j] · a[j] / Σ_j W[p, j]
+    a'[j]      = CONTAGION_DAMPING · Σ_p W[p, j] · pool[p] / Σ_p W[p, j]
+
+W is the BACKS table restricted to named pools. The open market backs every
+agent and is not a shared holder, so it does not carry contagion. Hops stop
+after CONTAGION_MAX_HOPS or once every new contribution is below
+CONTAGION_TOLERANCE. Each hop is two sparse mat-vecs, so a full run costs
+O(hops × edges). `hops` records the first hop at which each agent is
+reached (0 = direct), which is the BFS depth of the weighted walk.
+
+Results are cached by shock id. An entry stays valid while the BACKS
+layout, the taxonomy, and the weights of every pool touching a reached
+agent are unchanged (EdgeTable.row_version). Open-market flows (every
+tick) and trades by unrelated pools do not invalidate it.
+"""
+
+import os
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+import numpy as np
+
+from backend.services.market_engine.models import AgentFundamentals, ShockEvent
+from backend.services.shock_engine.taxonomy import Taxonomy
+from .capital_graph import CapitalGraph
+from .queries import shock_sector_impact, top_indices
+
+CONTAGION_DAMPING = float(os.environ.get("CONTAGION_DAMPING", 0.5))
+CONTAGION_MAX_HOPS = int(os.environ.get("CONTAGION_MAX_HOPS", 3))
+CONTAGION_TOLERANCE = 1e-6
+
+
+@dataclass
+class ContagionResult:
+    """Per-node stress for one shock, aligned with the graph it was computed on."""
+    shock_id: str
+    direct: np.ndarray        # (agents,) signed direct impact
+    total: np.ndarray         # (agents,) direct + damped indirect impact
+    hops: np.ndarray          # (agents,) first hop reached, -1 = unreached
+    pool_stress: np.ndarray   # (pools,) accumulated stress, pool 0 (open market) always 0
+    user_at_risk: np.ndarray  # (users,) allocation dollars × pool stress
+
+    def top_agents(self, limit: int) -> np.ndarray:
+        """Slots of the `limit` reached agents with the largest |total| impact."""
+        reached = self.hops >= 0
+        return top_indices(np.abs(self.total) * reached, min(limit, int(reached.sum())))
+
+    def to_dict(self, graph: CapitalGraph, agents: Mapping[str, AgentFundamentals], limit: int = 25) -> dict:
+        """The most affected agents, pools and users; dollar figures use current backing."""
+        backing = graph.agent_backing()
+        pool_value = graph.pool_value()
+        agent_rows = []
+        for j in self.top_agents(limit).tolist():
+            aid = graph.agent_ids[j]
+            agent = agents.get(aid)
+            agent_rows.append({
+                "agent_id": aid,
+                "name": agent.name if agent else aid,
+                "sector": graph.sector_of(j).value,
+                "hops": int(self.hops[j]),
+                "direct": round(float(self.direct[j]), 6),
+                "indirect": round(float(self.total[j] - self.direct[j]), 6),
+                "total": round(float(self.total[j]), 6),
+                "backing_at_risk": round(float(self.total[j] * backing[j]), 2),
+            })
+        stressed = self.pool_stress != 0
+        pool_rows = [
+            {"pool_id": graph.pools[p]["id"], "pool": graph.pools[p]["name"],
+             "stress": round(float(self.pool_stress[p]), 6),
+             "value_at_risk": round(float(self.pool_stress[p] * pool_value[p]), 2)}
+            for p in top_indices(np.abs(self.pool_stress), min(limit, int(stressed.sum()))).tolist()
+        ]
+        user_rows = [
+            {"user_id": graph.users[u]["id"], "user": graph.users[u]["name"],
+             "risk_profile": graph.users[u]["risk_profile"],
+             "at_risk": round(float(self.user_at_risk[u]), 2)}
+            for u in top_indices(np.abs(self.user_at_risk), min(limit, int((self.user_at_risk != 0).sum()))).tolist()
+        ]
+        return {
+            "shock_id": self.shock_id,
+            "agents_reached": int((self.hops >= 0).sum()),
+            "max_hops": int(self.hops.max(initial=-1)),
+            "agents": agent_rows,
+            "pools": pool_rows,
+            "users": user_rows,
+        }
+
+
+def propagate(graph: CapitalGraph, taxonomy: Taxonomy, shock: ShockEvent,
+              damping: float = CONTAGION_DAMPING, max_hops: int = CONTAGION_MAX_HOPS,
+              tolerance: float = CONTAGION_TOLERANCE) -> ContagionResult:
+    b = graph.backs
+    src = b.sources()
+    named = src != 0
+    s, d, w = src[named], b.indices[named], b.data[named]
+    n_pools, n_agents = b.n_src, b.n_dst
+    pool_total = np.bincount(s, weights=w, minlength=n_pools)
+    agent_total = np.bincount(d, weights=w, minlength=n_agents)
+    pool_norm = np.divide(1.0, pool_total, out=np.zeros(n_pools), where=pool_total > 0)
+    agent_norm = np.divide(1.0, agent_total, out=np.zeros(n_agents), where=agent_total > 0)
+
+    direct = shock_sector_impact(taxonomy, shock)[graph.agent_sector]
+    total = direct.copy()
+    hops = np.where(direct != 0, 0, -1)
+    pool_stress = np.zeros(n_pools)
+    a = direct
+    for hop in range(1, max_hops + 1):
+        pool = np.bincount(s, weights=w * a[d], minlength=n_pools) * pool_norm
+        pool_stress += pool
+        a = damping * np.bincount(d, weights=w * pool[s], minlength=n_agents) * agent_norm
+        a[np.abs(a) < tolerance] = 0.0
+        if not a.any():
+            break
+        hops[(hops < 0) & (a != 0)] = hop
+        total += a
+
+    return ContagionResult(
+        shock_id=shock.shock_id,
+        direct=direct,
+        total=total,
+        hops=hops,
+        pool_stress=pool_stress,
+        user_at_risk=graph.allocates.matvec(pool_stress),
+    )
+
+
+@dataclass
+class _Entry:
+    result: ContagionResult
+    layout: int               # backs.version at compute time
+    taxonomy: Taxonomy
+    pools: np.ndarray         # named pools with an edge into a reached agent
+    row_versions: np.ndarray  # their backs.row_version at compute time
+
+
+class ContagionCache:
+    """propagate() results by shock id, revalidated against the rows they read."""
+
+    def __init__(self, graph: CapitalGraph, maxsize: int = 64):
+        self.graph = graph
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, shock: ShockEvent, taxonomy: Taxonomy) -> ContagionResult:
+        entry = self._entries.get(shock.shock_id)
+        if entry is not None and self._valid(entry, taxonomy):
+            self._entries.move_to_end(shock.shock_id)
+            self.hits += 1
+            return entry.result
+
+        self.misses += 1
+        result = propagate(self.graph, taxonomy, shock)
+        b = self.graph.backs
+        reached = result.hops >= 0
+        pools = np.unique(b.sources()[reached[b.indices]])
+        pools = pools[pools != 0]     # open-market weights do not enter propagate()
+        self._entries[shock.shock_id] = _Entry(result, b.version, taxonomy, pools, b.row_version[pools].copy())
+        self._entries.move_to_end(shock.shock_id)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return result
+
+    def _valid(self, entry: _Entry, taxonomy: Taxonomy) -> bool:
+        b = self.graph.backs
+        if entry.layout != b.version or entry.taxonomy is not taxonomy:
+            return False
+        return bool((b.row_version[entry.pools] == entry.row_versions).all())
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,173 @@
+"""
+Weighted bipartite edge table in CSR form.
+
+Edges run from a source node range to a destination node range, both
+integer-indexed. The arrays are the usual compressed sparse row layout:
+
+    indptr   (n_src + 1,)  edges of source s are [indptr[s], indptr[s + 1])
+    indices  (nnz,)        destination of each edge, sorted within a row
+    data     (nnz,)        edge weight (dollars)
+
+Weight updates write into `data` in place, so they cost one binary search
+within the source row. Adding an edge is an O(nnz) insert. Remapping or
+dropping destination nodes rebuilds the table. Each of these structural
+changes bumps `version`, which caches keyed on the edge layout compare
+against; `data_version` also counts weight updates, and `row_version[s]`
+counts updates to source s's edges, so a cache that only read a few rows
+can tell whether any of them moved.
+
+The reverse (destination → sources) index is built lazily after a
+structural change. It stores positions into `data`, so it never goes
+stale on weight updates.
+"""
+
+import numpy as np
+
+
+class EdgeTable:
+    def __init__(self, n_src: int, n_dst: int, src=(), dst=(), weight=()):
+        self.n_src = n_src
+        self.n_dst = n_dst
+        self.version = 0
+        self.data_version = 0
+        self.row_version = np.zeros(n_src, dtype=np.int64)
+        self._build(np.asarray(src, dtype=np.intp), np.asarray(dst, dtype=np.intp),
+                    np.asarray(weight, dtype=np.float64))
+
+    # ── Structure ────────────────────────────────────────────────────────────
+
+    def _build(self, src: np.ndarray, dst: np.ndarray, weight: np.ndarray) -> None:
+        """(Re)build from COO triples; duplicate (src, dst) pairs are summed."""
+        if len(src):
+            order = np.lexsort((dst, src))
+            src, dst, weight = src[order], dst[order], weight[order]
+            first = np.ones(len(src), dtype=bool)
+            first[1:] = (src[1:] != src[:-1]) | (dst[1:] != dst[:-1])
+            if not first.all():
+                weight = np.add.reduceat(weight, np.flatnonzero(first))
+                src, dst = src[first], dst[first]
+        self.indices = dst.astype(np.intp, copy=True)
+        self.data = weight.astype(np.float64, copy=True)
+        self.indptr = np.zeros(self.n_src + 1, dtype=np.intp)
+        np.cumsum(np.bincount(src, minlength=self.n_src), out=self.indptr[1:])
+        self._structure_changed()
+
+    def _structure_changed(self) -> None:
+        self._sources = None       # source of each edge, aligned with data
+        self._reverse = None       # (rev_ptr, rev_src, rev_pos)
+        self.version += 1
+        self.data_version += 1
+
+    def coo(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(src, dst, weight) per edge, in CSR order (weights are a copy)."""
+        return self.sources(), self.indices.copy(), self.data.copy()
+
+    def grow(self, n_src: int | None = None, n_dst: int | None = None) -> None:
+        """Extend the node ranges; new nodes start without edges."""
+        if n_src is not None and n_src > self.n_src:
+            self.indptr = np.concatenate([self.indptr, np.full(n_src - self.n_src, self.indptr[-1])])
+            self.row_version = np.concatenate([self.row_version, np.zeros(n_src - self.n_src, dtype=np.int64)])
+            self.n_src = n_src
+            self._structure_changed()
+        if n_dst is not None and n_dst > self.n_dst:
+            self.n_dst = n_dst
+            self._structure_changed()
+
+    def remap_dst(self, mapping: np.ndarray, n_dst: int) -> None:
+        """Renumber destinations (`mapping[old] = new`, -1 drops the node and its edges)."""
+        src, dst, weight = self.coo()
+        new = mapping[dst]
+        keep = new >= 0
+        self.n_dst = n_dst
+        self._build(src[keep], new[keep], weight[keep])
+
+    def extend(self, src, dst, weight) -> None:
+        """Add a batch of edges (summed into existing ones)."""
+        s, d, w = self.coo()
+        self._build(np.concatenate([s, np.asarray(src, dtype=np.intp)]),
+                    np.concatenate([d, np.asarray(dst, dtype=np.intp)]),
+                    np.concatenate([w, np.asarray(weight, dtype=np.float64)]))
+
+    # ── Weights ──────────────────────────────────────────────────────────────
+
+    @property
+    def nnz(self) -> int:
+        return len(self.indices)
+
+    def find(self, s: int, d: int) -> int:
+        """Position of edge s → d in `data`, or -1."""
+        lo, hi = self.indptr[s], self.indptr[s + 1]
+        k = lo + int(np.searchsorted(self.indices[lo:hi], d))
+        return k if k < hi and self.indices[k] == d else -1
+
+    def weight(self, s: int, d: int) -> float:
+        k = self.find(s, d)
+        return float(self.data[k]) if k >= 0 else 0.0
+
+    def add(self, s: int, d: int, amount: float) -> tuple[float, float]:
+        """
+        Add a signed amount to edge s → d, flooring the weight at 0; returns
+        (old, new). A positive amount on a missing edge inserts it; a
+        negative one is a no-op.
+        """
+        k = self.find(s, d)
+        if k < 0:
+            if amount <= 0:
+                return 0.0, 0.0
+            k = self.indptr[s] + int(np.searchsorted(self.indices[self.indptr[s]:self.indptr[s + 1]], d))
+            self.indices = np.insert(self.indices, k, d)
+            self.data = np.insert(self.data, k, 0.0)
+            self.indptr[s + 1:] += 1
+            self._structure_changed()
+        old = float(self.data[k])
+        new = max(0.0, old + amount)
+        self.data[k] = new
+        self.touch(s)
+        return old, new
+
+    def touch(self, s: int) -> None:
+        """Record an in-place weight update to source s's edges."""
+        self.row_version[s] += 1
+        self.data_version += 1
+
+    # ── Traversal and aggregates ─────────────────────────────────────────────
+
+    def sources(self) -> np.ndarray:
+        """Source node of each edge, aligned with `indices` / `data`."""
+        if self._sources is None:
+            self._sources = np.repeat(np.arange(self.n_src, dtype=np.intp), np.diff(self.indptr))
+        return self._sources
+
+    def row(self, s: int) -> tuple[np.ndarray, np.ndarray]:
+        """(destinations, weights) of source s; views into the table."""
+        lo, hi = self.indptr[s], self.indptr[s + 1]
+        return self.indices[lo:hi], self.data[lo:hi]
+
+    def column(self, d: int) -> tuple[np.ndarray, np.ndarray]:
+        """(sources, weights) of destination d."""
+        rev_ptr, rev_src, rev_pos = self.reverse_index()
+        lo, hi = rev_ptr[d], rev_ptr[d + 1]
+        return rev_src[lo:hi], self.data[rev_pos[lo:hi]]
+
+    def reverse_index(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if self._reverse is None:
+            src = self.sources()
+            pos = np.lexsort((src, self.indices))
+            ptr = np.zeros(self.n_dst + 1, dtype=np.intp)
+            np.cumsum(np.bincount(self.indices, minlength=self.n_dst), out=ptr[1:])
+            self._reverse = (ptr, src[pos], pos)
+        return self._reverse
+
+    def row_sums(self) -> np.ndarray:
+        return np.bincount(self.sources(), weights=self.data, minlength=self.n_src)
+
+    def column_sums(self) -> np.ndarray:
+        return np.bincount(self.indices, weights=self.data, minlength=self.n_dst)
+
+    def matvec(self, x: np.ndarray) -> np.ndarray:
+        """y[s] = Σ_d w(s, d) · x[d]."""
+        return np.bincount(self.sources(), weights=self.data * x[self.indices], minlength=self.n_src)
+
+    def rmatvec(self, y: np.ndarray) -> np.ndarray:
+        """x[d] = Σ_s w(s, d) · y[s]."""
+        return np.bincount(self.indices, weights=self.data * y[self.sources()], minlength=self.n_dst)
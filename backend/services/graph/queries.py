@@ -0,0 +1,225 @@
+"""
+The five graph queries from docs/GRAPH_SCHEMA.md, run on the CapitalGraph.
+
+Each query is a few array passes over the CSR tables (bincount, gathers,
+argpartition for top-k), so results come back in milliseconds even with
+large agent universes. `subgraph()` builds the node / edge lists that
+/graph/contagion returns for the UI.
+"""
+
+from collections.abc import Mapping
+
+import numpy as np
+
+from backend.services.market_engine.models import AgentFundamentals, ShockEvent
+from backend.services.shock_engine.taxonomy import Taxonomy
+from .capital_graph import OPEN_MARKET, CapitalGraph
+
+HHI_THRESHOLD = 0.4
+
+QUERIES = ("top_inflow", "concentration", "contagion_path", "cross_sector", "impacted_users")
+SHOCK_QUERIES = ("contagion_path", "impacted_users")
+
+
+def top_indices(values: np.ndarray, limit: int) -> np.ndarray:
+    """Indices of the `limit` largest values, largest first."""
+    if limit >= len(values):
+        return np.argsort(-values, kind="stable")
+    part = np.argpartition(-values, limit)[:limit]
+    return part[np.argsort(-values[part], kind="stable")]
+
+
+def shock_sector_impact(taxonomy: Taxonomy, shock: ShockEvent) -> np.ndarray:
+    """Signed severity × beta per taxonomy sector (zeros for a retired shock type)."""
+    t = taxonomy.shock_type_index.get(shock.shock_type)
+    if t is None:
+        return np.zeros(len(taxonomy.sectors))
+    return shock.severity * taxonomy.beta_matrix[t]
+
+
+def _agent_row(graph: CapitalGraph, agents: Mapping[str, AgentFundamentals], j: int) -> dict:
+    aid = graph.agent_ids[j]
+    agent = agents.get(aid)
+    return {
+        "agent_id": aid,
+        "name": agent.name if agent else aid,
+        "sector": graph.sector_of(j).value,
+        "price": round(agent.price, 4) if agent else None,
+    }
+
+
+# ── Queries ──────────────────────────────────────────────────────────────────
+
+def top_inflow(graph: CapitalGraph, agents: Mapping[str, AgentFundamentals], limit: int = 5) -> list[dict]:
+    """Agents attracting the most capital across all pools."""
+    b = graph.backs
+    total = b.column_sums()
+    pool_count = np.bincount(b.indices, weights=(b.data > 0), minlength=graph.n_agents)
+    return [
+        {**_agent_row(graph, agents, j), "total_inflow": round(float(total[j]), 2),
+         "pool_count": int(pool_count[j])}
+        for j in top_indices(total, limit).tolist()
+    ]
+
+
+def concentration(graph: CapitalGraph, agents: Mapping[str, AgentFundamentals],
+                  threshold: float = HHI_THRESHOLD, limit: int = 10) -> list[dict]:
+    """Agents whose backing is dominated by few pools (Herfindahl index above threshold)."""
+    b = graph.backs
+    total = b.column_sums()
+    squares = np.bincount(b.indices, weights=b.data * b.data, minlength=graph.n_agents)
+    hhi = np.divide(squares, total * total, out=np.zeros_like(total), where=total > 0)
+    hhi[hhi <= threshold] = -1.0
+    return [
+        {**_agent_row(graph, agents, j), "herfindahl": round(float(hhi[j]), 4),
+         "total": round(float(total[j]), 2)}
+        for j in top_indices(hhi, min(limit, int((hhi > threshold).sum()))).tolist()
+    ]
+
+
+def contagion_path(graph: CapitalGraph, agents: Mapping[str, AgentFundamentals],
+                   taxonomy: Taxonomy, shock: ShockEvent, limit: int = 10) -> list[dict]:
+    """Shock → sector → agent → pool → user rows, largest user exposure first."""
+    impact = shock_sector_impact(taxonomy, shock)
+    b = graph.backs
+    src = b.sources()
+    edges = np.flatnonzero((impact[graph.agent_sector[b.indices]] != 0) & (b.data > 0) & (src != 0))
+    if not len(edges):
+        return []
+
+    # Join each BACKS edge with its pool's users.
+    shares = graph.pool_user_shares()
+    rev_ptr, rev_src, rev_pos = shares.reverse_index()
+    pools = src[edges]
+    counts = np.diff(rev_ptr)[pools]
+    edge_rep = np.repeat(np.arange(len(edges)), counts)
+    offset = np.arange(len(edge_rep)) - np.repeat(np.cumsum(counts) - counts, counts)
+    entry = rev_ptr[pools][edge_rep] + offset
+    exposure = b.data[edges][edge_rep] * shares.data[rev_pos[entry]]
+
+    rows = []
+    for k in top_indices(exposure, limit).tolist():
+        e = edges[edge_rep[k]]
+        j, p, u = int(b.indices[e]), int(src[e]), int(rev_src[entry[k]])
+        agent = _agent_row(graph, agents, j)
+        rows.append({
+            "shock": shock.shock_type.value,
+            "sector": agent["sector"],
+            "agent": agent["name"],
+            "agent_id": agent["agent_id"],
+            "price": agent["price"],
+            "pool": graph.pools[p]["name"],
+            "pool_id": graph.pools[p]["id"],
+            "user_exposure": round(float(exposure[k]), 2),
+            "user": graph.users[u]["name"],
+            "user_id": graph.users[u]["id"],
+            "risk_profile": graph.users[u]["risk_profile"],
+        })
+    return rows
+
+
+def cross_sector(graph: CapitalGraph, limit: int = 10) -> list[dict]:
+    """Pools spanning more than one sector, largest first."""
+    b = graph.backs
+    n_sectors = len(graph.sectors)
+    by_sector = np.bincount(
+        b.sources() * n_sectors + graph.agent_sector[b.indices], weights=b.data,
+        minlength=len(graph.pools) * n_sectors,
+    ).reshape(len(graph.pools), n_sectors)
+    spans = (by_sector > 0).sum(axis=1)
+    total = by_sector.sum(axis=1)
+    total[spans <= 1] = -1.0
+    rows = []
+    for p in top_indices(total, min(limit, int((spans > 1).sum()))).tolist():
+        held = np.flatnonzero(by_sector[p] > 0).tolist()
+        rows.append({
+            "pool_id": graph.pools[p]["id"],
+            "pool": graph.pools[p]["name"],
+            "sectors": [graph.sectors[s].value for s in held],
+            "total": round(float(total[p]), 2),
+            "allocations": [{"sector": graph.sectors[s].value, "amount": round(float(by_sector[p, s]), 2)}
+                            for s in held],
+        })
+    return rows
+
+
+def impacted_users(graph: CapitalGraph, taxonomy: Taxonomy, shock: ShockEvent, limit: int = 10) -> list[dict]:
+    """Users ranked by estimated loss: pool share × backing × |shock impact| on each agent."""
+    agent_impact = np.abs(shock_sector_impact(taxonomy, shock))[graph.agent_sector]
+    pool_loss = graph.backs.matvec(agent_impact)
+    user_loss = graph.pool_user_shares().matvec(pool_loss)
+    return [
+        {"user_id": graph.users[u]["id"], "user": graph.users[u]["name"],
+         "risk_profile": graph.users[u]["risk_profile"], "estimated_loss": round(float(user_loss[u]), 2)}
+        for u in top_indices(user_loss, limit).tolist()
+        if user_loss[u] > 0
+    ]
+
+
+# ── Node / edge view ─────────────────────────────────────────────────────────
+
+def subgraph(graph: CapitalGraph, agents: Mapping[str, AgentFundamentals], slots,
+             shock: ShockEvent | None = None, taxonomy: Taxonomy | None = None) -> dict:
+    """
+    Nodes and edges around the given agent slots: their sectors, the pools
+    backing them and those pools' users, plus the shock and its IMPACTS
+    edges when given.
+    """
+    nodes: dict[str, dict] = {}
+    edges: list[dict] = []
+    b = graph.backs
+    pool_value = b.row_sums()
+    pools_seen: set[int] = set()
+
+    if shock is not None:
+        nodes[f"shock:{shock.shock_id}"] = {
+            "id": f"shock:{shock.shock_id}", "type": "ShockEvent", "name": shock.shock_type.value,
+            "severity": shock.severity, "description": shock.description,
+        }
+        impact = shock_sector_impact(taxonomy, shock)
+        for s in np.flatnonzero(impact).tolist():
+            _sector_node(nodes, graph, s)
+            edges.append({"source": f"shock:{shock.shock_id}", "target": f"sector:{graph.sectors[s].value}",
+                          "type": "IMPACTS", "severity": round(float(abs(impact[s])), 4),
+                          "direction": 1.0 if impact[s] > 0 else -1.0})
+
+    for j in np.asarray(slots, dtype=np.intp).tolist():
+        row = _agent_row(graph, agents, j)
+        agent = agents.get(row["agent_id"])
+        agent_key = f"agent:{row['agent_id']}"
+        nodes[agent_key] = {"id": agent_key, "type": "Agent", **row,
+                            "market_cap": round(agent.market_cap, 2) if agent else None}
+        sector_key = _sector_node(nodes, graph, int(graph.agent_sector[j]))
+        edges.append({"source": agent_key, "target": sector_key, "type": "IN_SECTOR"})
+
+        pools, amounts = b.column(j)
+        for p, amount in zip(pools.tolist(), amounts.tolist()):
+            if amount <= 0:
+                continue
+            pool = graph.pools[p]
+            pool_key = f"pool:{pool['id']}"
+            if p not in pools_seen:
+                pools_seen.add(p)
+                nodes[pool_key] = {"id": pool_key, "type": "CapitalPool", **pool,
+                                   "total_value": round(float(pool_value[p]), 2)}
+            edges.append({"source": pool_key, "target": agent_key, "type": "BACKS",
+                          "amount": round(amount, 2), "weight": round(amount / max(pool_value[p], 1e-12), 6)})
+
+    for p in sorted(pools_seen):
+        if graph.pools[p]["id"] == OPEN_MARKET:
+            continue
+        users, amounts = graph.allocates.column(p)
+        for u, amount in zip(users.tolist(), amounts.tolist()):
+            user = graph.users[u]
+            user_key = f"user:{user['id']}"
+            nodes.setdefault(user_key, {"id": user_key, "type": "User", **user})
+            edges.append({"source": user_key, "target": f"pool:{graph.pools[p]['id']}",
+                          "type": "ALLOCATES", "amount": round(amount, 2)})
+
+    return {"nodes": list(nodes.values()), "edges": edges}
+
+
+def _sector_node(nodes: dict[str, dict], graph: CapitalGraph, s: int) -> str:
+    key = f"sector:{graph.sectors[s].value}"
+    nodes.setdefault(key, {"id": key, "type": "Sector", "name": graph.sectors[s].value})
+    return key
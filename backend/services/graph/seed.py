@@ -0,0 +1,111 @@
+"""
+Synthetic users and capital pools for the capital graph.
+
+Seed counts follow docs/GRAPH_SCHEMA.md (20-50 users, 8-12 pools). Each
+agent's current total_backing is split between the open market and two to
+five named pools. Pool choice follows strategy: high_risk pools favour
+risky agents, safe_haven pools safe ones, sector_balanced pools pick
+uniformly. Every named pool gets one to three users, whose allocations add
+up to the pool's value.
+
+The spread is chosen so the 0.4 "Concentrated Backing" threshold
+(queries.HHI_THRESHOLD) picks out a minority. A typical agent, with 15-50%
+on the open market and the rest over several pools, has an HHI around
+0.25-0.35. CONCENTRATED_FRACTION of agents are instead held 60-90% by a
+single pool and start flagged. With repeat picks of one pool, about a
+quarter of a large universe starts above the threshold. Spreading only
+over one to three pools would put nearly every agent above it, and the
+flag would carry no information.
+"""
+
+import os
+
+import numpy as np
+
+from backend.services.market_engine.models import AgentFundamentals, Sector
+from .capital_graph import CapitalGraph
+
+GRAPH_USERS = int(os.environ.get("CAPITAL_GRAPH_USERS", 30))
+GRAPH_POOLS = int(os.environ.get("CAPITAL_GRAPH_POOLS", 10))
+CONCENTRATED_FRACTION = 0.1     # agents seeded with one dominant pool
+
+STRATEGIES = ("sector_balanced", "high_risk", "safe_haven")
+RISK_PROFILES = ("aggressive", "moderate", "conservative")
+POOL_NAMES = (
+    "Alpha Fund", "Beta Capital", "Gamma Partners", "Delta Ventures", "Epsilon Growth",
+    "Zeta Reserve", "Eta Holdings", "Theta Quant", "Iota Trust", "Kappa Strategic",
+    "Lambda Yield", "Mu Opportunity",
+)
+USER_NAMES = (
+    "Alice", "Bob", "Carol", "Dave", "Erin", "Frank", "Grace", "Heidi", "Ivan", "Judy",
+    "Mallory", "Niaj", "Olivia", "Peggy", "Rupert", "Sybil", "Trent", "Victor", "Walter", "Yolanda",
+)
+
+
+def seed_capital_graph(
+    agents: list[AgentFundamentals],
+    sector_idx: np.ndarray,
+    sectors: tuple[Sector, ...],
+    n_users: int = GRAPH_USERS,
+    n_pools: int = GRAPH_POOLS,
+    seed: int = 0,
+) -> CapitalGraph:
+    """Build a graph over `agents` (in frame order, with their taxonomy sector indices)."""
+    rng = np.random.default_rng(seed)
+    n = len(agents)
+    agent_ids = [a.agent_id for a in agents]
+    backing = np.fromiter((a.total_backing for a in agents), np.float64, n)
+    risk = np.fromiter((a.risk_score for a in agents), np.float64, n)
+
+    pools = [
+        {
+            "id": f"pool_{i + 1:03d}",
+            "name": POOL_NAMES[i % len(POOL_NAMES)] + (f" {i // len(POOL_NAMES) + 1}" if i >= len(POOL_NAMES) else ""),
+            "strategy": STRATEGIES[i % len(STRATEGIES)],
+        }
+        for i in range(n_pools)
+    ]
+    users = [
+        {
+            "id": f"user_{i + 1:03d}",
+            "name": USER_NAMES[i % len(USER_NAMES)] + (f" {i // len(USER_NAMES) + 1}" if i >= len(USER_NAMES) else ""),
+            "risk_profile": RISK_PROFILES[int(rng.integers(len(RISK_PROFILES)))],
+        }
+        for i in range(n_users)
+    ]
+
+    backs: tuple[list, list, list] = ([], [], [])
+    pool_value = np.zeros(n_pools)
+    open_market = backing
+    if n_pools and n:
+        # Pool preference per agent: (agents, pools), rows normalised to CDFs.
+        strategy = np.array([STRATEGIES.index(p["strategy"]) for p in pools])
+        pref = 0.05 + np.where(strategy == 1, risk[:, None], np.where(strategy == 2, 1.0 - risk[:, None], 1.0))
+        cdf = np.cumsum(pref, axis=1)
+        cdf /= cdf[:, -1:]
+
+        concentrated = rng.random(n) < CONCENTRATED_FRACTION
+        picks = np.where(concentrated, 1, rng.integers(2, 6, n))        # else 2-5 named pools
+        slot = np.repeat(np.arange(n), picks)
+        pool = (cdf[slot] < rng.random(len(slot))[:, None]).sum(axis=1)
+        share = rng.gamma(2.0, size=len(slot))
+        share /= np.bincount(slot, weights=share, minlength=n)[slot]
+
+        # Fraction not on the open market.
+        named = np.where(concentrated, rng.uniform(0.6, 0.9, n), rng.uniform(0.5, 0.85, n))
+        amounts = backing[slot] * named[slot] * share
+        open_market = backing * (1.0 - named)
+        pool_value = np.bincount(pool, weights=amounts, minlength=n_pools)
+        backs = ([pools[p]["id"] for p in pool.tolist()], [agent_ids[j] for j in slot.tolist()], amounts)
+
+    allocations: tuple[list, list, list] = ([], [], [])
+    if n_users:
+        for i, p in enumerate(pools):
+            members = {i % n_users, *rng.integers(0, n_users, int(rng.integers(0, 3))).tolist()}
+            weights = rng.gamma(1.0, size=len(members))
+            for u, w in zip(sorted(members), weights / weights.sum()):
+                allocations[0].append(users[u]["id"])
+                allocations[1].append(p["id"])
+                allocations[2].append(float(pool_value[i] * w))
+
+    return CapitalGraph(agent_ids, sector_idx, sectors, pools, users, backs, allocations, open_market)
@@ -0,0 +1,142 @@
+"""
+Agent-to-agent exposure through shared backing pools, and what it drives:
+the optional spillover term in the price model and the cascade measure.
+
+Agent i's exposure to agent j is how much of i's pool-held backing sits in
+pools that also hold j, weighted by j's share of those pools:
+
+    E[i, j] = Σ_p (W[p, i] / A_i) · (W[p, j] / P_p)
+
+W is the BACKS table over named pools (the open market is not a shared
+holder), A_i = Σ_p W[p, i] and P_p = Σ_j W[p, j]. Rows of E sum to 1. The
+spillover uses the off-diagonal part, renormalised so each row still sums
+to 1: E_off x = (E x - diag(E) · x) / (1 - diag(E)).
+
+E is never materialised. Any pool holding k agents would add k² entries;
+instead E x is two sparse passes over W's edges (agents → pools → agents),
+O(edges) per apply. The normalisers A, P and diag(E) are cached. refresh()
+updates them only for pools whose BACKS row changed since the last call
+(EdgeTable.row_version), at O(pool degree) each, and rebuilds them only
+when the edge layout changes. Open-market flows move every tick but do not
+enter E, so in steady state a tick pays for the two passes and nothing
+else.
+
+MARKET_SPILLOVER = s > 0 adds s · E_off r to each agent's price delta, where
+r is the previous tick's log returns. It is off by default.
+
+cascade_probability() replaces the old volatility-plus-severity heuristic.
+It takes each agent's loss this tick, adds the loss reaching it from agents
+it is exposed to, and maps the cap-weighted average of that
+network-amplified loss to [0, 1).
+"""
+
+import math
+import os
+
+import numpy as np
+
+from .capital_graph import CapitalGraph
+
+SPILLOVER_STRENGTH = float(os.environ.get("MARKET_SPILLOVER", 0.0))
+# Cap-weighted amplified loss per tick that maps to 1 - 1/e ≈ 63% cascade probability.
+CASCADE_LOSS_SCALE = float(os.environ.get("CASCADE_LOSS_SCALE", 0.02))
+
+_EPS = 1e-12
+
+
+class ExposureMatrix:
+    def __init__(self, graph: CapitalGraph):
+        self.graph = graph
+        self._layout = -1
+        self.full_rebuilds = 0
+        self.row_updates = 0
+
+    # ── Normalisers ──────────────────────────────────────────────────────────
+
+    def refresh(self) -> None:
+        b = self.graph.backs
+        if self._layout != b.version:
+            self._rebuild()
+            return
+        changed = np.flatnonzero(b.row_version[1:] != self._row_version[1:]) + 1
+        for p in changed.tolist():
+            self._update_pool(p)
+
+    def _rebuild(self) -> None:
+        b = self.graph.backs
+        base = b.indptr[1]
+        s, d, w = b.sources()[base:], b.indices[base:], b.data[base:]
+        self._pool_total = np.bincount(s, weights=w, minlength=b.n_src)
+        self._agent_total = np.bincount(d, weights=w, minlength=b.n_dst)
+        inv_pool = _inverse(self._pool_total)
+        self._diag_num = np.bincount(d, weights=w * w * inv_pool[s], minlength=b.n_dst)
+        self._inv_pool = inv_pool
+        self._weights = w.copy()
+        self._row_version = b.row_version.copy()
+        self._layout = b.version
+        self._derive(slice(None))
+        self.full_rebuilds += 1
+
+    def _update_pool(self, p: int) -> None:
+        """Fold one pool's weight changes into the cached normalisers."""
+        b = self.graph.backs
+        base = b.indptr[1]
+        lo, hi = b.indptr[p], b.indptr[p + 1]
+        agents = b.indices[lo:hi]
+        old, new = self._weights[lo - base:hi - base], b.data[lo:hi]
+        old_inv, new_total = self._inv_pool[p], float(new.sum())
+        new_inv = 1.0 / new_total if new_total > _EPS else 0.0
+
+        self._agent_total[agents] += new - old
+        self._diag_num[agents] += new * new * new_inv - old * old * old_inv
+        self._pool_total[p], self._inv_pool[p] = new_total, new_inv
+        self._weights[lo - base:hi - base] = new
+        self._row_version[p] = b.row_version[p]
+        self._derive(agents)
+        self.row_updates += 1
+
+    def _derive(self, agents) -> None:
+        if isinstance(agents, slice):
+            self._inv_agent = _inverse(self._agent_total)
+            self._diag = self._diag_num * self._inv_agent
+            self._inv_offdiag = _inverse(1.0 - self._diag)
+            return
+        inv_agent = _inverse(self._agent_total[agents])
+        diag = self._diag_num[agents] * inv_agent
+        self._inv_agent[agents] = inv_agent
+        self._diag[agents] = diag
+        self._inv_offdiag[agents] = _inverse(1.0 - diag)
+
+    # ── Products ─────────────────────────────────────────────────────────────
+
+    def apply(self, x: np.ndarray) -> np.ndarray:
+        """E_off · x for a per-agent vector in frame order."""
+        self.refresh()
+        b = self.graph.backs
+        base = b.indptr[1]
+        s, d, w = b.sources()[base:], b.indices[base:], b.data[base:]
+        pool = np.bincount(s, weights=w * x[d], minlength=b.n_src) * self._inv_pool
+        exposed = np.bincount(d, weights=w * pool[s], minlength=b.n_dst) * self._inv_agent
+        return (exposed - self._diag * x) * self._inv_offdiag
+
+    def stats(self) -> dict:
+        return {"full_rebuilds": self.full_rebuilds, "row_updates": self.row_updates,
+                "edges": int(self.graph.backs.nnz - self.graph.backs.indptr[1])}
+
+
+def _inverse(x: np.ndarray) -> np.ndarray:
+    return np.divide(1.0, x, out=np.zeros_like(x, dtype=np.float64), where=np.abs(x) > _EPS)
+
+
+def cascade_probability(exposure: ExposureMatrix, returns: np.ndarray, market_cap: np.ndarray) -> float:
+    """
+    Cap-weighted network-amplified loss, as a probability: each agent's own
+    loss this tick plus the loss its backing pools pass on from other agents.
+    """
+    total_cap = float(market_cap.sum())
+    if total_cap <= 0 or not len(returns):
+        return 0.0
+    loss = np.maximum(-returns, 0.0)
+    amplified = loss + exposure.apply(loss)
+    weighted = float(market_cap @ amplified) / total_cap
+    return round(1.0 - math.exp(-weighted / CASCADE_LOSS_SCALE), 4)
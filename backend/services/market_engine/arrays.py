@@ -0,0 +1,299 @@
+"""
+Struct-of-arrays agent storage for the vectorized engine.
+
+Every per-agent field lives in its own contiguous NumPy array indexed by
+agent position, so a tick updates the whole market with a handful of batched
+array operations instead of a Python loop over AgentFundamentals objects.
+
+AgentView exposes the same attribute surface as AgentFundamentals on top of
+those arrays, so routes and tools that read `engine.state.agents[...]` keep
+working unchanged.
+"""
+
+import numpy as np
+
+from backend.services.shock_engine.taxonomy import Taxonomy
+from .models import AgentFundamentals, Sector, PRICE_HISTORY_WINDOW
+from .universe import swap_remove
+
+HISTORY_LEN = PRICE_HISTORY_WINDOW
+
+
+class AgentArrays:
+    """Contiguous per-field arrays, one row per agent; rows are appended and swap-removed."""
+
+    FLOAT_FIELDS = (
+        "usage_score",
+        "performance_score",
+        "reliability_score",
+        "risk_score",
+        "inflow_velocity",
+        "total_backing",
+        "price",
+        "volatility",
+        "market_cap",
+    )
+    ROW_ARRAYS = (
+        *FLOAT_FIELDS, "sector_idx", "prev_performance", "prev_risk",
+        "history", "returns", "ret_sum", "ret_sumsq",
+    )
+
+    def __init__(self, agents: list[AgentFundamentals], taxonomy: Taxonomy):
+        self.ids: list[str] = [a.agent_id for a in agents]
+        self.names: list[str] = [a.name for a in agents]
+        self.index: dict[str, int] = {aid: i for i, aid in enumerate(self.ids)}
+
+        # Sector order matches the beta matrix columns so shock impacts can be
+        # broadcast with `impacts[sector_idx]`.
+        self.sectors: list[Sector] = list(taxonomy.sectors)
+        self.sector_index = taxonomy.sector_index
+        self.sector_idx = np.array([self.sector_index[a.sector] for a in agents], dtype=np.int32)
+
+        for name in self.FLOAT_FIELDS:
+            setattr(self, name, np.array([getattr(a, name) for a in agents], dtype=np.float64))
+
+        self.prev_performance = self.performance_score.copy()
+        self.prev_risk = self.risk_score.copy()
+
+        # Ring buffer of the last HISTORY_LEN prices. Column `history_head` holds
+        # the oldest price; the newest sits just before it.
+        self.history = self._history_rows(agents)
+        self.history_head = 0
+
+        # Matching ring of log returns plus running sum / sum-of-squares, so a
+        # tick updates volatility in O(N) regardless of window length.
+        self.returns = np.diff(np.log(self.history), axis=1)
+        self.returns_head = 0
+        self.ret_sum = np.empty(len(agents))
+        self.ret_sumsq = np.empty(len(agents))
+        self._resync_returns()
+
+        # Every per-agent array is a view of the first `count` rows of a
+        # buffer with spare capacity, so listings append in amortized O(k).
+        self._buffers = {name: getattr(self, name) for name in self.ROW_ARRAYS}
+
+    @property
+    def count(self) -> int:
+        return len(self.ids)
+
+    def views(self) -> dict[str, "AgentView"]:
+        return {aid: AgentView(self, i) for i, aid in enumerate(self.ids)}
+
+    # ── Price history ────────────────────────────────────────────────────────
+
+    def push_prices(self, new_price: np.ndarray) -> None:
+        """Record a new price column, then refresh market cap and volatility."""
+        newest = self.history[:, self.history_head - 1]
+        new_ret = np.log(new_price / newest)
+        old_ret = self.returns[:, self.returns_head]
+        self.ret_sum += new_ret - old_ret
+        self.ret_sumsq += new_ret * new_ret - old_ret * old_ret
+        self.returns[:, self.returns_head] = new_ret
+        self.returns_head = (self.returns_head + 1) % (HISTORY_LEN - 1)
+        if self.returns_head == 0:
+            self._resync_returns()
+
+        self.history[:, self.history_head] = new_price
+        self.history_head = (self.history_head + 1) % HISTORY_LEN
+        self.price[:] = new_price
+        np.multiply(new_price, self.total_backing, out=self.market_cap)
+
+        m = HISTORY_LEN - 1
+        mean = self.ret_sum / m
+        np.sqrt(np.maximum(self.ret_sumsq / m - mean * mean, 0.0), out=self.volatility)
+
+    def last_returns(self) -> np.ndarray:
+        """Log return of the most recent tick per agent."""
+        return self.returns[:, self.returns_head - 1]
+
+    def _resync_returns(self) -> None:
+        """Re-derive running sums from the ring once per full cycle (bounds drift)."""
+        self.ret_sum[:] = self.returns.sum(axis=1)
+        self.ret_sumsq[:] = np.square(self.returns).sum(axis=1)
+
+    @staticmethod
+    def _history_rows(agents: list[AgentFundamentals]) -> np.ndarray:
+        """(len(agents), HISTORY_LEN) prices, oldest first, left-padded with the oldest known price."""
+        rows = np.empty((len(agents), HISTORY_LEN), dtype=np.float64)
+        for i, a in enumerate(agents):
+            hist = list(a.price_history)[-HISTORY_LEN:]
+            rows[i, :HISTORY_LEN - len(hist)] = hist[0]
+            rows[i, HISTORY_LEN - len(hist):] = hist
+        return rows
+
+    def history_of(self, i: int) -> list[float]:
+        h = self.history_head
+        return self.history[i, h:].tolist() + self.history[i, :h].tolist()
+
+    def history_lists(self) -> list[list[float]]:
+        """Every agent's history, oldest first, in one batched unroll of the ring."""
+        h = self.history_head
+        return np.concatenate((self.history[:, h:], self.history[:, :h]), axis=1).tolist()
+
+    def price_change_pct(self) -> np.ndarray:
+        oldest = self.history[:, self.history_head]
+        safe = np.where(oldest == 0, 1.0, oldest)
+        return np.where(oldest == 0, 0.0, (self.price - oldest) / safe * 100)
+
+    # ── Listing / delisting ──────────────────────────────────────────────────
+
+    def append(self, agents: list[AgentFundamentals]) -> None:
+        """Add agents as new rows at the end, aligned with the current ring heads."""
+        n, k = self.count, len(agents)
+        self._reserve(n + k)
+        for a in agents:
+            self.index[a.agent_id] = len(self.ids)
+            self.ids.append(a.agent_id)
+            self.names.append(a.name)
+        self._reslice()
+
+        rows = slice(n, n + k)
+        self.sector_idx[rows] = [self.sector_index[a.sector] for a in agents]
+        for name in self.FLOAT_FIELDS:
+            getattr(self, name)[rows] = [getattr(a, name) for a in agents]
+        self.prev_performance[rows] = self.performance_score[rows]
+        self.prev_risk[rows] = self.risk_score[rows]
+
+        prices = self._history_rows(agents)
+        returns = np.diff(np.log(prices), axis=1)
+        self.history[rows] = np.roll(prices, self.history_head, axis=1)
+        self.returns[rows] = np.roll(returns, self.returns_head, axis=1)
+        self.ret_sum[rows] = returns.sum(axis=1)
+        self.ret_sumsq[rows] = np.square(returns).sum(axis=1)
+
+    def remove(self, agent_ids: list[str]) -> list[int]:
+        """Swap-remove agents' rows. Returns the rows that now hold a different (moved) agent."""
+        dst, src = swap_remove(self.ids, self.index, agent_ids)
+        for buf in self._buffers.values():
+            buf[dst] = buf[src]
+        moved_names = [self.names[j] for j in src]
+        for j, name in zip(dst, moved_names):
+            self.names[j] = name
+        del self.names[len(self.ids):]
+        self._reslice()
+        return dst
+
+    def remap_sectors(self, taxonomy: Taxonomy) -> None:
+        """Re-point sector_idx at a new taxonomy's sector order (every used sector must exist)."""
+        remap = np.array([taxonomy.sector_index.get(s, -1) for s in self.sectors], dtype=np.int32)
+        self.sector_idx[:] = remap[self.sector_idx]
+        self.sectors = list(taxonomy.sectors)
+        self.sector_index = taxonomy.sector_index
+
+    def _reserve(self, n: int) -> None:
+        capacity = len(self._buffers["price"])
+        if n <= capacity:
+            return
+        capacity = max(n, capacity * 2, 64)
+        count = self.count
+        for name, buf in self._buffers.items():
+            grown = np.empty((capacity, *buf.shape[1:]), dtype=buf.dtype)
+            grown[:count] = buf[:count]
+            self._buffers[name] = grown
+
+    def _reslice(self) -> None:
+        n = self.count
+        for name, buf in self._buffers.items():
+            setattr(self, name, buf[:n])
+
+    # ── Serialization ────────────────────────────────────────────────────────
+
+    def to_dicts(self) -> list[dict]:
+        """Same shape as AgentFundamentals.to_dict(), built column-wise."""
+        sector_values = [s.value for s in self.sectors]
+        sectors = [sector_values[j] for j in self.sector_idx.tolist()]
+        inflow = self.inflow_velocity
+        direction = np.where(inflow > 0.05, "up", np.where(inflow < -0.05, "down", "flat")).tolist()
+
+        price = np.round(self.price, 2).tolist()
+        change = np.round(self.price_change_pct(), 2).tolist()
+        cap = np.round(self.market_cap, 2).tolist()
+        usage = self.usage_score.tolist()
+        perf = self.performance_score.tolist()
+        rel = self.reliability_score.tolist()
+        risk = self.risk_score.tolist()
+        inflow_r = np.round(inflow, 4).tolist()
+        vol = np.round(self.volatility, 4).tolist()
+        backing = self.total_backing.tolist()
+
+        return [
+            {
+                "id": self.ids[i],
+                "name": self.names[i],
+                "sector": sectors[i],
+                "price": price[i],
+                "price_change_pct": change[i],
+                "market_cap": cap[i],
+                "usage_score": usage[i],
+                "performance_score": perf[i],
+                "reliability_score": rel[i],
+                "risk_score": risk[i],
+                "inflow_velocity": inflow_r[i],
+                "inflow_direction": direction[i],
+                "volatility": vol[i],
+                "total_backing": backing[i],
+            }
+            for i in range(self.count)
+        ]
+
+
+class _Column:
+    """Descriptor that reads/writes one agent's slot of an AgentArrays field."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, view, owner=None):
+        if view is None:
+            return self
+        return float(getattr(view._arrays, self.name)[view._i])
+
+    def __set__(self, view, value: float) -> None:
+        getattr(view._arrays, self.name)[view._i] = value
+
+
+class AgentView:
+    """AgentFundamentals-compatible handle onto one row of AgentArrays."""
+
+    __slots__ = ("_arrays", "_i")
+
+    usage_score = _Column("usage_score")
+    performance_score = _Column("performance_score")
+    reliability_score = _Column("reliability_score")
+    risk_score = _Column("risk_score")
+    inflow_velocity = _Column("inflow_velocity")
+    total_backing = _Column("total_backing")
+    price = _Column("price")
+    volatility = _Column("volatility")
+    market_cap = _Column("market_cap")
+
+    def __init__(self, arrays: AgentArrays, i: int):
+        self._arrays = arrays
+        self._i = i
+
+    @property
+    def agent_id(self) -> str:
+        return self._arrays.ids[self._i]
+
+    @property
+    def name(self) -> str:
+        return self._arrays.names[self._i]
+
+    @property
+    def sector(self) -> Sector:
+        return self._arrays.sectors[self._arrays.sector_idx[self._i]]
+
+    @property
+    def price_history(self) -> list[float]:
+        return self._arrays.history_of(self._i)
+
+    @property
+    def price_change_pct(self) -> float:
+        a = self._arrays
+        oldest = float(a.history[self._i, a.history_head])
+        if oldest == 0:
+            return 0.0
+        return ((float(a.price[self._i]) - oldest) / oldest) * 100
+
+    inflow_direction = AgentFundamentals.inflow_direction
+    to_dict = AgentFundamentals.to_dict
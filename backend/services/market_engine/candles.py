@@ -0,0 +1,211 @@
+"""
+Incremental multi-resolution OHLCV candles.
+
+For every configured resolution the aggregator keeps a ring of the last
+`retention` bars per agent as (bars, agents) arrays. Each tick
+updates the current bar of every resolution with a few batched array
+operations (max/min/assign over all agents). A bar is never rebuilt from
+raw ticks.
+
+Volume and net inflow come from buy/sell amounts recorded between ticks
+(simulate_buy / simulate_sell, plus the engine's passive flows). They are
+attributed to the bar that contains the next tick.
+
+Resolutions are given in ticks ("10t") or wall time ("1m", "5m", "1h").
+Wall-time resolutions are converted to ticks using the engine's tick
+interval, and bars start on tick numbers that are multiples of the bar
+length. OHLC prices are float32 and served rounded to the engine's 2-decimal
+price precision (as AgentArrays.to_dicts does); volume and net inflow are
+dollar totals and stay float64. Memory is retention × resolutions × 32
+bytes per agent.
+
+Agents listed at runtime get a NaN column (no bars yet) that fills in from
+their first tick; delisting swap-removes the column, in step with the
+engine's agent order.
+"""
+
+import os
+import re
+
+import numpy as np
+
+from .history_store import TickFrame
+from .universe import swap_remove
+
+RESOLUTIONS = tuple(
+    r.strip() for r in os.environ.get("CANDLE_RESOLUTIONS", "10t,1m,5m,1h").split(",") if r.strip()
+)
+RETENTION = int(os.environ.get("CANDLE_RETENTION", 200))
+
+_UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+_OHLC = ("open", "high", "low", "close")
+_DTYPES = {**dict.fromkeys(_OHLC, np.float32), "volume": np.float64, "net_inflow": np.float64}
+_DECIMALS = 2          # prices and dollar amounts, as in AgentArrays.to_dicts
+
+
+def resolution_ticks(resolution: str, tick_interval_s: float) -> int:
+    """Bar length in ticks for "<n>t" or "<n>s|m|h|d"."""
+    m = re.fullmatch(r"(\d+)([tsmhd])", resolution)
+    if not m:
+        raise ValueError(f"Bad candle resolution: {resolution}")
+    n, unit = int(m.group(1)), m.group(2)
+    if unit == "t":
+        return max(1, n)
+    return max(1, round(n * _UNIT_SECONDS[unit] / tick_interval_s))
+
+
+class _Series:
+    """Ring of bars for one resolution."""
+
+    def __init__(self, bar_ticks: int, retention: int, n_agents: int):
+        self.bar_ticks = bar_ticks
+        self.retention = retention
+        self.start_tick = np.full(retention, -1, dtype=np.int64)
+        self.start_ts = np.zeros(retention, dtype=np.float64)
+        # (retention, capacity) buffers; `bars` are views of the first n_agents columns.
+        self._buffers = {name: np.zeros((retention, n_agents), dtype=dtype)
+                         for name, dtype in _DTYPES.items()}
+        self.bars = dict(self._buffers)
+        self.head = -1          # row of the current (still updating) bar
+        self.count = 0
+
+    def resize(self, n_agents: int) -> None:
+        capacity = self._buffers["open"].shape[1]
+        if n_agents > capacity:
+            old = self.bars["open"].shape[1]
+            capacity = max(n_agents, capacity * 2, 64)
+            for name, buf in self._buffers.items():
+                grown = np.empty((self.retention, capacity), dtype=buf.dtype)
+                grown[:, :old] = buf[:, :old]
+                self._buffers[name] = grown
+        self.bars = {name: buf[:, :n_agents] for name, buf in self._buffers.items()}
+
+    def list_agents(self, cols: slice) -> None:
+        for col in self.bars.values():
+            col[:, cols] = np.nan
+
+    def move(self, dst: list[int], src: list[int]) -> None:
+        for col in self.bars.values():
+            col[:, dst] = col[:, src]
+
+    def update(self, frame: TickFrame, price: np.ndarray, volume: np.ndarray, net: np.ndarray,
+               listed: slice | None = None) -> None:
+        start = frame.tick_number - frame.tick_number % self.bar_ticks
+        b = self.bars
+        if self.head < 0 or start != self.start_tick[self.head]:
+            self.head = (self.head + 1) % self.retention
+            self.count = min(self.count + 1, self.retention)
+            self.start_tick[self.head] = start
+            self.start_ts[self.head] = frame.timestamp
+            for name in _OHLC:
+                b[name][self.head] = price
+            b["volume"][self.head] = volume
+            b["net_inflow"][self.head] = net
+            return
+
+        h = self.head
+        if listed is not None:
+            # First tick of newly listed agents: their part of the current bar opens here.
+            for name in _OHLC:
+                b[name][h, listed] = price[listed]
+            b["volume"][h, listed] = 0.0
+            b["net_inflow"][h, listed] = 0.0
+        np.maximum(b["high"][h], price, out=b["high"][h])
+        np.minimum(b["low"][h], price, out=b["low"][h])
+        b["close"][h] = price
+        b["volume"][h] += volume
+        b["net_inflow"][h] += net
+
+    def rows(self, limit: int) -> np.ndarray:
+        """Ring rows of the newest `limit` bars, oldest first."""
+        n = min(limit, self.count)
+        return (np.arange(self.head - n + 1, self.head + 1)) % self.retention
+
+
+class CandleAggregator:
+    def __init__(self, ids: list[str], tick_interval_s: float,
+                 resolutions: tuple[str, ...] = RESOLUTIONS, retention: int = RETENTION):
+        self.ids = list(ids)
+        self.index = {aid: j for j, aid in enumerate(ids)}
+        self.series = {
+            r: _Series(resolution_ticks(r, tick_interval_s), retention, len(ids))
+            for r in resolutions
+        }
+        self._listed: slice | None = None     # columns added since the last update
+        # Flows recorded since the last tick: rows are (volume, net inflow).
+        self._flows = np.zeros((2, len(ids)), dtype=np.float64)
+        self._volume, self._net = self._flows
+        self.ticks_recorded = 0
+
+    @property
+    def resolutions(self) -> list[str]:
+        return list(self.series)
+
+    def record_flow(self, agent_id: str, amount: float) -> None:
+        """Signed capital flow for one agent: + buy, - sell."""
+        j = self.index.get(agent_id)
+        if j is not None:
+            self._volume[j] += abs(amount)
+            self._net[j] += amount
+
+    def record_flows(self, buys: np.ndarray, sells: np.ndarray) -> None:
+        """Batched flows aligned with `ids` (both non-negative)."""
+        self._volume += buys + sells
+        self._net += buys - sells
+
+    def add(self, agent_ids: list[str]) -> None:
+        """Append columns for newly listed agents."""
+        if not agent_ids:
+            return
+        n, k = len(self.ids), len(agent_ids)
+        for aid in agent_ids:
+            self.index[aid] = len(self.ids)
+            self.ids.append(aid)
+        if n + k > self._flows.shape[1]:
+            grown = np.zeros((2, max(n + k, 2 * self._flows.shape[1], 64)))
+            grown[:, :n] = self._flows[:, :n]
+            self._flows = grown
+        self._flows[:, n:n + k] = 0.0
+        self._volume, self._net = self._flows[:, :n + k]
+        start = n if self._listed is None else min(n, self._listed.start)
+        self._listed = slice(start, n + k)
+        for series in self.series.values():
+            series.resize(n + k)
+            series.list_agents(slice(n, n + k))
+
+    def remove(self, agent_ids: list[str]) -> None:
+        """Swap-remove delisted agents' columns (same order as the engine)."""
+        if not agent_ids:
+            return
+        dst, src = swap_remove(self.ids, self.index, agent_ids)
+        for series in self.series.values():
+            series.move(dst, src)
+        self._flows[:, dst] = self._flows[:, src]
+        n = len(self.ids)
+        self._volume, self._net = self._flows[:, :n]
+        for series in self.series.values():
+            series.resize(n)
+
+    def update(self, frame: TickFrame) -> None:
+        price = frame.columns["price"]
+        for series in self.series.values():
+            series.update(frame, price, self._volume, self._net, self._listed)
+        self._listed = None
+        self._volume[:] = 0.0
+        self._net[:] = 0.0
+        self.ticks_recorded += 1
+
+    def candles(self, agent_id: str, resolution: str, limit: int) -> dict[str, list] | None:
+        """Newest `limit` bars for one agent, oldest first, column-wise. None if unknown agent."""
+        j = self.index.get(agent_id)
+        if j is None:
+            return None
+        series = self.series[resolution]
+        rows = series.rows(limit)
+        rows = rows[~np.isnan(series.bars["open"][rows, j])]   # bars before the agent was listed
+        return {
+            "start_tick": series.start_tick[rows].tolist(),
+            "start_ts": series.start_ts[rows].tolist(),
+            **{name: np.round(col[rows, j].astype(np.float64), _DECIMALS).tolist()
+               for name, col in series.bars.items()},
+        }
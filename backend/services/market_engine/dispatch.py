@@ -0,0 +1,148 @@
+"""
+Tick-event fan-out.
+
+The engine publishes each tick to the dispatcher without awaiting anyone.
+Every subscriber has its own bounded queue and worker task, so subscribers
+run concurrently and a slow one (telemetry flush, WebSocket broadcast) never
+delays the next price update. When a subscriber's queue is full its
+overflow policy decides what gets dropped:
+
+  drop_oldest  discard the oldest pending tick to make room
+  drop_newest  discard the incoming tick
+  coalesce     never queue behind: a new tick replaces any still-pending one
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+TickCallback = Callable[[Any], Awaitable[None]]
+
+
+class OverflowPolicy(str, Enum):
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+    COALESCE = "coalesce"
+
+
+@dataclass
+class _Subscriber:
+    name: str
+    callback: TickCallback
+    policy: OverflowPolicy
+    queue: asyncio.Queue
+    task: asyncio.Task | None = None
+
+    delivered: int = 0
+    dropped: int = 0
+    errors: int = 0
+    last_published_tick: int = -1
+    last_processed_tick: int = -1
+    last_handler_ms: float = 0.0
+    max_handler_ms: float = 0.0
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "policy": self.policy.value,
+            "queue_depth": self.queue.qsize(),
+            "queue_capacity": self.queue.maxsize,
+            "lag_ticks": max(0, self.last_published_tick - self.last_processed_tick),
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "last_handler_ms": round(self.last_handler_ms, 3),
+            "max_handler_ms": round(self.max_handler_ms, 3),
+        }
+
+
+class TickDispatcher:
+    def __init__(self, maxsize: int = 4, policy: OverflowPolicy | str = OverflowPolicy.COALESCE):
+        self.default_maxsize = maxsize
+        self.default_policy = OverflowPolicy(policy)
+        self._subscribers: list[_Subscriber] = []
+        self._running = False
+
+    @property
+    def has_subscribers(self) -> bool:
+        return bool(self._subscribers)
+
+    def subscribe(
+        self,
+        callback: TickCallback,
+        name: str | None = None,
+        maxsize: int | None = None,
+        policy: OverflowPolicy | str | None = None,
+    ) -> None:
+        sub = _Subscriber(
+            name=name or getattr(callback, "__name__", f"subscriber_{len(self._subscribers)}"),
+            callback=callback,
+            policy=OverflowPolicy(policy) if policy else self.default_policy,
+            queue=asyncio.Queue(maxsize=maxsize or self.default_maxsize),
+        )
+        self._subscribers.append(sub)
+        if self._running:
+            sub.task = asyncio.create_task(self._worker(sub))
+
+    def start(self) -> None:
+        """Spawn one worker task per subscriber. Needs a running event loop."""
+        if self._running:
+            return
+        self._running = True
+        for sub in self._subscribers:
+            sub.task = asyncio.create_task(self._worker(sub))
+
+    def stop(self) -> None:
+        self._running = False
+        for sub in self._subscribers:
+            if sub.task:
+                sub.task.cancel()
+                sub.task = None
+
+    def publish(self, tick_number: int, payload: Any) -> None:
+        """Hand a tick to every subscriber without blocking."""
+        item = (tick_number, payload)
+        for sub in self._subscribers:
+            sub.last_published_tick = tick_number
+            q = sub.queue
+            if sub.policy is OverflowPolicy.COALESCE:
+                while not q.empty():
+                    self._discard_one(sub)
+            elif q.full():
+                if sub.policy is OverflowPolicy.DROP_NEWEST:
+                    sub.dropped += 1
+                    continue
+                self._discard_one(sub)
+            q.put_nowait(item)
+
+    @staticmethod
+    def _discard_one(sub: _Subscriber) -> None:
+        sub.queue.get_nowait()
+        sub.queue.task_done()
+        sub.dropped += 1
+
+    def stats(self) -> list[dict]:
+        return [sub.stats() for sub in self._subscribers]
+
+    async def _worker(self, sub: _Subscriber) -> None:
+        while True:
+            tick_number, payload = await sub.queue.get()
+            started = time.perf_counter()
+            try:
+                await sub.callback(payload)
+                sub.delivered += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                sub.errors += 1
+                logger.error("Tick subscriber %s failed: %s", sub.name, e, exc_info=True)
+            finally:
+                sub.queue.task_done()
+            sub.last_processed_tick = tick_number
+            sub.last_handler_ms = (time.perf_counter() - started) * 1000
+            sub.max_handler_ms = max(sub.max_handler_ms, sub.last_handler_ms)
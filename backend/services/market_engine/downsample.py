@@ -0,0 +1,99 @@
+"""
+Downsampling for long per-agent history ranges.
+
+Both methods return indices into the input arrays, so every column read from
+the history store (tick, ts, price, market cap, ...) is decimated together.
+Payload size is capped by the point budget, however long the range is.
+
+  lttb    Largest-Triangle-Three-Buckets: keeps the visual shape of the line.
+          Bucket averages are computed in one pass up front; only the
+          per-bucket area argmax runs in a loop over buckets (not points).
+  minmax  per-bucket min and max, fully vectorized; preserves every spike.
+"""
+
+from collections import OrderedDict
+from typing import Callable
+
+import numpy as np
+
+
+def lttb(x: np.ndarray, y: np.ndarray, budget: int) -> np.ndarray:
+    n = len(y)
+    if budget >= n or budget < 3:
+        return np.arange(n)
+
+    x = x.astype(np.float64, copy=False)
+    y = y.astype(np.float64, copy=False)
+    buckets = budget - 2
+    # Interior points 1..n-2 split into `buckets` contiguous, non-empty ranges.
+    edges = np.linspace(1, n - 1, buckets + 1).astype(np.int64)
+    cx = np.concatenate(([0.0], np.cumsum(x)))
+    cy = np.concatenate(([0.0], np.cumsum(y)))
+    counts = np.diff(edges)
+    avg_x = (cx[edges[1:]] - cx[edges[:-1]]) / counts
+    avg_y = (cy[edges[1:]] - cy[edges[:-1]]) / counts
+
+    out = np.empty(budget, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for b in range(buckets):
+        lo, hi = edges[b], edges[b + 1]
+        if b + 1 < buckets:
+            nx, ny = avg_x[b + 1], avg_y[b + 1]
+        else:
+            nx, ny = x[-1], y[-1]
+        area = np.abs((x[a] - nx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (ny - y[a]))
+        a = lo + int(np.argmax(area))
+        out[b + 1] = a
+    return out
+
+
+def minmax(y: np.ndarray, budget: int) -> np.ndarray:
+    n = len(y)
+    if budget >= n or budget < 2:
+        return np.arange(n)
+
+    buckets = budget // 2
+    width = -(-n // buckets)
+    padded = np.pad(y, (0, buckets * width - n), mode="edge").reshape(buckets, width)
+    base = np.arange(buckets) * width
+    picks = np.concatenate((base + padded.argmin(axis=1), base + padded.argmax(axis=1)))
+    return np.unique(np.minimum(picks, n - 1))
+
+
+def downsample(columns: dict[str, np.ndarray], budget: int, method: str = "lttb") -> dict[str, np.ndarray]:
+    """Decimate aligned history columns (must include "tick" and "price") to about `budget` points."""
+    if method == "minmax":
+        idx = minmax(columns["price"], budget)
+    else:
+        idx = lttb(columns["tick"], columns["price"], budget)
+    return {name: col[idx] for name, col in columns.items()}
+
+
+class DownsampleCache:
+    """
+    LRU of downsampled reads keyed by (agent, from, to, budget, method).
+    An entry is valid while no new tick has landed inside its range, i.e.
+    while min(to, last_tick) is unchanged since it was computed.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[tuple, tuple[int, dict]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key: tuple, covered_to: int, compute: Callable[[], dict]) -> dict:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == covered_to:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        value = compute()
+        self._entries[key] = (covered_to, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return value
@@ -1,14 +1,32 @@
 import math
-import random
 import time
 import uuid
 import os
 import asyncio
 import logging
+from collections import OrderedDict
 from typing import Callable, Awaitable
 
+import numpy as np
+
 from .models import AgentFundamentals, MarketState, ShockEvent, ShockType, Sector
 from .seed_data import get_seed_agents
+from .scheduler import TickScheduler
+from .dispatch import TickDispatcher, OverflowPolicy
+from .snapshot import MarketSnapshot
+from .history_store import FIELDS as HISTORY_FIELDS, TickFrame, TickHistoryStore
+from .candles import CandleAggregator, RESOLUTIONS as CANDLE_RESOLUTIONS
+from .universe import PendingUniverse, UniverseError, swap_remove
+from .noise import NoiseGenerator
+from .risk import RiskEngine
+from backend.services.graph.capital_graph import CapitalGraph
+from backend.services.graph.concentration import ConcentrationTracker
+from backend.services.graph.contagion import ContagionCache
+from backend.services.graph.spillover import SPILLOVER_STRENGTH, ExposureMatrix, cascade_probability
+from backend.services.graph.seed import seed_capital_graph
+from backend.services.shock_engine.taxonomy import (
+    Taxonomy, TaxonomyError, current as current_taxonomy, set_current as set_current_taxonomy,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -17,54 +35,106 @@ BETA  = 0.10
 GAMMA = 0.12
 NOISE_STD = 0.005
 PRICE_FLOOR = 1.0
+MIN_BACKING = 1.0               # sells never take an agent's total_backing below this
 INFLOW_DECAY = 0.95
+AGGREGATE_RESYNC_TICKS = 1000   # full aggregate recompute interval (cancels float drift)
+SHOCK_LOG_SIZE = 256             # recent shocks kept for lookups by id after they expire
+
+TICK_POLICY = os.environ.get("MARKET_TICK_POLICY", "skip")   # skip | catch_up | slow_down
+SUBSCRIBER_QUEUE_SIZE = int(os.environ.get("TICK_SUBSCRIBER_QUEUE_SIZE", 4))
+SUBSCRIBER_OVERFLOW = os.environ.get("TICK_SUBSCRIBER_OVERFLOW", "coalesce")  # coalesce | drop_oldest | drop_newest
 
 DEMO_MODE = os.environ.get("DEMO_MODE", "").lower() in ("true", "1", "yes")
 DEMO_SEED = 42
 
-DEMO_SHOCK_SEVERITIES = {
-    ShockType.REGULATION: 0.70,
-    ShockType.CYBER:      0.60,
-    ShockType.FX_SHOCK:   0.50,
-    ShockType.EARTHQUAKE: 0.55,
-    ShockType.SANCTIONS:  0.65,
-}
-
 
 class MarketEngine:
-    def __init__(self, tick_interval_ms: int = 2000):
-        self.state = MarketState(agents=get_seed_agents())
+    def __init__(self, tick_interval_ms: int = 2000,
+                 agents: dict[str, AgentFundamentals] | None = None,
+                 seed: int | None = None, taxonomy: Taxonomy | None = None):
+        # Sector / shock-type tables; replaced as a whole between ticks on reload.
+        self.taxonomy = taxonomy or current_taxonomy()
+        self._pending_taxonomy: Taxonomy | None = None
+        agents = agents if agents is not None else get_seed_agents()
+        unknown = sorted({a.sector for a in agents.values()} - self.taxonomy.sector_index.keys())
+        if unknown:
+            raise TaxonomyError(f"Agents use sectors missing from the taxonomy: {', '.join(unknown)}")
+        self.state = self._build_state(agents)
         self.tick_interval_s = tick_interval_ms / 1000.0
         self._prev_fundamentals: dict[str, dict] = {}
-        self._tick_callbacks: list[Callable[[MarketState], Awaitable[None]]] = []
+        self.dispatcher = TickDispatcher(SUBSCRIBER_QUEUE_SIZE, SUBSCRIBER_OVERFLOW)
         self._running = False
         self._task: asyncio.Task | None = None
+        self._snapshot: MarketSnapshot | None = None
+        self.history_store: TickHistoryStore | None = None
+        self._pending_universe = PendingUniverse()
+        self.universe_version = 0
+        self.shock_log: OrderedDict[str, ShockEvent] = OrderedDict()
 
         self.peak_market_cap: float = 0.0
         self.drawdown_pct: float = 0.0
         self.last_tick_latency_ms: float = 0.0
+        self.scheduler = TickScheduler(self.tick_interval_s, policy=TICK_POLICY)
+
+        self.candles: CandleAggregator | None = (
+            CandleAggregator(self.agent_ids(), self.tick_interval_s) if CANDLE_RESOLUTIONS else None
+        )
 
-        self._rng = random.Random(DEMO_SEED if DEMO_MODE else None)
+        self.seed = seed if seed is not None else (DEMO_SEED if DEMO_MODE else None)
+        self._np_rng = np.random.default_rng(self.seed)
+        self.noise = NoiseGenerator(self._np_rng, NOISE_STD)
+
+        # User → CapitalPool → Agent → Sector graph; agent columns follow agent_ids().
+        self.graph: CapitalGraph = seed_capital_graph(
+            [self.state.agents[aid] for aid in self.agent_ids()], self._sector_columns(),
+            self.taxonomy.sectors, seed=self.seed or 0,
+        )
+        self.contagion = ContagionCache(self.graph)
+        self.exposure = ExposureMatrix(self.graph)
+        self.concentration = ConcentrationTracker(self.graph)
+        self.risk = RiskEngine(self.agent_ids(), len(self.taxonomy.sectors))
+        self._returns: np.ndarray | None = None     # last tick's log returns, frame order
 
         self._snapshot_prev_fundamentals()
 
         if DEMO_MODE:
             logger.info("MarketEngine running in DEMO_MODE (seeded RNG, fixed severities)")
 
+    def _build_state(self, agents: dict[str, AgentFundamentals]) -> MarketState:
+        # Frame / candle column order; swap-remove keeps it O(1) per delisting.
+        self._ids = list(agents)
+        self._slots = {aid: j for j, aid in enumerate(self._ids)}
+        return MarketState(agents=agents)
+
     def start(self) -> None:
         if not self._running:
             self._running = True
+            self.dispatcher.start()
             self._task = asyncio.create_task(self._tick_loop())
-            logger.info("MarketEngine started (tick=%.1fs)", self.tick_interval_s)
+            logger.info("MarketEngine started (tick=%.1fs, policy=%s)",
+                        self.tick_interval_s, self.scheduler.policy.value)
 
     def stop(self) -> None:
         self._running = False
         if self._task:
             self._task.cancel()
+        self.dispatcher.stop()
+        if self.history_store is not None:
+            self.history_store.close()
         logger.info("MarketEngine stopped")
 
-    def on_tick(self, callback: Callable[[MarketState], Awaitable[None]]) -> None:
-        self._tick_callbacks.append(callback)
+    def on_tick(
+        self,
+        callback: Callable[[MarketSnapshot], Awaitable[None]],
+        name: str | None = None,
+        maxsize: int | None = None,
+        policy: OverflowPolicy | str | None = None,
+    ) -> None:
+        """
+        Subscribe to per-tick MarketSnapshots. Each subscriber runs in its own task
+        behind a bounded queue, so a slow one never delays the tick loop.
+        """
+        self.dispatcher.subscribe(callback, name=name, maxsize=maxsize, policy=policy)
 
     def inject_shock(
         self,
@@ -73,82 +143,264 @@ class MarketEngine:
         description: str | None = None,
         source: str = "manual",
     ) -> ShockEvent:
+        tax = self.taxonomy
         if severity is None:
-            severity = DEMO_SHOCK_SEVERITIES.get(shock_type, 0.65) if DEMO_MODE else 0.65
+            severity = tax.demo_severity(shock_type) if DEMO_MODE else tax.default_severity
         severity = max(0.0, min(1.0, severity))
 
         shock = ShockEvent(
             shock_id=str(uuid.uuid4())[:8],
             shock_type=shock_type,
             severity=severity,
-            description=description or self._default_description(shock_type),
+            description=description or tax.description(shock_type),
+            ticks_remaining=tax.duration(shock_type),
             source=source,
         )
-        self.state.active_shocks.append(shock)
+        self.add_shock(shock)
         logger.info("Shock injected: %s severity=%.2f", shock_type.value, severity)
         return shock
 
+    def add_shock(self, shock: ShockEvent) -> None:
+        """Activate an already-built ShockEvent (e.g. from convert_signal_to_shock)."""
+        self.state.active_shocks.append(shock)
+        self.shock_log[shock.shock_id] = shock
+        if len(self.shock_log) > SHOCK_LOG_SIZE:
+            self.shock_log.popitem(last=False)
+        self._snapshot = None   # shocks show up before the next tick
+
+    def find_shock(self, shock_id: str) -> ShockEvent | None:
+        """An active or recently expired shock by id."""
+        return self.shock_log.get(shock_id)
+
+    def queue_agent_changes(self, add: list[AgentFundamentals] = (), remove: list[str] = ()) -> int:
+        """
+        Queue listings and delistings. They are applied together at the start
+        of the next step() and show up in that tick's snapshot, whose number
+        is returned. Raises UniverseError (nothing queued) on conflicting ids.
+        """
+        sectors = (self._pending_taxonomy or self.taxonomy).sector_index
+        unknown = [a.agent_id for a in add if a.sector not in sectors]
+        if unknown:
+            raise UniverseError("Agents in sectors missing from the taxonomy", unknown)
+        self._pending_universe.queue(self.state.agents, add, remove)
+        return self.state.tick_number + 1
+
+    def queue_taxonomy(self, taxonomy: Taxonomy) -> int:
+        """
+        Swap in a recompiled taxonomy at the start of the next step(); returns
+        that tick. Raises TaxonomyError if it drops a sector agents still use.
+        """
+        in_use = set(self.state.sector_index) | {a.sector for a in self._pending_universe.add.values()}
+        missing = sorted(in_use - taxonomy.sector_index.keys())
+        if missing:
+            raise TaxonomyError(f"Taxonomy drops sectors that still have agents: {', '.join(missing)}")
+        self._pending_taxonomy = taxonomy
+        return self.state.tick_number + 1
+
+    @property
+    def pending_agent_changes(self) -> dict[str, int]:
+        return {"add": len(self._pending_universe.add), "remove": len(self._pending_universe.remove)}
+
+    @property
+    def latest_snapshot(self) -> MarketSnapshot:
+        """The shared snapshot for the current tick, built at most once per tick."""
+        if self._snapshot is None or self._snapshot.tick_number != self.state.tick_number:
+            data = self.state.to_snapshot()
+            data["drawdown_pct"] = round(self.drawdown_pct, 4)
+            data["peak_market_cap"] = round(self.peak_market_cap, 2)
+            self._snapshot = MarketSnapshot(data, history=self._price_histories)
+        return self._snapshot
+
     def get_snapshot(self) -> dict:
-        snapshot = self.state.to_snapshot()
-        snapshot["drawdown_pct"] = round(self.drawdown_pct, 4)
-        snapshot["peak_market_cap"] = round(self.peak_market_cap, 2)
-        return snapshot
+        """
+        Snapshot dict for the current tick. The top level is a copy, so callers
+        may add or drop keys; nested agent / sector lists are still shared with
+        every other reader of the tick. Use latest_snapshot for cached views.
+        """
+        return dict(self.latest_snapshot.data)
+
+    def _price_histories(self, tick_number: int) -> dict[str, list[float]]:
+        """Price histories ending at `tick_number` (newer prices are dropped)."""
+        histories = self._live_price_histories()
+        lag = self.state.tick_number - tick_number
+        if lag <= 0:
+            return histories
+        return {aid: h[:max(len(h) - lag, 0)] for aid, h in histories.items()}
+
+    def _live_price_histories(self) -> dict[str, list[float]]:
+        return {aid: a.price_history.to_list() for aid, a in self.state.agents.items()}
 
     def get_agents(self) -> list[dict]:
         return [a.to_dict() for a in self.state.agents.values()]
 
-    def simulate_buy(self, agent_id: str, amount: float) -> None:
+    def simulate_buy(self, agent_id: str, amount: float, pool_id: str | None = None) -> None:
+        """Capital inflow from `pool_id` (default: the open market). Raises KeyError for an unknown pool."""
         agent = self.state.agents.get(agent_id)
         if agent:
+            self.concentration.record(agent_id, pool_id, self.graph.record_flow(agent_id, amount, pool_id))
             delta = amount / max(agent.total_backing, 1.0)
             agent.inflow_velocity = min(1.0, agent.inflow_velocity + delta)
             agent.total_backing += amount
-
-    def simulate_sell(self, agent_id: str, amount: float) -> None:
+            if self.candles is not None:
+                self.candles.record_flow(agent_id, amount)
+            self._snapshot = None   # trades show up before the next tick
+
+    def simulate_sell(self, agent_id: str, amount: float, pool_id: str | None = None) -> None:
+        """
+        Capital outflow to `pool_id` (default: the open market), capped at the
+        pool's position and at total_backing - MIN_BACKING. Raises KeyError
+        for an unknown pool.
+        """
         agent = self.state.agents.get(agent_id)
         if agent:
-            delta = amount / max(agent.total_backing, 1.0)
+            # A sale removes at most the pool's position and never takes the
+            # agent below MIN_BACKING; the graph and total_backing move together.
+            # The graph goes first: an unknown pool raises before anything changes.
+            sold = min(amount, max(agent.total_backing - MIN_BACKING, 0.0))
+            change = self.graph.record_flow(agent_id, -sold, pool_id)
+            if change is not None:
+                sold = change[0] - change[1]
+            self.concentration.record(agent_id, pool_id, change)
+            delta = sold / max(agent.total_backing, 1.0)
             agent.inflow_velocity = max(-1.0, agent.inflow_velocity - delta)
-            agent.total_backing = max(1.0, agent.total_backing - amount)
+            agent.total_backing -= sold
+            if self.candles is not None:
+                self.candles.record_flow(agent_id, -sold)
+            self._snapshot = None   # trades show up before the next tick
+
+    @property
+    def last_tick_jitter_ms(self) -> float:
+        return self.scheduler.last_jitter_ms
+
+    @property
+    def tick_overruns(self) -> int:
+        return self.scheduler.overruns
 
     async def _tick_loop(self) -> None:
+        self.scheduler.reset()
         while self._running:
+            await self.scheduler.wait()
             try:
-                tick_start = time.time()
-                self._tick()
-                self.last_tick_latency_ms = (time.time() - tick_start) * 1000
-
-                for cb in self._tick_callbacks:
-                    await cb(self.state)
+                self.step()
+                if self.dispatcher.has_subscribers:
+                    self.dispatcher.publish(self.state.tick_number, self.latest_snapshot)
             except Exception as e:
                 logger.error("Tick error: %s", e, exc_info=True)
-            await asyncio.sleep(self.tick_interval_s)
-
-    def _tick(self) -> None:
-        from backend.services.shock_engine.sector_betas import get_beta, MAX_TICK_IMPACT, DECAY_SCHEDULE
-
-        shock_impacts: dict[str, float] = {aid: 0.0 for aid in self.state.agents}
+            self.scheduler.advance()
+
+    def step(self) -> MarketState:
+        """Advance one tick synchronously: no sleep, no callbacks."""
+        tick_start = time.perf_counter()
+        if self._pending_taxonomy is not None:
+            self._swap_taxonomy(self._pending_taxonomy)
+            self._pending_taxonomy = None
+        if self._pending_universe:
+            self._apply_agent_changes()
+        self._tick()
+        self.risk.update(self.state.tick_number, self._last_returns(), self._market_caps(),
+                         self._sector_columns(), self.taxonomy)
+        self.last_tick_latency_ms = (time.perf_counter() - tick_start) * 1000
+        if self.candles is not None or self.history_store is not None:
+            frame = self.tick_frame()
+            if self.candles is not None:
+                self.candles.update(frame)
+            if self.history_store is not None:
+                self.history_store.append(frame)
+        return self.state
+
+    def agent_ids(self) -> list[str]:
+        """Agent ids in frame / candle column order (live list, do not mutate)."""
+        return self._ids
+
+    def tick_frame(self) -> TickFrame:
+        """Per-agent columns for the current tick, in `agent_ids()` order."""
+        ids = self.agent_ids()
+        agents = [self.state.agents[aid] for aid in ids]
+        n = len(agents)
+        return TickFrame(
+            tick_number=self.state.tick_number,
+            timestamp=time.time(),
+            ids=ids,
+            columns={
+                name: np.fromiter((getattr(a, name) for a in agents), np.float64, n)
+                for name in HISTORY_FIELDS
+            },
+            universe_version=self.universe_version,
+        )
 
-        for shock in self.state.active_shocks:
-            tick_index = 4 - shock.ticks_remaining
-            decay = DECAY_SCHEDULE[min(tick_index, 3)]
+    # ── Taxonomy and agent universe changes (applied between ticks) ──────────
+
+    def _swap_taxonomy(self, taxonomy: Taxonomy) -> None:
+        self.taxonomy = taxonomy
+        set_current_taxonomy(taxonomy)
+        self.graph.remap_sectors(self._sector_columns(), taxonomy.sectors)
+        self._snapshot = None
+        logger.info("Taxonomy v%d active: %d sectors, %d shock types",
+                    taxonomy.version, len(taxonomy.sectors), len(taxonomy.shock_types))
+
+    def _apply_agent_changes(self) -> None:
+        removed, added = self._pending_universe.take()
+        self._remove_agents(removed)
+        self._add_agents(added)
+        if self.candles is not None:
+            self.candles.remove(removed)
+            self.candles.add([a.agent_id for a in added])
+        self.risk.remove(removed)
+        self.risk.add([a.agent_id for a in added])
+        self.graph.remove_agents(removed)
+        self.graph.add_agents(
+            [a.agent_id for a in added],
+            np.fromiter((self.taxonomy.sector_index[a.sector] for a in added), np.intp, len(added)),
+            np.fromiter((a.total_backing for a in added), np.float64, len(added)),
+        )
+        self.concentration.resync()
+        self.universe_version += 1
+        self._snapshot = None
+        self._returns = None
+        logger.info("Agent universe v%d: +%d -%d listed, %d agents",
+                    self.universe_version, len(added), len(removed), len(self.state.agents))
+
+    def _remove_agents(self, agent_ids: list[str]) -> None:
+        for aid in agent_ids:
+            self.state.remove_agent(aid)
+            self._prev_fundamentals.pop(aid, None)
+        swap_remove(self._ids, self._slots, agent_ids)
+
+    def _add_agents(self, agents: list[AgentFundamentals]) -> None:
+        for agent in agents:
+            self.state.add_agent(agent)
+            self._slots[agent.agent_id] = len(self._ids)
+            self._ids.append(agent.agent_id)
+            self._prev_fundamentals[agent.agent_id] = {
+                "performance_score": agent.performance_score,
+                "risk_score": agent.risk_score,
+            }
 
-            for agent in self.state.agents.values():
-                beta = get_beta(shock.shock_type, agent.sector)
-                raw_impact = shock.severity * beta * decay
-                clamped = max(-MAX_TICK_IMPACT, min(MAX_TICK_IMPACT, raw_impact))
-                shock_impacts[agent.agent_id] += clamped
+    def _tick(self) -> None:
+        sector_impacts = self.taxonomy.impact_vector(self.state.active_shocks).tolist()
+        sector_index = self.taxonomy.sector_index
 
         for shock in self.state.active_shocks:
             shock.ticks_remaining -= 1
         self.state.active_shocks = [s for s in self.state.active_shocks if s.ticks_remaining > 0]
 
-        for agent in self.state.agents.values():
-            self._update_agent(agent, shock_impacts[agent.agent_id])
+        # The tick's noise and passive-flow draws come in one batch, in frame order.
+        noise = self._draw_noise().tolist()
+        spillover = self._spillover().tolist()
+        active, amount = self.noise.passive_flows(len(self._ids))
+        flows = np.where(active, amount, 0.0).tolist()
+        agents = self.state.agents
+        ratios = [
+            self._update_agent(agents[aid], sector_impacts[sector_index[agents[aid].sector]], eps, spill, flow)
+            for aid, eps, spill, flow in zip(self._ids, noise, spillover, flows)
+        ]
+        self._returns = np.log(np.array(ratios, dtype=np.float64))
 
-        self.state.total_market_cap = sum(a.market_cap for a in self.state.agents.values())
-        self.state.cascade_probability = self._compute_cascade_probability()
         self.state.tick_number += 1
+        if self.state.tick_number % AGGREGATE_RESYNC_TICKS == 0:
+            self.state.rebuild_aggregates()
+            self.concentration.resync()
+        self.state.cascade_probability = self._compute_cascade_probability()
 
         if self.state.total_market_cap > self.peak_market_cap:
             self.peak_market_cap = self.state.total_market_cap
@@ -157,61 +409,93 @@ class MarketEngine:
 
         self._snapshot_prev_fundamentals()
 
-    def _update_agent(self, agent: AgentFundamentals, shock_impact: float) -> None:
+    def _update_agent(self, agent: AgentFundamentals, shock_impact: float,
+                      noise: float, spillover: float, passive_flow: float) -> float:
+        """Price one agent for this tick; returns new price / old price."""
         prev = self._prev_fundamentals.get(agent.agent_id, {})
         prev_perf = prev.get("performance_score", agent.performance_score)
         prev_risk = prev.get("risk_score", agent.risk_score)
 
         performance_delta = agent.performance_score - prev_perf
         risk_delta = agent.risk_score - prev_risk
-        noise = self._rng.gauss(0, NOISE_STD)
 
         delta = (
             ALPHA * agent.inflow_velocity
             + BETA  * performance_delta
             - GAMMA * risk_delta
             + shock_impact
+            + spillover
             + noise
         )
 
         new_price = agent.price * (1 + delta)
         new_price = max(PRICE_FLOOR, new_price)
 
-        agent.price_history.append(new_price)
-        if len(agent.price_history) > 20:
-            agent.price_history.pop(0)
+        old_price, old_cap, old_change, old_vol = agent.price, agent.market_cap, agent.price_change_pct, agent.volatility
 
+        agent.price_history.append(new_price)
         agent.price = new_price
         agent.market_cap = new_price * agent.total_backing
 
-        if len(agent.price_history) >= 2:
-            returns = [
-                math.log(agent.price_history[i] / agent.price_history[i - 1])
-                for i in range(1, len(agent.price_history))
-                if agent.price_history[i - 1] > 0
-            ]
-            if returns:
-                mean = sum(returns) / len(returns)
-                variance = sum((r - mean) ** 2 for r in returns) / len(returns)
-                agent.volatility = math.sqrt(variance)
+        volatility = agent.price_history.volatility()
+        if volatility is not None:
+            agent.volatility = volatility
+
+        self.state.apply_agent_delta(
+            agent,
+            agent.market_cap - old_cap,
+            agent.price_change_pct - old_change,
+            agent.volatility - old_vol,
+        )
 
         agent.inflow_velocity *= INFLOW_DECAY
-        self._simulate_passive_flows(agent)
+        self._simulate_passive_flows(agent, passive_flow)
+        return new_price / old_price
 
-    def _simulate_passive_flows(self, agent: AgentFundamentals) -> None:
-        if self._rng.random() < 0.15:
-            direction = 1 if agent.price_change_pct > 0 else -1
-            amount = self._rng.uniform(10, 80)
-            if direction > 0:
+    def _simulate_passive_flows(self, agent: AgentFundamentals, amount: float) -> None:
+        """Apply this tick's passive flow (0 = none); rising agents attract buys."""
+        if amount:
+            if agent.price_change_pct > 0:
                 self.simulate_buy(agent.agent_id, amount)
             else:
                 self.simulate_sell(agent.agent_id, amount * 0.5)
 
+    def _draw_noise(self) -> np.ndarray:
+        """This tick's price noise in frame order; loadings are rebuilt only on universe / taxonomy changes."""
+        key = (self.universe_version, self.taxonomy)
+        if self.noise.stale(key):
+            self.noise.set_loadings(key, self._sector_columns(), len(self.taxonomy.sectors))
+        return self.noise.price_noise(len(self.agent_ids()))
+
+    def _sector_columns(self) -> np.ndarray:
+        """Taxonomy sector index per agent, in frame order."""
+        index, agents = self.taxonomy.sector_index, self.state.agents
+        return np.fromiter((index[agents[aid].sector] for aid in self._ids), np.intp, len(self._ids))
+
+    def _spillover(self) -> np.ndarray:
+        """MARKET_SPILLOVER × last tick's returns passed on through shared pools (zeros when off)."""
+        if not SPILLOVER_STRENGTH:
+            return np.zeros(len(self.agent_ids()))
+        return SPILLOVER_STRENGTH * self.exposure.apply(self._last_returns())
+
+    def _last_returns(self) -> np.ndarray:
+        """Log returns of the last tick in frame order (from price history after a universe change)."""
+        if self._returns is None:
+            agents = self.state.agents
+
+            def last(h) -> float:
+                return math.log(h[-1] / h[-2]) if len(h) >= 2 else 0.0
+
+            self._returns = np.fromiter((last(agents[aid].price_history) for aid in self._ids),
+                                        np.float64, len(self._ids))
+        return self._returns
+
+    def _market_caps(self) -> np.ndarray:
+        agents = self.state.agents
+        return np.fromiter((agents[aid].market_cap for aid in self._ids), np.float64, len(self._ids))
+
     def _compute_cascade_probability(self) -> float:
-        avg_volatility = sum(a.volatility for a in self.state.agents.values()) / max(len(self.state.agents), 1)
-        active_shock_severity = sum(s.severity for s in self.state.active_shocks)
-        cascade = min(1.0, (avg_volatility * 10) + (active_shock_severity * 0.3))
-        return round(cascade, 4)
+        return cascade_probability(self.exposure, self._last_returns(), self._market_caps())
 
     def _snapshot_prev_fundamentals(self) -> None:
         self._prev_fundamentals = {
@@ -221,13 +505,3 @@ class MarketEngine:
             }
             for aid, a in self.state.agents.items()
         }
-
-    def _default_description(self, shock_type: ShockType) -> str:
-        descriptions = {
-            ShockType.REGULATION: "Regulatory crackdown on AI systems announced",
-            ShockType.CYBER:       "Large-scale cyber attack detected across financial networks",
-            ShockType.FX_SHOCK:    "Significant FX volatility spike in major currency pair",
-            ShockType.EARTHQUAKE:  "Major earthquake near financial infrastructure hub",
-            ShockType.SANCTIONS:   "New sanctions package targeting tech sector announced",
-        }
-        return descriptions.get(shock_type, "Market shock event")
@@ -0,0 +1,171 @@
+"""
+Headless fast-forward simulation runner.
+
+Builds a MarketEngine outside the API and runs N ticks back-to-back with no
+sleeping and no tick callbacks. Replayed signals are converted to shocks and
+injected on the engine's tick clock (signal timestamp offset / tick interval),
+so a day of market time runs as fast as the engine can tick.
+
+Used for overnight stress runs and throughput regression checks:
+
+    python -m backend.services.market_engine.headless --ticks 43200 \\
+        --engine vectorized --agents 50000 --snapshot-every 1000 --out runs/overnight
+"""
+
+import argparse
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Callable
+
+from backend.services.ingestion.replay import load_signals_from_file
+from backend.services.market_engine.models import MarketState, ShockEvent, SignalEvent
+from backend.services.shock_engine.engine import convert_signal_to_shock
+
+from .engine import MarketEngine
+from .history_store import TickHistoryStore
+from .seed_data import get_seed_agents, generate_synthetic_agents
+from .loader import load_agents
+
+logger = logging.getLogger(__name__)
+
+
+def schedule_signals(signals: list[SignalEvent], tick_interval_s: float) -> list[tuple[int, ShockEvent]]:
+    """
+    Map signals onto tick numbers relative to the earliest signal.
+    Signals that don't warrant a shock are dropped.
+    """
+    if not signals:
+        return []
+    t0 = min(s.timestamp for s in signals)
+    schedule = []
+    for signal in signals:
+        shock = convert_signal_to_shock(signal)
+        if shock is None:
+            continue
+        schedule.append((int((signal.timestamp - t0) / tick_interval_s), shock))
+    schedule.sort(key=lambda item: item[0])
+    return schedule
+
+
+def run_headless(
+    engine: MarketEngine,
+    ticks: int,
+    schedule: list[tuple[int, ShockEvent]] | None = None,
+    snapshot_every: int = 0,
+    out_dir: Path | None = None,
+    on_tick: Callable[[MarketState], None] | None = None,
+) -> dict:
+    """
+    Run `ticks` ticks as fast as possible and return a throughput report.
+    `schedule` ticks are relative to the engine's tick number at start.
+    """
+    schedule = schedule or []
+    if out_dir is not None:
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+    start_tick = engine.state.tick_number
+    latencies: list[float] = []
+    shocks_injected = 0
+    next_shock = 0
+
+    started = time.perf_counter()
+    for i in range(ticks):
+        while next_shock < len(schedule) and schedule[next_shock][0] <= i:
+            engine.add_shock(schedule[next_shock][1])
+            shocks_injected += 1
+            next_shock += 1
+
+        engine.step()
+        latencies.append(engine.last_tick_latency_ms)
+        if on_tick is not None:
+            on_tick(engine.state)
+
+        if out_dir is not None and snapshot_every and (i + 1) % snapshot_every == 0:
+            (out_dir / f"snapshot_{engine.state.tick_number:08d}.json").write_bytes(engine.latest_snapshot.json())
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    report = {
+        "engine": type(engine).__name__,
+        "agents": len(engine.state.agents),
+        "ticks": ticks,
+        "start_tick": start_tick,
+        "end_tick": engine.state.tick_number,
+        "shocks_injected": shocks_injected,
+        "elapsed_s": round(elapsed, 3),
+        "ticks_per_sec": round(ticks / elapsed, 2) if elapsed > 0 else None,
+        "tick_latency_ms": {
+            "p50": round(_percentile(latencies, 0.50), 3),
+            "p99": round(_percentile(latencies, 0.99), 3),
+            "max": round(latencies[-1], 3) if latencies else 0.0,
+        },
+        "final_total_market_cap": round(engine.state.total_market_cap, 2),
+        "final_drawdown_pct": round(engine.drawdown_pct, 4),
+    }
+
+    if out_dir is not None:
+        (out_dir / "final_snapshot.json").write_bytes(engine.latest_snapshot.json())
+        _write_json(out_dir / "report.json", report)
+    return report
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def _write_json(path: Path, data: dict) -> None:
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the AEX market engine headless, without sleeping.")
+    parser.add_argument("--ticks", type=int, required=True, help="Number of ticks to simulate")
+    parser.add_argument("--engine", choices=("scalar", "vectorized"), default="scalar")
+    parser.add_argument("--agents-file", type=Path, default=None,
+                        help="Load agents from a CSV / NDJSON / Parquet file instead of the seed roster")
+    parser.add_argument("--agents", type=int, default=0, help="Pad seed roster with synthetic agents up to this count")
+    parser.add_argument("--tick-interval-ms", type=int, default=2000,
+                        help="Market-time tick length used to place replayed signals")
+    parser.add_argument("--signals", default=None, help="Signal snapshot JSON (default: bundled demo signals)")
+    parser.add_argument("--no-signals", action="store_true", help="Run without replayed shocks")
+    parser.add_argument("--seed", type=int, default=None, help="RNG seed for reproducible runs")
+    parser.add_argument("--snapshot-every", type=int, default=0, help="Write a snapshot every N ticks (0 = final only)")
+    parser.add_argument("--out", type=Path, default=None, help="Directory for snapshots and report.json")
+    parser.add_argument("--history-dir", type=Path, default=None, help="Record every tick to a tick history store here")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    agents = load_agents(args.agents_file) if args.agents_file else get_seed_agents()
+    extra = args.agents - len(agents)
+    if extra > 0:
+        agents.update(generate_synthetic_agents(extra))
+
+    if args.engine == "vectorized":
+        from .vector_engine import VectorMarketEngine
+        engine: MarketEngine = VectorMarketEngine(args.tick_interval_ms, agents, seed=args.seed)
+    else:
+        engine = MarketEngine(args.tick_interval_ms, agents, seed=args.seed)
+
+    if args.history_dir is not None:
+        engine.history_store = TickHistoryStore(args.history_dir)
+
+    schedule = [] if args.no_signals else schedule_signals(
+        load_signals_from_file(args.signals), engine.tick_interval_s,
+    )
+    logger.info("Headless run: %d ticks, %d agents, %d scheduled shocks",
+                args.ticks, len(engine.state.agents), len(schedule))
+
+    report = run_headless(engine, args.ticks, schedule, args.snapshot_every, args.out)
+    if engine.history_store is not None:
+        engine.history_store.close()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
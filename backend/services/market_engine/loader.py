@@ -0,0 +1,129 @@
+"""
+Bulk agent loading from CSV, NDJSON or Parquet.
+
+Used at startup (MARKET_AGENTS_FILE) and by the admin API to list agents in
+batches. Records use AgentFundamentals field names, and `id` is accepted for
+`agent_id` so an agent list exported from /market/snapshot loads back as-is.
+Only agent_id and sector are required; the sector must exist in the active
+taxonomy. `name` defaults to the id, and every score, flow and price field
+falls back to the AgentFundamentals default.
+
+Parquet support needs pyarrow (optional).
+"""
+
+import csv
+import io
+import json
+import logging
+from collections.abc import Iterable
+from pathlib import Path
+
+from .models import AgentFundamentals, Sector
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    pq = None
+    PARQUET_AVAILABLE = False
+
+FORMATS = ("csv", "ndjson", "parquet")
+
+_SUFFIXES = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson", ".parquet": "parquet", ".pq": "parquet"}
+_MEDIA_TYPES = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "application/vnd.apache.parquet": "parquet",
+    "application/x-parquet": "parquet",
+}
+
+NUMERIC_FIELDS = (
+    "usage_score", "performance_score", "reliability_score", "risk_score",
+    "inflow_velocity", "total_backing", "price", "volatility",
+)
+
+
+class AgentLoadError(ValueError):
+    pass
+
+
+def format_for_path(path: str | Path) -> str:
+    fmt = _SUFFIXES.get(Path(path).suffix.lower())
+    if fmt is None:
+        raise AgentLoadError(f"Unsupported agent file type: {path} (expected one of {', '.join(_SUFFIXES)})")
+    return fmt
+
+
+def format_for_media_type(content_type: str | None) -> str | None:
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    return _MEDIA_TYPES.get(media_type)
+
+
+def agents_from_records(records: Iterable[dict]) -> list[AgentFundamentals]:
+    """Build agents from dict records; raises AgentLoadError naming the first bad record."""
+    agents = []
+    for n, record in enumerate(records, start=1):
+        try:
+            agents.append(_agent(record))
+        except (KeyError, TypeError, ValueError) as e:
+            raise AgentLoadError(f"Record {n}: {e}") from None
+    return agents
+
+
+def parse_agents(data: bytes, fmt: str) -> list[AgentFundamentals]:
+    """Parse a CSV, NDJSON or Parquet payload."""
+    if fmt == "csv":
+        return agents_from_records(csv.DictReader(io.StringIO(data.decode("utf-8-sig"))))
+    if fmt == "ndjson":
+        return agents_from_records(_ndjson_records(data.decode("utf-8")))
+    if fmt == "parquet":
+        if not PARQUET_AVAILABLE:
+            raise AgentLoadError("Parquet agent files need pyarrow (pip install pyarrow)")
+        return agents_from_records(pq.read_table(io.BytesIO(data)).to_pylist())
+    raise AgentLoadError(f"Unknown agent format: {fmt} (expected one of {', '.join(FORMATS)})")
+
+
+def load_agents(path: str | Path) -> dict[str, AgentFundamentals]:
+    """agent_id -> AgentFundamentals from a file; the format follows the suffix."""
+    agents: dict[str, AgentFundamentals] = {}
+    for agent in parse_agents(Path(path).read_bytes(), format_for_path(path)):
+        if agent.agent_id in agents:
+            raise AgentLoadError(f"Duplicate agent id in {path}: {agent.agent_id}")
+        agents[agent.agent_id] = agent
+    logger.info("Loaded %d agents from %s", len(agents), path)
+    return agents
+
+
+def _ndjson_records(text: str) -> Iterable[dict]:
+    for line_no, line in enumerate(text.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            raise AgentLoadError(f"Line {line_no}: invalid JSON ({e})") from None
+
+
+def _agent(record: dict) -> AgentFundamentals:
+    agent_id = record.get("agent_id") or record.get("id")
+    if not agent_id:
+        raise ValueError("missing agent_id")
+    sector = record.get("sector")
+    if not sector:
+        raise ValueError(f"missing sector for {agent_id}")
+
+    fields = {}
+    for name in NUMERIC_FIELDS:
+        value = record.get(name)
+        if value is not None and value != "":
+            fields[name] = float(value)
+    return AgentFundamentals(
+        agent_id=str(agent_id),
+        name=str(record.get("name") or agent_id),
+        sector=Sector.parse(str(sector)),
+        **fields,
+    )
@@ -1,24 +1,119 @@
 from dataclasses import dataclass, field
 from typing import Optional
-from enum import Enum
+import os
 import time
 
+from .price_history import PriceHistory
 
-class Sector(str, Enum):
-    FRAUD_AML = "FRAUD_AML"
-    COMPLIANCE = "COMPLIANCE"
-    GEO_OSINT = "GEO_OSINT"
+# Ticks of price history kept per agent (volatility / price_change_pct window).
+PRICE_HISTORY_WINDOW = int(os.environ.get("PRICE_HISTORY_WINDOW", 20))
 
 
-class ShockType(str, Enum):
-    REGULATION = "REGULATION"
-    CYBER = "CYBER"
-    FX_SHOCK = "FX_SHOCK"
-    EARTHQUAKE = "EARTHQUAKE"
-    SANCTIONS = "SANCTIONS"
+class _LabelMeta(type):
+    """
+    Enum-style behaviour for taxonomy names whose members are not fixed at
+    class creation: `Cls(name)` looks a member up (ValueError if unknown),
+    members are interned so identity comparisons hold, and the class
+    iterates, sizes and tests membership over its members in registration
+    order.
+    """
 
+    def __init__(cls, name, bases, namespace):
+        super().__init__(name, bases, namespace)
+        cls._members: dict[str, "_Label"] = {}
 
-@dataclass
+    def __call__(cls, value):
+        member = cls._members.get(value)
+        if member is None:
+            raise ValueError(f"{value!r} is not a valid {cls.__name__}")
+        return member
+
+    def __iter__(cls):
+        return iter(list(cls._members.values()))
+
+    def __len__(cls) -> int:
+        return len(cls._members)
+
+    def __contains__(cls, value) -> bool:
+        return value in cls._members
+
+
+class _Label(str, metaclass=_LabelMeta):
+    """
+    A taxonomy name. Hashes and compares as the plain string, with `.name` /
+    `.value` like the str enums it replaced. The built-in names are
+    registered below; compile_taxonomy() registers the names a config adds,
+    so a name stays a member after a reload retires it (live agents and
+    shocks may still hold it). Input validation (`parse`) is against the
+    active taxonomy only.
+    """
+
+    __slots__ = ()
+    _taxonomy_index: str       # Taxonomy field holding the active names
+
+    @classmethod
+    def register(cls, name: str):
+        """The interned member for `name`, created on first use; also set as a class attribute."""
+        name = str(name)
+        member = cls._members.get(name)
+        if member is None:
+            member = str.__new__(cls, name)
+            cls._members[name] = member
+            if name.isidentifier() and not hasattr(cls, name):
+                setattr(cls, name, member)
+        return member
+
+    @property
+    def name(self) -> str:
+        return str.__str__(self)
+
+    @property
+    def value(self) -> str:
+        return str.__str__(self)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}.{self.value}"
+
+    def __reduce__(self):
+        return type(self).register, (self.value,)
+
+    @classmethod
+    def parse(cls, name: str):
+        """Active-taxonomy member; case-insensitive fallback. Raises ValueError for unknown names."""
+        from backend.services.shock_engine.taxonomy import current
+        active = getattr(current(), cls._taxonomy_index)
+        for candidate in (name, name.upper()):
+            if candidate in active:
+                return cls.register(candidate)
+        raise ValueError(f"{name!r} is not a valid {cls.__name__} (known: {', '.join(active)})")
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source, handler):
+        from pydantic_core import core_schema
+        return core_schema.no_info_after_validator_function(cls.parse, core_schema.str_schema())
+
+
+class Sector(_Label):
+    __slots__ = ()
+    _taxonomy_index = "sector_index"
+
+
+class ShockType(_Label):
+    __slots__ = ()
+    _taxonomy_index = "shock_type_index"
+
+
+# Built-in names, used by the seed roster and the default taxonomy.
+for _name in ("FRAUD_AML", "COMPLIANCE", "GEO_OSINT"):
+    Sector.register(_name)
+for _name in ("REGULATION", "CYBER", "FX_SHOCK", "EARTHQUAKE", "SANCTIONS"):
+    ShockType.register(_name)
+del _name
+
+
+# Agents, shocks and signals are slotted (no per-instance __dict__): large
+# markets and replay files hold 100k+ of them. See benchmarks/memory.py.
+@dataclass(slots=True)
 class AgentFundamentals:
     agent_id: str
     name: str
@@ -36,7 +131,7 @@ class AgentFundamentals:
 
     # Price state
     price: float = 100.0
-    price_history: list[float] = field(default_factory=list)  # last 20 ticks
+    price_history: PriceHistory = field(default_factory=list)  # last PRICE_HISTORY_WINDOW ticks
     volatility: float = 0.02
 
     # Market metrics
@@ -44,15 +139,18 @@ class AgentFundamentals:
 
     def __post_init__(self):
         self.market_cap = self.price * self.total_backing
+        if not isinstance(self.price_history, PriceHistory):
+            self.price_history = PriceHistory(PRICE_HISTORY_WINDOW, self.price_history)
         if not self.price_history:
-            self.price_history = [self.price] * 20
+            for _ in range(self.price_history.capacity):
+                self.price_history.append(self.price)
 
     @property
     def price_change_pct(self) -> float:
-        """Percentage change from 20 ticks ago."""
+        """Percentage change from the oldest tick in the history window."""
         if len(self.price_history) < 2:
             return 0.0
-        oldest = self.price_history[0]
+        oldest = self.price_history.oldest
         if oldest == 0:
             return 0.0
         return ((self.price - oldest) / oldest) * 100
@@ -84,14 +182,14 @@ class AgentFundamentals:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ShockEvent:
     shock_id: str
     shock_type: ShockType
     severity: float          # 0.0–1.0
     description: str
     timestamp: float = field(default_factory=time.time)
-    ticks_remaining: int = 4  # shock decays over 4 ticks
+    ticks_remaining: int = 4  # set from the shock type's decay schedule (4 ticks by default)
     source: str = "manual"   # "manual" | "GDELT" | "USGS" | "FX"
 
     def to_dict(self) -> dict:
@@ -106,7 +204,7 @@ class ShockEvent:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class SignalEvent:
     signal_id: str
     source: str              # "GDELT" | "USGS" | "FX"
@@ -117,6 +215,15 @@ class SignalEvent:
     raw: dict = field(default_factory=dict)
 
 
+@dataclass
+class SectorAggregate:
+    """Running per-sector totals, maintained by deltas as agents change."""
+    agent_count: int = 0
+    total_market_cap: float = 0.0
+    price_change_sum: float = 0.0
+    volatility_sum: float = 0.0
+
+
 @dataclass
 class MarketState:
     agents: dict[str, AgentFundamentals] = field(default_factory=dict)
@@ -125,29 +232,88 @@ class MarketState:
     total_market_cap: float = 0.0
     cascade_probability: float = 0.0
 
+    # sector id -> agent ids (dict used as an ordered set for O(1) removal)
+    sector_index: dict[str, dict[str, None]] = field(default_factory=dict)
+    sector_aggregates: dict[str, SectorAggregate] = field(default_factory=dict)
+    volatility_sum: float = 0.0
+
+    def __post_init__(self):
+        self.rebuild_aggregates()
+
     def to_snapshot(self) -> dict:
         return {
             "tick_number": self.tick_number,
             "total_market_cap": round(self.total_market_cap, 2),
             "cascade_probability": round(self.cascade_probability, 4),
             "active_shocks": [s.to_dict() for s in self.active_shocks],
-            "agents": [a.to_dict() for a in self.agents.values()],
+            "agents": self._agent_dicts(),
             "sectors": self._sector_summary(),
         }
 
-    def _sector_summary(self) -> list[dict]:
-        by_sector: dict[str, list[AgentFundamentals]] = {}
+    def agents_in_sector(self, sector_id: str) -> list[AgentFundamentals]:
+        return [self.agents[aid] for aid in self.sector_index.get(sector_id, ())]
+
+    @property
+    def avg_volatility(self) -> float:
+        return self.volatility_sum / max(len(self.agents), 1)
+
+    # ── Incremental aggregate maintenance ────────────────────────────────────
+
+    def rebuild_aggregates(self) -> None:
+        """Full O(N) recompute. Used at startup and periodically to cancel drift."""
+        self.sector_index = {}
+        self.sector_aggregates = {}
+        self.total_market_cap = 0.0
+        self.volatility_sum = 0.0
         for agent in self.agents.values():
-            by_sector.setdefault(agent.sector.value, []).append(agent)
+            self._index_agent(agent)
+
+    def add_agent(self, agent: AgentFundamentals) -> None:
+        self.agents[agent.agent_id] = agent
+        self._index_agent(agent)
+
+    def remove_agent(self, agent_id: str) -> AgentFundamentals | None:
+        agent = self.agents.pop(agent_id, None)
+        if agent is None:
+            return None
+        sector_id = agent.sector.value
+        self.sector_index[sector_id].pop(agent_id, None)
+        self.apply_agent_delta(agent, -agent.market_cap, -agent.price_change_pct, -agent.volatility)
+        agg = self.sector_aggregates[sector_id]
+        agg.agent_count -= 1
+        if agg.agent_count == 0:
+            del self.sector_aggregates[sector_id]
+            del self.sector_index[sector_id]
+        return agent
 
-        result = []
-        for sector_id, agents in by_sector.items():
-            avg_change = sum(a.price_change_pct for a in agents) / len(agents)
-            total_cap = sum(a.market_cap for a in agents)
-            result.append({
+    def apply_agent_delta(self, agent: AgentFundamentals, d_cap: float,
+                          d_change_pct: float, d_volatility: float) -> None:
+        agg = self.sector_aggregates[agent.sector.value]
+        agg.total_market_cap += d_cap
+        agg.price_change_sum += d_change_pct
+        agg.volatility_sum += d_volatility
+        self.total_market_cap += d_cap
+        self.volatility_sum += d_volatility
+
+    def _index_agent(self, agent: AgentFundamentals) -> None:
+        sector_id = agent.sector.value
+        self.sector_index.setdefault(sector_id, {})[agent.agent_id] = None
+        agg = self.sector_aggregates.setdefault(sector_id, SectorAggregate())
+        agg.agent_count += 1
+        self.apply_agent_delta(agent, agent.market_cap, agent.price_change_pct, agent.volatility)
+
+    # ── Snapshot helpers ─────────────────────────────────────────────────────
+
+    def _agent_dicts(self) -> list[dict]:
+        return [a.to_dict() for a in self.agents.values()]
+
+    def _sector_summary(self) -> list[dict]:
+        return [
+            {
                 "id": sector_id,
-                "avg_price_change_pct": round(avg_change, 2),
-                "total_market_cap": round(total_cap, 2),
-                "agent_count": len(agents),
-            })
-        return result
+                "avg_price_change_pct": round(agg.price_change_sum / agg.agent_count, 2),
+                "total_market_cap": round(agg.total_market_cap, 2),
+                "agent_count": agg.agent_count,
+            }
+            for sector_id, agg in self.sector_aggregates.items()
+        ]
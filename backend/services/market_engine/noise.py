@@ -0,0 +1,67 @@
+"""
+Batched per-tick randomness for the engines: price noise and passive flows.
+
+Each tick draws the whole noise vector in one call instead of one gauss()
+per agent. With NOISE_SECTOR_CORRELATION = rho > 0, noise follows a
+one-factor model per sector:
+
+    noise_i = NOISE_STD * (sqrt(rho) * z[sector_i] + sqrt(1 - rho) * e_i)
+
+with z (one draw per sector) and e (one per agent) independent standard
+normals. Agents in the same sector then have noise correlation rho, agents
+in different sectors none, and every agent keeps variance NOISE_STD².
+This is the exact factorization of the block-equicorrelated covariance, so
+a tick costs O(agents + sectors) draws instead of a dense N×N Cholesky.
+The factor loadings (which sector column each agent loads on) are cached
+and rebuilt only when the engine reports a new agent universe or taxonomy.
+
+rho = 0 (the default) draws independent noise from the same stream as
+before, so seeded runs are unchanged.
+"""
+
+import os
+
+import numpy as np
+
+NOISE_SECTOR_CORRELATION = float(os.environ.get("NOISE_SECTOR_CORRELATION", 0.0))
+
+PASSIVE_FLOW_PROBABILITY = 0.15
+PASSIVE_FLOW_RANGE = (10.0, 80.0)
+
+
+class NoiseGenerator:
+    def __init__(self, rng: np.random.Generator, std: float,
+                 sector_correlation: float = NOISE_SECTOR_CORRELATION):
+        if not 0.0 <= sector_correlation <= 1.0:
+            raise ValueError(f"sector_correlation must be within [0, 1], got {sector_correlation}")
+        self.rng = rng
+        self.std = std
+        self.sector_correlation = sector_correlation
+        self._common = std * np.sqrt(sector_correlation)
+        self._idiosyncratic = std * np.sqrt(1.0 - sector_correlation)
+        self._key: object = None
+        self._sector_idx = np.empty(0, dtype=np.intp)
+        self._n_sectors = 0
+
+    def stale(self, key: object) -> bool:
+        """True if the loadings were built for a different universe / taxonomy key."""
+        return key != self._key
+
+    def set_loadings(self, key: object, sector_idx: np.ndarray, n_sectors: int) -> None:
+        """Cache each agent's sector column (frame order) under `key`."""
+        self._key = key
+        self._sector_idx = np.asarray(sector_idx, dtype=np.intp).copy()
+        self._n_sectors = n_sectors
+
+    def price_noise(self, n: int) -> np.ndarray:
+        """One tick of noise for the `n` agents the loadings were built for."""
+        if self.sector_correlation == 0.0:
+            return self.rng.normal(0.0, self.std, n)
+        factors = self.rng.standard_normal(self._n_sectors)
+        return self._common * factors[self._sector_idx] + self._idiosyncratic * self.rng.standard_normal(n)
+
+    def passive_flows(self, n: int) -> tuple[np.ndarray, np.ndarray]:
+        """(active mask, amount) for one tick of passive flows; direction is the caller's."""
+        active = self.rng.random(n) < PASSIVE_FLOW_PROBABILITY
+        amount = self.rng.uniform(*PASSIVE_FLOW_RANGE, n)
+        return active, amount
@@ -0,0 +1,116 @@
+"""
+Fixed-capacity circular price buffer with rolling log-return statistics.
+
+Replaces the plain list previously held in AgentFundamentals.price_history.
+Appending is O(1): the evicted log return is subtracted from running sum and
+sum-of-squares, so volatility and the oldest price are available without
+rescanning the window. Sums are re-derived from the buffer once per
+`capacity` appends so floating-point drift stays bounded.
+"""
+
+import math
+from array import array
+from typing import Iterable, Iterator
+
+
+class PriceHistory:
+    __slots__ = (
+        "capacity", "_prices", "_head", "_count",
+        "_returns", "_ret_head", "_ret_count", "_ret_sum", "_ret_sumsq", "_since_resync",
+    )
+
+    def __init__(self, capacity: int = 20, prices: Iterable[float] = ()):
+        if capacity < 2:
+            raise ValueError("PriceHistory capacity must be at least 2")
+        self.capacity = capacity
+        self._prices = array("d", bytes(8 * capacity))
+        self._head = 0          # next write slot; holds the oldest price once full
+        self._count = 0
+        self._returns = array("d", bytes(8 * (capacity - 1)))
+        self._ret_head = 0
+        self._ret_count = 0
+        self._ret_sum = 0.0
+        self._ret_sumsq = 0.0
+        self._since_resync = 0
+        for p in prices:
+            self.append(p)
+
+    # ── Sequence interface (list-compatible reads) ───────────────────────────
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[float]:
+        start = (self._head - self._count) % self.capacity
+        for k in range(self._count):
+            yield self._prices[(start + k) % self.capacity]
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self.to_list()[i]
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("PriceHistory index out of range")
+        return self._prices[(self._head - self._count + i) % self.capacity]
+
+    def __repr__(self) -> str:
+        return f"PriceHistory(capacity={self.capacity}, prices={self.to_list()!r})"
+
+    def to_list(self) -> list[float]:
+        """Oldest → newest, as a plain list (used for JSON responses)."""
+        return list(self)
+
+    @property
+    def oldest(self) -> float:
+        return self[0]
+
+    @property
+    def newest(self) -> float:
+        return self[-1]
+
+    # ── Updates ──────────────────────────────────────────────────────────────
+
+    def append(self, price: float) -> None:
+        if self._count:
+            prev = self._prices[(self._head - 1) % self.capacity]
+            self._push_return(math.log(price / prev) if prev > 0 and price > 0 else 0.0)
+
+        self._prices[self._head] = price
+        self._head = (self._head + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def _push_return(self, r: float) -> None:
+        ret_cap = self.capacity - 1
+        if self._ret_count == ret_cap:
+            old = self._returns[self._ret_head]
+            self._ret_sum -= old
+            self._ret_sumsq -= old * old
+        else:
+            self._ret_count += 1
+        self._returns[self._ret_head] = r
+        self._ret_head = (self._ret_head + 1) % ret_cap
+        self._ret_sum += r
+        self._ret_sumsq += r * r
+
+        self._since_resync += 1
+        if self._since_resync >= ret_cap:
+            self._resync()
+
+    def _resync(self) -> None:
+        start = (self._ret_head - self._ret_count) % (self.capacity - 1)
+        vals = [self._returns[(start + k) % (self.capacity - 1)] for k in range(self._ret_count)]
+        self._ret_sum = math.fsum(vals)
+        self._ret_sumsq = math.fsum(v * v for v in vals)
+        self._since_resync = 0
+
+    # ── Rolling statistics ───────────────────────────────────────────────────
+
+    def volatility(self) -> float | None:
+        """Population std dev of log returns in the window, or None if empty."""
+        n = self._ret_count
+        if n == 0:
+            return None
+        mean = self._ret_sum / n
+        return math.sqrt(max(self._ret_sumsq / n - mean * mean, 0.0))
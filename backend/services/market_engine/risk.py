@@ -0,0 +1,316 @@
+"""
+Rolling value-at-risk and expected shortfall per agent and per sector.
+
+The engine pushes each tick's log returns into a ring of the last
+RISK_WINDOW ticks, stored as an (agents, window) float64 array. Sector
+returns are the cap-weighted mean of their agents' returns and go into a
+(sectors, window) ring alongside. Each tick costs one column write per ring.
+
+Risk figures are losses, positive = bad, in log-return units at
+RISK_CONFIDENCE (c):
+
+    historical VaR   the k-th worst return in the window, k = ⌊(1 - c) · n⌋ (at least 1)
+    historical CVaR  the mean of those k worst returns
+    parametric VaR   -(μ + z · σ)                    z = Φ⁻¹(1 - c)
+    parametric CVaR  -(μ - σ · φ(z) / (1 - c))       normal expected shortfall
+
+Every agent and sector is computed in one vectorised pass. The parametric
+figures come from running sums that each ring keeps as values enter and
+leave (resynced once per window cycle, like AgentArrays). The historical
+ones take one row-wise sort of the window. The pass runs at most once per
+tick: result() caches it by tick number, and every request in that tick
+reads the cached result.
+
+Every agent and sector needs RISK_MIN_OBSERVATIONS (20) returns in the window
+before its figures mean anything. Until then they are NaN, and
+/market/risk/var reports them as null next to the row's `observations` count
+and the response's `min_observations`. This applies after startup, to
+agents listed at runtime (they start with an empty NaN row and fill in tick
+by tick), and to sectors after a taxonomy change.
+Delisting swap-removes rows in place, in step with the engine's agent order
+(universe.py), and listing appends into spare capacity, so neither copies
+the ring. A taxonomy change restarts the sector ring, because sector
+indices change meaning.
+"""
+
+import math
+import os
+from dataclasses import dataclass
+from collections.abc import Mapping
+from statistics import NormalDist
+
+import numpy as np
+
+from backend.services.graph.queries import top_indices
+from .models import AgentFundamentals, Sector
+from .universe import swap_remove
+
+RISK_WINDOW = int(os.environ.get("RISK_WINDOW", 100))
+RISK_CONFIDENCE = float(os.environ.get("RISK_CONFIDENCE", 0.95))
+RISK_MIN_OBSERVATIONS = 20
+
+
+@dataclass
+class TailStats:
+    """Loss figures per row (agent or sector); NaN where observations < RISK_MIN_OBSERVATIONS."""
+    historical_var: np.ndarray
+    historical_cvar: np.ndarray
+    parametric_var: np.ndarray
+    parametric_cvar: np.ndarray
+    volatility: np.ndarray
+    observations: np.ndarray
+
+    def row(self, i: int, value: float | None = None) -> dict:
+        """One row as JSON-ready floats; `value` adds dollar VaR / CVaR (historical)."""
+        def num(x: float) -> float | None:
+            return None if math.isnan(x) else round(x, 6)
+
+        row = {
+            "historical_var": num(float(self.historical_var[i])),
+            "historical_cvar": num(float(self.historical_cvar[i])),
+            "parametric_var": num(float(self.parametric_var[i])),
+            "parametric_cvar": num(float(self.parametric_cvar[i])),
+            "volatility": num(float(self.volatility[i])),
+            "observations": int(self.observations[i]),
+        }
+        if value is not None:
+            row["var_usd"] = _dollars(value, self.historical_var[i])
+            row["cvar_usd"] = _dollars(value, self.historical_cvar[i])
+        return row
+
+
+def _dollars(value: float, loss: float) -> float | None:
+    return None if math.isnan(loss) else round(value * -math.expm1(-loss), 2)
+
+
+def tail_stats(ring: "_Ring", confidence: float = RISK_CONFIDENCE) -> TailStats:
+    """VaR / CVaR for every row of a return ring."""
+    window, obs = ring.values, ring.observations
+    rows, width = window.shape
+    n = np.maximum(obs, 1)
+    k = np.clip(np.floor((1.0 - confidence) * obs).astype(np.intp), 1, width)
+    if rows and width:
+        # NaN sorts last, so each row's first k entries are its k worst returns.
+        worst = np.sort(window, axis=1)[:, :int(k.max())]
+        tail_sum = np.cumsum(worst, axis=1)
+        at = np.arange(rows)
+        hist_var = -worst[at, k - 1]
+        hist_cvar = -tail_sum[at, k - 1] / k
+    else:
+        hist_var = hist_cvar = np.zeros(rows)
+
+    mean = ring.total / n
+    variance = np.maximum(ring.total_sq / n - mean * mean, 0.0)
+    std = np.sqrt(variance * n / np.maximum(n - 1, 1))
+    normal = NormalDist()
+    z = normal.inv_cdf(1.0 - confidence)
+    param_var = -(mean + z * std)
+    param_cvar = -(mean - std * normal.pdf(z) / (1.0 - confidence))
+
+    thin = obs < RISK_MIN_OBSERVATIONS
+    stats = [np.where(thin, np.nan, x) for x in (hist_var, hist_cvar, param_var, param_cvar, std)]
+    return TailStats(*stats, observations=obs.copy())
+
+
+class _Rows:
+    """
+    Row-aligned arrays, each a view of the first `rows` rows of a buffer with
+    spare capacity (as in AgentArrays). Listings append in amortized O(k) and
+    delistings swap-remove in place, so universe changes never copy the
+    whole (agents, window) ring.
+    """
+
+    FILL: dict[str, float] = {}     # value for new rows, by array name (default 0)
+
+    def __init__(self, arrays: dict[str, np.ndarray]):
+        self._buffers = dict(arrays)
+        self.rows = len(next(iter(arrays.values())))
+        self._reslice()
+
+    def append(self, k: int) -> None:
+        n = self.rows
+        self._reserve(n + k)
+        self.rows = n + k
+        self._reslice()
+        for name in self._buffers:
+            getattr(self, name)[n:] = self.FILL.get(name, 0)
+
+    def move(self, dst: list[int], src: list[int], rows: int) -> None:
+        for buf in self._buffers.values():
+            buf[dst] = buf[src]
+        self.rows = rows
+        self._reslice()
+
+    def _reserve(self, n: int) -> None:
+        capacity = len(next(iter(self._buffers.values())))
+        if n <= capacity:
+            return
+        capacity = max(n, capacity * 2, 64)
+        for name, buf in self._buffers.items():
+            grown = np.empty((capacity, *buf.shape[1:]), dtype=buf.dtype)
+            grown[:self.rows] = buf[:self.rows]
+            self._buffers[name] = grown
+
+    def _reslice(self) -> None:
+        for name, buf in self._buffers.items():
+            setattr(self, name, buf[:self.rows])
+
+
+class _Ring(_Rows):
+    """
+    (rows, window) returns with NaN for missing values, plus running
+    per-row sums, sums of squares and non-missing counts.
+    """
+
+    FILL = {"values": np.nan}
+
+    def __init__(self, rows: int, window: int):
+        super().__init__({
+            "values": np.full((rows, window), np.nan),
+            "observations": np.zeros(rows, dtype=np.intp),
+            "total": np.zeros(rows),
+            "total_sq": np.zeros(rows),
+        })
+
+    def write(self, h: int, new: np.ndarray) -> None:
+        old = self.values[:, h]
+        old_ok, new_ok = ~np.isnan(old), ~np.isnan(new)
+        old0, new0 = np.where(old_ok, old, 0.0), np.where(new_ok, new, 0.0)
+        self.total += new0 - old0
+        self.total_sq += new0 * new0 - old0 * old0
+        self.observations += new_ok.astype(np.intp) - old_ok
+        self.values[:, h] = new
+
+    def resync(self) -> None:
+        """Re-derive the running sums from the ring (bounds float drift)."""
+        filled = np.nan_to_num(self.values)
+        self.total[:] = filled.sum(axis=1)
+        self.total_sq[:] = (filled * filled).sum(axis=1)
+
+
+@dataclass
+class RiskResult:
+    tick_number: int
+    confidence: float
+    window: int
+    ids: list[str]              # agent order of the per-agent arrays
+    agents: TailStats
+    sectors: TailStats
+    market_cap: np.ndarray      # (agents,) at compute time
+    sector_idx: np.ndarray      # (agents,)
+    sector_cap: np.ndarray      # (sectors,)
+
+    def to_dict(self, sectors: tuple[Sector, ...], agents: Mapping[str, AgentFundamentals],
+                limit: int = 20, sector: str | None = None) -> dict:
+        """Every sector, plus the `limit` agents with the largest historical VaR (optionally one sector's)."""
+        ranked = np.nan_to_num(self.agents.historical_var, nan=-np.inf)
+        if sector is not None:
+            s = next((i for i, sec in enumerate(sectors) if sec.value == sector), None)
+            ranked = np.where(self.sector_idx == s, ranked, -np.inf)
+        eligible = int(np.isfinite(ranked).sum())
+        return {
+            **self.header(),
+            "sectors": [
+                {"sector": sec.value, **self.sectors.row(i, float(self.sector_cap[i]))}
+                for i, sec in enumerate(sectors) if i < len(self.sector_cap)
+            ],
+            "agents": [self.agent_row(j, sectors, agents) for j in top_indices(ranked, min(limit, eligible)).tolist()],
+        }
+
+    def header(self) -> dict:
+        """Response metadata. Rows with fewer than `min_observations` returns have null figures."""
+        return {"tick_number": self.tick_number, "confidence": self.confidence,
+                "window": self.window, "min_observations": RISK_MIN_OBSERVATIONS}
+
+    def agent_row(self, j: int, sectors: tuple[Sector, ...], agents: Mapping[str, AgentFundamentals]) -> dict:
+        aid = self.ids[j]
+        agent = agents.get(aid)
+        return {
+            "agent_id": aid,
+            "name": agent.name if agent else aid,
+            "sector": sectors[self.sector_idx[j]].value if self.sector_idx[j] < len(sectors) else None,
+            "market_cap": round(float(self.market_cap[j]), 2),
+            **self.agents.row(j, float(self.market_cap[j])),
+        }
+
+
+class RiskEngine:
+    def __init__(self, ids: list[str], n_sectors: int, window: int = RISK_WINDOW,
+                 confidence: float = RISK_CONFIDENCE):
+        self.ids = list(ids)
+        self.index = {aid: j for j, aid in enumerate(self.ids)}
+        self.window = window
+        self.confidence = confidence
+        self.agents = _Ring(len(self.ids), window)
+        self.sectors = _Ring(n_sectors, window)
+        self.head = 0
+        self.tick_number = -1
+        self._taxonomy = None
+        self.columns = _Rows({                  # as of the last update
+            "market_cap": np.zeros(len(self.ids)),
+            "sector_idx": np.zeros(len(self.ids), dtype=np.intp),
+        })
+        self._result: RiskResult | None = None
+
+    # ── Per-tick update ──────────────────────────────────────────────────────
+
+    def update(self, tick_number: int, returns: np.ndarray, market_cap: np.ndarray,
+               sector_idx: np.ndarray, taxonomy) -> None:
+        """Record one tick of log returns aligned with `ids`."""
+        n_sectors = len(taxonomy.sectors)
+        if taxonomy is not self._taxonomy:
+            self._taxonomy = taxonomy
+            self.sectors = _Ring(n_sectors, self.window)
+
+        cap = np.bincount(sector_idx, weights=market_cap, minlength=n_sectors)
+        weighted = np.bincount(sector_idx, weights=market_cap * returns, minlength=n_sectors)
+        self.agents.write(self.head, returns)
+        self.sectors.write(self.head, np.divide(weighted, cap, out=np.full(n_sectors, np.nan), where=cap > 0))
+        self.head = (self.head + 1) % self.window
+        if self.head == 0:
+            self.agents.resync()
+            self.sectors.resync()
+
+        self.columns.market_cap[:] = market_cap
+        self.columns.sector_idx[:] = sector_idx
+        self.tick_number = tick_number
+
+    def result(self) -> RiskResult:
+        """VaR / CVaR as of the last update, computed at most once per tick."""
+        if self._result is None or self._result.tick_number != self.tick_number:
+            n_sectors = len(self.sectors.observations)
+            market_cap, sector_idx = self.columns.market_cap.copy(), self.columns.sector_idx.copy()
+            self._result = RiskResult(
+                tick_number=self.tick_number,
+                confidence=self.confidence,
+                window=self.window,
+                ids=list(self.ids),
+                agents=tail_stats(self.agents, self.confidence),
+                sectors=tail_stats(self.sectors, self.confidence),
+                market_cap=market_cap,
+                sector_idx=sector_idx,
+                sector_cap=np.bincount(sector_idx, weights=market_cap, minlength=n_sectors),
+            )
+        return self._result
+
+    # ── Agent universe changes (mirrors the engine) ──────────────────────────
+
+    def add(self, agent_ids: list[str]) -> None:
+        """Append empty rows for newly listed agents."""
+        if not agent_ids:
+            return
+        for aid in agent_ids:
+            self.index[aid] = len(self.ids)
+            self.ids.append(aid)
+        self.agents.append(len(agent_ids))
+        self.columns.append(len(agent_ids))
+        self._result = None
+
+    def remove(self, agent_ids: list[str]) -> None:
+        """Swap-remove delisted agents' rows (same order as the engine)."""
+        if not agent_ids:
+            return
+        dst, src = swap_remove(self.ids, self.index, agent_ids)
+        self.agents.move(dst, src, len(self.ids))
+        self.columns.move(dst, src, len(self.ids))
+        self._result = None
@@ -0,0 +1,90 @@
+"""
+Deadline-based tick scheduler.
+
+Ticks are aimed at absolute times (start + k * interval) instead of sleeping a
+fixed interval after each tick, so tick + callback time no longer stretches
+the period. When a tick and its callbacks overrun the next deadline, the
+configured policy decides how to recover:
+
+  skip       drop the missed slots and resume on the next aligned deadline
+  catch_up   run missed ticks back-to-back (bounded by max_catch_up)
+  slow_down  re-anchor the schedule at "now", stretching the period under load
+"""
+
+import asyncio
+import time
+from enum import Enum
+from typing import Awaitable, Callable
+
+
+class TickPolicy(str, Enum):
+    SKIP = "skip"
+    CATCH_UP = "catch_up"
+    SLOW_DOWN = "slow_down"
+
+
+class TickScheduler:
+    def __init__(
+        self,
+        interval_s: float,
+        policy: TickPolicy | str = TickPolicy.SKIP,
+        max_catch_up: int = 5,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ):
+        self.interval_s = interval_s
+        self.policy = TickPolicy(policy)
+        self.max_catch_up = max_catch_up
+        self._clock = clock
+        self._sleep = sleep
+
+        self.next_deadline: float | None = None
+        self.last_jitter_ms: float = 0.0
+        self.max_jitter_ms: float = 0.0
+        self.overruns: int = 0
+        self.skipped_ticks: int = 0
+
+    def reset(self) -> None:
+        """Anchor the schedule so the next tick is due immediately."""
+        self.next_deadline = self._clock()
+
+    async def wait(self) -> None:
+        """Sleep until the next deadline, then record how late we woke up."""
+        if self.next_deadline is None:
+            self.reset()
+        delay = self.next_deadline - self._clock()
+        # Always yield, even when behind, so the event loop keeps serving I/O.
+        await self._sleep(max(delay, 0.0))
+        self.last_jitter_ms = max(0.0, (self._clock() - self.next_deadline) * 1000)
+        self.max_jitter_ms = max(self.max_jitter_ms, self.last_jitter_ms)
+
+    def advance(self) -> None:
+        """Set the next deadline after a tick and its callbacks have finished."""
+        now = self._clock()
+        self.next_deadline += self.interval_s
+        if now <= self.next_deadline:
+            return
+
+        self.overruns += 1
+        behind = now - self.next_deadline
+        if self.policy is TickPolicy.SKIP:
+            missed = int(behind // self.interval_s) + 1
+            self.skipped_ticks += missed
+            self.next_deadline += missed * self.interval_s
+        elif self.policy is TickPolicy.CATCH_UP:
+            missed = int(behind // self.interval_s)
+            if missed > self.max_catch_up:
+                dropped = missed - self.max_catch_up
+                self.skipped_ticks += dropped
+                self.next_deadline += dropped * self.interval_s
+        else:
+            self.next_deadline = now
+
+    def stats(self) -> dict:
+        return {
+            "policy": self.policy.value,
+            "last_jitter_ms": round(self.last_jitter_ms, 3),
+            "max_jitter_ms": round(self.max_jitter_ms, 3),
+            "overruns": self.overruns,
+            "skipped_ticks": self.skipped_ticks,
+        }
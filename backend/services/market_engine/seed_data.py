@@ -1,4 +1,8 @@
+import copy
+import random
+
 from .models import AgentFundamentals, Sector
+from backend.services.shock_engine.taxonomy import current as current_taxonomy
 
 # ── 8 Agents seeded at demo-realistic values ─────────────────────────────────
 # See docs/MARKET_MODEL.md for full rationale.
@@ -107,5 +111,30 @@ SEED_AGENTS: list[AgentFundamentals] = [
 
 
 def get_seed_agents() -> dict[str, AgentFundamentals]:
-    """Return a fresh dict of agent_id -> AgentFundamentals."""
-    return {a.agent_id: a for a in SEED_AGENTS}
+    """Return a fresh dict of agent_id -> AgentFundamentals (independent copies)."""
+    return {a.agent_id: copy.deepcopy(a) for a in SEED_AGENTS}
+
+
+def generate_synthetic_agents(count: int, seed: int = 0) -> dict[str, AgentFundamentals]:
+    """
+    Return `count` randomized agents spread across all sectors.
+    Used to stress the engine with market sizes far beyond the demo roster.
+    """
+    rng = random.Random(seed)
+    sectors = list(current_taxonomy().sectors)
+    agents: dict[str, AgentFundamentals] = {}
+    for i in range(count):
+        agent_id = f"synth_{i:06d}"
+        agents[agent_id] = AgentFundamentals(
+            agent_id=agent_id,
+            name=f"Synth-{i:06d}",
+            sector=sectors[i % len(sectors)],
+            usage_score=round(rng.uniform(0.4, 0.95), 2),
+            performance_score=round(rng.uniform(0.5, 0.9), 2),
+            reliability_score=round(rng.uniform(0.7, 0.98), 2),
+            risk_score=round(rng.uniform(0.15, 0.65), 2),
+            inflow_velocity=round(rng.uniform(-0.1, 0.15), 2),
+            total_backing=round(rng.uniform(1000.0, 7000.0), 0),
+            price=round(rng.uniform(40.0, 220.0), 2),
+        )
+    return agents
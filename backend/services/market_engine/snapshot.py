@@ -0,0 +1,70 @@
+"""
+Immutable per-tick market snapshot.
+
+The engine builds one MarketSnapshot after each tick and every reader (REST,
+WebSocket broadcast, agent tools, telemetry) shares it. Filtered views and
+their JSON encodings are computed on first use and cached on the snapshot, so
+N readers of the same tick cost one serialization instead of N.
+
+Snapshot dicts are shared: treat anything returned from here as read-only.
+"""
+
+import json
+from typing import Any, Callable
+
+# Called with the snapshot's tick number; returns each agent's price history
+# ending at that tick.
+HistoryProvider = Callable[[int], dict[str, list[float]]]
+
+
+class MarketSnapshot:
+    __slots__ = ("tick_number", "data", "_history_fn", "_history", "_cache")
+
+    def __init__(self, data: dict, history: HistoryProvider | None = None):
+        self.tick_number: int = data["tick_number"]
+        self.data = data
+        # Price histories are only materialized if a reader asks for them. The
+        # provider is keyed on this snapshot's tick: read after the engine has
+        # moved on, it drops the newer prices, so a snapshot held across ticks
+        # never mixes its aggregates with later histories (the history is just
+        # shorter by the ticks elapsed, as the oldest prices have rolled off).
+        self._history_fn = history
+        self._history: dict[str, list[float]] | None = None
+        self._cache: dict[Any, Any] = {}
+
+    def view(self, sector: str | None = None, include_history: bool = False) -> dict:
+        """Snapshot dict, optionally restricted to one sector's agents and/or with price history."""
+        if sector is None and not include_history:
+            return self.data
+        return self.memo(("view", sector, include_history),
+                         lambda: self._build_view(sector, include_history))
+
+    def json(self, sector: str | None = None, include_history: bool = False) -> bytes:
+        """UTF-8 JSON encoding of `view(sector, include_history)`."""
+        return self.memo(("json", sector, include_history),
+                         lambda: json.dumps(self.view(sector, include_history)).encode())
+
+    def memo(self, key: Any, build: Callable[[], Any]) -> Any:
+        """
+        Cache an arbitrary derived payload (e.g. an encoded WebSocket frame)
+        for the lifetime of this tick.
+        """
+        try:
+            return self._cache[key]
+        except KeyError:
+            value = self._cache[key] = build()
+            return value
+
+    def _build_view(self, sector: str | None, include_history: bool) -> dict:
+        agents = self.data["agents"]
+        if sector is not None:
+            agents = [a for a in agents if a["sector"] == sector]
+        if include_history:
+            history = self._price_history()
+            agents = [{**a, "price_history": history.get(a["id"], [])} for a in agents]
+        return {**self.data, "agents": agents}
+
+    def _price_history(self) -> dict[str, list[float]]:
+        if self._history is None:
+            self._history = self._history_fn(self.tick_number) if self._history_fn else {}
+        return self._history
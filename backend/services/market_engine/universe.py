@@ -0,0 +1,99 @@
+"""
+Runtime listing and delisting of agents.
+
+The admin API queues additions and removals here. The engine applies them
+at the start of its next step(), between ticks, so a tick never sees a
+half-applied batch.
+
+Every positional per-agent structure (the engine's frame order, AgentArrays
+rows, candle columns) uses the same swap-remove rule: removing the agent in
+slot j moves the last agent into slot j, and new agents are appended. All
+structures apply the same removals in the same order, so they stay aligned
+with O(1) work per removed agent and O(k) per batch of k additions; each
+array applies a batch's moves with a single gather.
+"""
+
+from collections.abc import Iterable, Mapping
+
+from .models import AgentFundamentals
+
+
+class UniverseError(ValueError):
+    """A queued change conflicts with the live or pending agent set."""
+
+    def __init__(self, message: str, agent_ids: list[str]):
+        super().__init__(f"{message}: {', '.join(agent_ids[:10])}{' ...' if len(agent_ids) > 10 else ''}")
+        self.agent_ids = agent_ids
+
+
+def swap_remove(ids: list[str], index: dict[str, int], agent_ids: Iterable[str]) -> tuple[list[int], list[int]]:
+    """
+    Drop a batch of ids from an ordered ids/index pair, moving the last id
+    into each vacated slot. Returns (dst, src): slot dst[i] now holds what
+    was originally in slot src[i], so positional arrays catch up with one
+    gather (`arr[dst] = arr[src]`) per array instead of one move per id.
+    """
+    origin: dict[int, int] = {}
+    for aid in agent_ids:
+        j = index.pop(aid)
+        last = len(ids) - 1
+        moved = ids.pop()
+        if moved == aid:
+            origin.pop(last, None)
+            continue
+        ids[j] = moved
+        index[moved] = j
+        origin[j] = origin.pop(last, last)
+    dst = list(origin)
+    return dst, [origin[d] for d in dst]
+
+
+class PendingUniverse:
+    """Agent additions and removals waiting for the next tick boundary."""
+
+    def __init__(self):
+        self.add: dict[str, AgentFundamentals] = {}
+        self.remove: dict[str, None] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.add or self.remove)
+
+    def queue(self, live: Mapping[str, object], add: Iterable[AgentFundamentals] = (),
+              remove: Iterable[str] = ()) -> None:
+        """
+        Validate and queue one batch. Removals are applied before additions,
+        so an id may be delisted and relisted in the same batch. Nothing is
+        queued if any id conflicts.
+        """
+        add = list(add)
+        remove = list(dict.fromkeys(remove))
+
+        unknown = [aid for aid in remove
+                   if aid not in self.add and (aid not in live or aid in self.remove)]
+        if unknown:
+            raise UniverseError("Unknown or already delisted agents", unknown)
+
+        removing = set(remove)
+        seen: set[str] = set()
+        conflicts = []
+        for agent in add:
+            aid = agent.agent_id
+            pending = aid in self.add and aid not in removing
+            listed = aid in live and aid not in self.remove and aid not in removing
+            if aid in seen or pending or listed:
+                conflicts.append(aid)
+            seen.add(aid)
+        if conflicts:
+            raise UniverseError("Agents already listed", conflicts)
+
+        for aid in remove:
+            if self.add.pop(aid, None) is None:
+                self.remove[aid] = None
+        for agent in add:
+            self.add[agent.agent_id] = agent
+
+    def take(self) -> tuple[list[str], list[AgentFundamentals]]:
+        """Drain the queue: (ids to remove, agents to add)."""
+        removed, added = list(self.remove), list(self.add.values())
+        self.add, self.remove = {}, {}
+        return removed, added
@@ -0,0 +1,184 @@
+"""
+NumPy-backed MarketEngine for large agent universes.
+
+Same pricing model and public surface as MarketEngine, but the tick runs as
+batched array operations over AgentArrays instead of a Python loop per agent.
+Selected with MARKET_ENGINE=vectorized.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from .arrays import AgentArrays, AgentView
+from .engine import (
+    MarketEngine, AGGREGATE_RESYNC_TICKS, ALPHA, BETA, GAMMA, MIN_BACKING, PRICE_FLOOR, INFLOW_DECAY,
+)
+from .history_store import FIELDS as HISTORY_FIELDS, TickFrame
+from .models import AgentFundamentals, MarketState, SectorAggregate
+from backend.services.shock_engine.taxonomy import Taxonomy
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ArrayMarketState(MarketState):
+    arrays: AgentArrays | None = None
+
+    def rebuild_aggregates(self) -> None:
+        """
+        Recompute sector and market totals from the arrays in one batched pass.
+
+        Unlike the scalar engine, which keeps per-sector deltas and calls this
+        only at startup and every AGGREGATE_RESYNC_TICKS, the vectorized tick
+        calls it every tick, deliberately. The tick moves every agent's price,
+        so a delta update would touch every row too. The four bincounts cost
+        about a tenth of the tick (0.25 ms of 2.5 ms at 10k agents, 3 ms of
+        29 ms at 100k). Recomputing also means the totals never drift, so
+        this path needs no periodic aggregate resync.
+        """
+        a = self.arrays
+        if a is None:
+            return
+        if not self.sector_index:
+            for aid, j in zip(a.ids, a.sector_idx.tolist()):
+                self.sector_index.setdefault(a.sectors[j].value, {})[aid] = None
+
+        n_sectors = len(a.sectors)
+        counts = np.bincount(a.sector_idx, minlength=n_sectors).tolist()
+        caps = np.bincount(a.sector_idx, weights=a.market_cap, minlength=n_sectors).tolist()
+        changes = np.bincount(a.sector_idx, weights=a.price_change_pct(), minlength=n_sectors).tolist()
+        vols = np.bincount(a.sector_idx, weights=a.volatility, minlength=n_sectors).tolist()
+
+        sector_pos = {s.value: j for j, s in enumerate(a.sectors)}
+        self.sector_aggregates = {
+            sector_id: SectorAggregate(
+                agent_count=counts[sector_pos[sector_id]],
+                total_market_cap=caps[sector_pos[sector_id]],
+                price_change_sum=changes[sector_pos[sector_id]],
+                volatility_sum=vols[sector_pos[sector_id]],
+            )
+            for sector_id in self.sector_index
+        }
+        self.total_market_cap = float(a.market_cap.sum())
+        self.volatility_sum = float(a.volatility.sum())
+
+    def _agent_dicts(self) -> list[dict]:
+        return self.arrays.to_dicts()
+
+
+class VectorMarketEngine(MarketEngine):
+    def _build_state(self, agents: dict[str, AgentFundamentals]) -> MarketState:
+        self.arrays = AgentArrays(list(agents.values()), self.taxonomy)
+        return ArrayMarketState(agents=self.arrays.views(), arrays=self.arrays)
+
+    def get_agents(self) -> list[dict]:
+        return self.arrays.to_dicts()
+
+    def agent_ids(self) -> list[str]:
+        return self.arrays.ids
+
+    def tick_frame(self) -> TickFrame:
+        a = self.arrays
+        return TickFrame(
+            tick_number=self.state.tick_number,
+            timestamp=time.time(),
+            ids=a.ids,
+            columns={name: getattr(a, name) for name in HISTORY_FIELDS},
+            universe_version=self.universe_version,
+        )
+
+    def _swap_taxonomy(self, taxonomy: Taxonomy) -> None:
+        self.arrays.remap_sectors(taxonomy)
+        super()._swap_taxonomy(taxonomy)
+
+    def _remove_agents(self, agent_ids: list[str]) -> None:
+        for aid in agent_ids:
+            self.state.remove_agent(aid)          # reads the row before it is overwritten
+        views, ids = self.state.agents, self.arrays.ids
+        for j in self.arrays.remove(agent_ids):
+            views[ids[j]]._i = j
+
+    def _add_agents(self, agents: list[AgentFundamentals]) -> None:
+        start = self.arrays.count
+        self.arrays.append(agents)
+        for k in range(len(agents)):
+            self.state.add_agent(AgentView(self.arrays, start + k))
+
+    def _sector_columns(self) -> np.ndarray:
+        return self.arrays.sector_idx
+
+    def _last_returns(self) -> np.ndarray:
+        return self.arrays.last_returns()
+
+    def _market_caps(self) -> np.ndarray:
+        return self.arrays.market_cap
+
+    def _live_price_histories(self) -> dict[str, list[float]]:
+        return dict(zip(self.arrays.ids, self.arrays.history_lists()))
+
+    def _tick(self) -> None:
+        a = self.arrays
+        sector_impacts = self.taxonomy.impact_vector(self.state.active_shocks)
+
+        for shock in self.state.active_shocks:
+            shock.ticks_remaining -= 1
+        self.state.active_shocks = [s for s in self.state.active_shocks if s.ticks_remaining > 0]
+
+        delta = (
+            ALPHA * a.inflow_velocity
+            + BETA * (a.performance_score - a.prev_performance)
+            - GAMMA * (a.risk_score - a.prev_risk)
+            + sector_impacts[a.sector_idx]
+            + self._spillover()
+            + self._draw_noise()
+        )
+        a.push_prices(np.maximum(a.price * (1 + delta), PRICE_FLOOR))
+
+        a.inflow_velocity *= INFLOW_DECAY
+        self._simulate_passive_flows_batch()
+
+        self.state.rebuild_aggregates()         # O(N) per tick, by design (see ArrayMarketState)
+        self.state.cascade_probability = self._compute_cascade_probability()
+        self.state.tick_number += 1
+        if self.state.tick_number % AGGREGATE_RESYNC_TICKS == 0:
+            self.concentration.resync()
+
+        if self.state.total_market_cap > self.peak_market_cap:
+            self.peak_market_cap = self.state.total_market_cap
+        if self.peak_market_cap > 0:
+            self.drawdown_pct = ((self.state.total_market_cap - self.peak_market_cap) / self.peak_market_cap) * 100
+
+        self._snapshot_prev_fundamentals()
+
+    def _simulate_passive_flows_batch(self) -> None:
+        """Vectorized equivalent of MarketEngine._simulate_passive_flows."""
+        a = self.arrays
+        active, amount = self.noise.passive_flows(a.count)
+
+        up = a.price_change_pct() > 0
+        buy = active & up
+        sell = active & ~up
+        amount = np.where(buy, amount, amount * 0.5)
+
+        # Same caps as MarketEngine.simulate_sell: the open market's position
+        # and MIN_BACKING; velocity and total_backing move by what the graph removed.
+        buys = np.where(buy, amount, 0.0)
+        sells = np.where(sell, np.minimum(amount, np.maximum(a.total_backing - MIN_BACKING, 0.0)), 0.0)
+        old, new = self.graph.record_open_market_flows(buys - sells)
+        sells = np.where(sell, old - new, 0.0)
+        self.concentration.record_open_market(old, new)
+
+        rel = np.where(buy, amount, sells) / np.maximum(a.total_backing, 1.0)
+        a.inflow_velocity[buy] = np.minimum(1.0, a.inflow_velocity[buy] + rel[buy])
+        a.inflow_velocity[sell] = np.maximum(-1.0, a.inflow_velocity[sell] - rel[sell])
+        a.total_backing[buy] += amount[buy]
+        a.total_backing[sell] -= sells[sell]
+        if self.candles is not None:
+            self.candles.record_flows(buys, sells)
+
+    def _snapshot_prev_fundamentals(self) -> None:
+        self.arrays.prev_performance[:] = self.arrays.performance_score
+        self.arrays.prev_risk[:] = self.arrays.risk_score
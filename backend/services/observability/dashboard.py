@@ -152,7 +152,8 @@ def _build_widgets() -> list:
             _query("aex.http.requests{service:aex} by {path}.as_count()", "Requests")
         ], width=4),
         _timeseries("Engine Tick Latency (ms)", [
-            _query("aex.engine.tick_latency_ms{service:aex}", "Tick Time")
+            _query("aex.engine.tick_latency_ms{service:aex}", "Tick Time"),
+            _query("aex.engine.tick_jitter_ms{service:aex}", "Tick Jitter"),
         ], width=4),
     ]))
 
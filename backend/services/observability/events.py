@@ -97,6 +97,22 @@ def emit_market_anomaly(anomaly_type: str, details: str,
     )
 
 
+def emit_concentration_event(agent_id: str, herfindahl: float, above: bool,
+                             threshold: float = 0.4) -> None:
+    state = "Concentrated Backing" if above else "Backing Diversified"
+    title = f"AEX Concentration: {agent_id} {state}"
+    text = (
+        f"**Agent:** {agent_id}\n"
+        f"**HHI:** {herfindahl:.4f} ({'above' if above else 'back below'} {threshold})\n"
+        f"**run_id:** `{get_run_id()}`"
+    )
+    get_client().submit_event(
+        title, text,
+        [f"agent_id:{agent_id}", f"concentration:{'high' if above else 'normal'}"] + _run_tag(),
+        alert_type="warning" if above else "info",
+    )
+
+
 def emit_test_event(summary: str, results: list[dict], run_id: str) -> None:
     passed = sum(1 for r in results if r.get("status") == "PASS")
     total = len(results)
@@ -136,6 +136,19 @@ def emit_llm_metrics(agent_name: str, model: str, input_tokens: int,
 def emit_tick_latency(latency_ms: float) -> None:
     _gauge("aex.engine.tick_latency_ms", latency_ms)
 
+def emit_tick_schedule(jitter_ms: float, overruns: int, skipped_ticks: int) -> None:
+    _gauge("aex.engine.tick_jitter_ms",   jitter_ms)
+    _gauge("aex.engine.tick_overruns",    overruns)
+    _gauge("aex.engine.ticks_skipped",    skipped_ticks)
+
+def emit_dispatch_metrics(subscriber_stats: list[dict]) -> None:
+    for sub in subscriber_stats:
+        tags = [f"subscriber:{sub['name']}"]
+        _gauge("aex.dispatch.lag_ticks",   sub["lag_ticks"],       tags=tags)
+        _gauge("aex.dispatch.queue_depth", sub["queue_depth"],     tags=tags)
+        _gauge("aex.dispatch.dropped",     sub["dropped"],         tags=tags)
+        _gauge("aex.dispatch.handler_ms",  sub["last_handler_ms"], tags=tags)
+
 def emit_ws_connections(count: int) -> None:
     _gauge("aex.ws.connections", count)
 
@@ -1,6 +1,7 @@
 import uuid
 import logging
 from backend.services.market_engine.models import SignalEvent, ShockEvent, ShockType
+from .taxonomy import current as current_taxonomy
 
 logger = logging.getLogger(__name__)
 
@@ -42,8 +43,9 @@ def convert_signal_to_shock(signal: SignalEvent) -> ShockEvent | None:
         logger.debug(f"Signal {signal.signal_id} below severity threshold, skipping")
         return None
 
+    taxonomy = current_taxonomy()
     shock_type = _resolve_shock_type(signal)
-    if shock_type is None:
+    if shock_type is None or shock_type not in taxonomy.shock_type_index:
         return None
 
     description = _build_description(signal)
@@ -54,14 +56,16 @@ def convert_signal_to_shock(signal: SignalEvent) -> ShockEvent | None:
         severity=min(1.0, signal.severity_hint),
         description=description,
         timestamp=signal.timestamp,
+        ticks_remaining=taxonomy.duration(shock_type),
         source=signal.source,
     )
 
 
 def _resolve_shock_type(signal: SignalEvent) -> ShockType | None:
     """Determine shock type from signal metadata."""
-    # Direct type mapping
-    direct = SIGNAL_TO_SHOCK_MAP.get(signal.signal_type.upper())
+    # Direct type mapping (taxonomy config first, then the built-in map)
+    signal_type = signal.signal_type.upper()
+    direct = current_taxonomy().signal_map.get(signal_type) or SIGNAL_TO_SHOCK_MAP.get(signal_type)
     if direct:
         return direct
 
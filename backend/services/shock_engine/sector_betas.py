@@ -1,7 +1,11 @@
-from backend.services.market_engine.models import ShockType, Sector
+import numpy as np
 
-# ── Sector Beta Matrix ────────────────────────────────────────────────────────
-# How sensitive each sector is to each shock type.
+from backend.services.market_engine.models import ShockEvent, ShockType, Sector
+
+# ── Built-in taxonomy ─────────────────────────────────────────────────────────
+# Defaults compiled by shock_engine/taxonomy.py when TAXONOMY_CONFIG is unset.
+#
+# Sector beta matrix: how sensitive each sector is to each shock type.
 # Positive = benefits from shock. Negative = hurt by shock.
 # See docs/MARKET_MODEL.md for rationale.
 
@@ -40,5 +44,47 @@ MAX_TICK_IMPACT = 0.15
 DECAY_SCHEDULE = [1.0, 0.6, 0.3, 0.1]
 
 
+# Per-type severity used in DEMO_MODE, and the default shock descriptions.
+SHOCK_SEVERITIES: dict[ShockType, float] = {
+    ShockType.REGULATION: 0.70,
+    ShockType.CYBER:      0.60,
+    ShockType.FX_SHOCK:   0.50,
+    ShockType.EARTHQUAKE: 0.55,
+    ShockType.SANCTIONS:  0.65,
+}
+
+SHOCK_DESCRIPTIONS: dict[ShockType, str] = {
+    ShockType.REGULATION: "Regulatory crackdown on AI systems announced",
+    ShockType.CYBER:      "Large-scale cyber attack detected across financial networks",
+    ShockType.FX_SHOCK:   "Significant FX volatility spike in major currency pair",
+    ShockType.EARTHQUAKE: "Major earthquake near financial infrastructure hub",
+    ShockType.SANCTIONS:  "New sanctions package targeting tech sector announced",
+}
+
+
+def builtin_config() -> dict:
+    """The values above in TAXONOMY_CONFIG form (the taxonomy used when none is configured)."""
+    return {
+        "sectors": [Sector.FRAUD_AML, Sector.COMPLIANCE, Sector.GEO_OSINT],
+        "decay": DECAY_SCHEDULE,
+        "max_tick_impact": MAX_TICK_IMPACT,
+        "shock_types": {
+            t: {"betas": betas, "severity": SHOCK_SEVERITIES[t], "description": SHOCK_DESCRIPTIONS[t]}
+            for t, betas in SECTOR_BETAS.items()
+        },
+    }
+
+
+# ── Lookups against the active taxonomy ───────────────────────────────────────
+# The engine reads the compiled Taxonomy tables directly; these wrappers are
+# for scripts and benchmarks.
+
 def get_beta(shock_type: ShockType, sector: Sector) -> float:
-    return SECTOR_BETAS.get(shock_type, {}).get(sector, 0.0)
+    from .taxonomy import current
+    return current().beta(shock_type, sector)
+
+
+def sector_impact_vector(shocks: list[ShockEvent]) -> np.ndarray:
+    """Combined shock impact per sector for the current tick (indexed like the taxonomy's sectors)."""
+    from .taxonomy import current
+    return current().impact_vector(shocks)
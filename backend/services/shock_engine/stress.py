@@ -0,0 +1,166 @@
+"""
+Monte Carlo stress testing.
+
+Runs K independent MarketEngine paths from the seed state under the same shock
+schedule, each with its own RNG seed, across a process pool. Returns percentile
+bands of agent prices, drawdown and cascade probability instead of a single
+noisy path — and never touches the live engine.
+
+Every path's (ticks, agents + 2) float64 results are held at once while they
+are summarised, so a run's size is bounded by paths × ticks × agents rather
+than by paths and ticks separately: runs whose raw results would exceed
+STRESS_MAX_RESULT_MB are rejected up front with StressTooLarge.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from backend.services.market_engine.engine import MarketEngine
+from backend.services.market_engine.models import ShockType
+from backend.services.market_engine.seed_data import SEED_AGENTS, get_seed_agents
+from .taxonomy import Taxonomy, current as current_taxonomy
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (5, 25, 50, 75, 95)
+STRESS_MAX_WORKERS = int(os.environ.get("STRESS_MAX_WORKERS", 0)) or None
+STRESS_MAX_RESULT_MB = int(os.environ.get("STRESS_MAX_RESULT_MB", 64))
+
+_pool: ProcessPoolExecutor | None = None
+
+
+class StressTooLarge(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class ScheduledShock:
+    tick: int                 # tick offset from the start of the path
+    shock_type: ShockType
+    severity: float | None = None
+
+
+def run_path(seed: int, ticks: int, schedule: list[ScheduledShock], taxonomy: Taxonomy | None = None) -> dict:
+    """
+    Simulate one path from a fresh copy of the seed agents.
+    Module-level so it can be pickled into pool workers. The caller's
+    taxonomy is passed along, since workers don't see hot reloads.
+    """
+    engine = MarketEngine(agents=get_seed_agents(), seed=seed, taxonomy=taxonomy)
+    agent_ids = list(engine.state.agents)
+    by_tick: dict[int, list[ScheduledShock]] = {}
+    for s in schedule:
+        by_tick.setdefault(s.tick, []).append(s)
+
+    prices = np.empty((ticks, len(agent_ids)))
+    drawdown = np.empty(ticks)
+    cascade = np.empty(ticks)
+    for t in range(ticks):
+        for s in by_tick.get(t, ()):
+            engine.inject_shock(s.shock_type, severity=s.severity, source="stress")
+        engine.step()
+        prices[t] = [a.price for a in engine.state.agents.values()]
+        drawdown[t] = engine.drawdown_pct
+        cascade[t] = engine.state.cascade_probability
+
+    return {"agent_ids": agent_ids, "prices": prices, "drawdown_pct": drawdown, "cascade_probability": cascade}
+
+
+def summarize(paths: list[dict]) -> dict:
+    """Collapse K path results into per-tick percentile bands."""
+    agent_ids = paths[0]["agent_ids"]
+    prices = np.stack([p["prices"] for p in paths])            # (K, T, N)
+    drawdown = np.stack([p["drawdown_pct"] for p in paths])    # (K, T)
+    cascade = np.stack([p["cascade_probability"] for p in paths])
+
+    def bands(values: np.ndarray, decimals: int) -> dict[str, list[float]]:
+        pct = np.percentile(values, PERCENTILES, axis=0)
+        return {f"p{q}": np.round(row, decimals).tolist() for q, row in zip(PERCENTILES, pct)}
+
+    max_drawdown = drawdown.min(axis=1)
+    return {
+        "paths": len(paths),
+        "ticks": drawdown.shape[1],
+        "percentiles": list(PERCENTILES),
+        "drawdown_pct": bands(drawdown, 4),
+        "cascade_probability": bands(cascade, 4),
+        "max_drawdown_pct": {
+            f"p{q}": round(float(v), 4)
+            for q, v in zip(PERCENTILES, np.percentile(max_drawdown, PERCENTILES))
+        },
+        "agents": {
+            aid: {"price": bands(prices[:, :, j], 2)}
+            for j, aid in enumerate(agent_ids)
+        },
+    }
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn, not fork: the API process runs an event loop and client threads.
+        _pool = ProcessPoolExecutor(
+            max_workers=STRESS_MAX_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def result_bytes(ticks: int, paths: int) -> int:
+    """Raw size of all paths' results: prices per agent plus drawdown and cascade, per tick."""
+    return paths * ticks * (len(SEED_AGENTS) + 2) * 8
+
+
+def check_size(ticks: int, paths: int) -> None:
+    """Raise StressTooLarge if the run's raw results would exceed STRESS_MAX_RESULT_MB."""
+    size = result_bytes(ticks, paths)
+    if size > STRESS_MAX_RESULT_MB * 2**20:
+        raise StressTooLarge(
+            f"{paths} paths x {ticks} ticks needs {size / 2**20:.0f} MB of results "
+            f"(limit {STRESS_MAX_RESULT_MB} MB); reduce paths or ticks"
+        )
+
+
+def _path_seeds(paths: int, seed: int | None) -> list[int]:
+    rng = random.Random(seed)
+    return [rng.getrandbits(32) for _ in range(paths)]
+
+
+def run_stress(schedule: list[ScheduledShock], ticks: int = 30, paths: int = 200,
+               seed: int | None = None) -> dict:
+    """Blocking variant, for scripts and notebooks."""
+    check_size(ticks, paths)
+    seeds = _path_seeds(paths, seed)
+    taxonomy = current_taxonomy()
+    results = list(_get_pool().map(run_path, seeds, [ticks] * paths, [schedule] * paths, [taxonomy] * paths))
+    return summarize(results)
+
+
+async def run_stress_async(schedule: list[ScheduledShock], ticks: int = 30, paths: int = 200,
+                           seed: int | None = None) -> dict:
+    """Event-loop friendly variant: paths run in the pool, aggregation in a thread."""
+    check_size(ticks, paths)
+    loop = asyncio.get_running_loop()
+    pool = _get_pool()
+    taxonomy = current_taxonomy()
+    futures = [
+        loop.run_in_executor(pool, run_path, path_seed, ticks, schedule, taxonomy)
+        for path_seed in _path_seeds(paths, seed)
+    ]
+    results = await asyncio.gather(*futures)
+    logger.info("Stress run complete: %d paths x %d ticks", paths, ticks)
+    return await asyncio.to_thread(summarize, results)
+
+
+def shutdown_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
@@ -0,0 +1,237 @@
+"""
+Sector and shock-type taxonomy, compiled to dense tables.
+
+Without configuration the built-in taxonomy from sector_betas.py is used
+(3 sectors, 5 shock types). TAXONOMY_CONFIG points at a JSON file that
+replaces it:
+
+    {
+      "sectors": ["FRAUD_AML", "COMPLIANCE", "PAYMENTS"],
+      "decay": [1.0, 0.6, 0.3, 0.1],
+      "max_tick_impact": 0.15,
+      "default_severity": 0.65,
+      "shock_types": {
+        "REGULATION": {
+          "betas": {"FRAUD_AML": -0.6, "COMPLIANCE": 0.8},
+          "severity": 0.7,
+          "decay": [1.0, 0.5],
+          "description": "Regulatory crackdown on AI systems announced",
+          "signals": ["TAX", "REGULATION"]
+        }
+      }
+    }
+
+Sectors missing from a shock type's `betas` get 0. The per-type `decay`
+overrides the default schedule, and its length is how many ticks the shock
+lasts. `severity` is the DEMO_MODE severity. `signals` maps ingestion signal
+types onto the shock type.
+
+compile_taxonomy() turns the config into integer-indexed NumPy tables: a
+T×S beta matrix, a T×D decay matrix with a length per type, and per-type
+severities. The engine reads these directly. A Taxonomy is never mutated;
+a reload compiles a new one, which the engine swaps in between ticks
+(MarketEngine.queue_taxonomy).
+"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from backend.services.market_engine.models import Sector, ShockEvent, ShockType
+from .sector_betas import builtin_config
+
+logger = logging.getLogger(__name__)
+
+TAXONOMY_CONFIG = os.environ.get("TAXONOMY_CONFIG")
+DEFAULT_SEVERITY = 0.65
+
+
+class TaxonomyError(ValueError):
+    pass
+
+
+@dataclass(frozen=True, eq=False)
+class Taxonomy:
+    version: int
+    sectors: tuple[Sector, ...]
+    shock_types: tuple[ShockType, ...]
+    sector_index: dict[str, int]
+    shock_type_index: dict[str, int]
+    beta_matrix: np.ndarray          # (shock types, sectors)
+    decay_matrix: np.ndarray         # (shock types, longest schedule), zero-padded
+    durations: np.ndarray            # (shock types,) ticks each type lasts
+    severities: np.ndarray           # (shock types,) DEMO_MODE severity
+    descriptions: tuple[str, ...]
+    signal_map: dict[str, ShockType]
+    max_tick_impact: float
+    default_severity: float
+
+    def beta(self, shock_type: str, sector: str) -> float:
+        t, s = self.shock_type_index.get(shock_type), self.sector_index.get(sector)
+        return 0.0 if t is None or s is None else float(self.beta_matrix[t, s])
+
+    def duration(self, shock_type: str) -> int:
+        return int(self.durations[self.shock_type_index[shock_type]])
+
+    def demo_severity(self, shock_type: str) -> float:
+        t = self.shock_type_index.get(shock_type)
+        return self.default_severity if t is None else float(self.severities[t])
+
+    def description(self, shock_type: str) -> str:
+        t = self.shock_type_index.get(shock_type)
+        return "Market shock event" if t is None else self.descriptions[t]
+
+    def impact_vector(self, shocks: list[ShockEvent]) -> np.ndarray:
+        """
+        Combined shock impact per sector for the current tick (indexed like
+        `sectors`). Each shock is clamped to ±max_tick_impact before summing.
+        Shocks whose type is no longer in the taxonomy contribute nothing.
+        """
+        index = self.shock_type_index
+        live = [s for s in shocks if s.shock_type in index]
+        if not live:
+            return np.zeros(len(self.sectors))
+        n = len(live)
+        type_idx = np.fromiter((index[s.shock_type] for s in live), dtype=np.intp, count=n)
+        severity = np.fromiter((s.severity for s in live), dtype=np.float64, count=n)
+        remaining = np.fromiter((s.ticks_remaining for s in live), dtype=np.intp, count=n)
+        durations = self.durations[type_idx]
+        step = np.clip(durations - remaining, 0, durations - 1)
+        decay = self.decay_matrix[type_idx, step]
+
+        raw = (severity * decay)[:, None] * self.beta_matrix[type_idx]
+        return np.clip(raw, -self.max_tick_impact, self.max_tick_impact).sum(axis=0)
+
+    def summary(self) -> dict:
+        return {
+            "version": self.version,
+            "sectors": [s.value for s in self.sectors],
+            "shock_types": {
+                t.value: {
+                    "betas": dict(zip((s.value for s in self.sectors), self.beta_matrix[i].tolist())),
+                    "decay": self.decay_matrix[i, :self.durations[i]].tolist(),
+                    "severity": float(self.severities[i]),
+                }
+                for i, t in enumerate(self.shock_types)
+            },
+            "max_tick_impact": self.max_tick_impact,
+        }
+
+
+def compile_taxonomy(config: dict, version: int = 0) -> Taxonomy:
+    """
+    Validate a taxonomy config and build its dense tables. Raises TaxonomyError
+    for any malformed value. Names join the Sector / ShockType registries only
+    once the whole config has compiled, so a rejected config leaves no trace.
+    """
+    try:
+        return _compile(config, version)
+    except TaxonomyError:
+        raise
+    except (KeyError, TypeError, ValueError, AttributeError) as e:
+        raise TaxonomyError(f"Invalid taxonomy config: {type(e).__name__}: {e}") from None
+
+
+def _compile(config: dict, version: int) -> Taxonomy:
+    try:
+        sector_names = [_name(s, "sector") for s in config["sectors"]]
+        types_cfg: dict = config["shock_types"]
+    except (KeyError, TypeError) as e:
+        raise TaxonomyError(f"Taxonomy config needs 'sectors' and 'shock_types': {e}") from None
+    if not isinstance(types_cfg, dict):
+        raise TaxonomyError("'shock_types' must map shock type names to their specs")
+    type_names = [_name(t, "shock type") for t in types_cfg]
+    if not sector_names or not type_names:
+        raise TaxonomyError("Taxonomy needs at least one sector and one shock type")
+    if len(set(sector_names)) != len(sector_names):
+        raise TaxonomyError("Duplicate sector names")
+
+    position = {s: j for j, s in enumerate(sector_names)}
+    default_decay = [float(d) for d in config.get("decay", [1.0, 0.6, 0.3, 0.1])]
+    default_severity = float(config.get("default_severity", DEFAULT_SEVERITY))
+    max_tick_impact = float(config.get("max_tick_impact", 0.15))
+
+    schedules, betas, severities, descriptions = [], [], [], []
+    signals: dict[str, str] = {}
+    for t in type_names:
+        spec = types_cfg[t] or {}
+        if not isinstance(spec, dict):
+            raise TaxonomyError(f"Shock type {t}: spec must be an object")
+        row = np.zeros(len(sector_names))
+        for sector, beta in spec.get("betas", {}).items():
+            if sector not in position:
+                raise TaxonomyError(f"Shock type {t}: beta for unknown sector {sector}")
+            row[position[sector]] = float(beta)
+        betas.append(row)
+
+        decay = [float(d) for d in spec.get("decay", default_decay)]
+        if not decay:
+            raise TaxonomyError(f"Shock type {t}: empty decay schedule")
+        schedules.append(decay)
+        severity = float(spec.get("severity", default_severity))
+        if not 0.0 <= severity <= 1.0:
+            raise TaxonomyError(f"Shock type {t}: severity must be within [0, 1]")
+        severities.append(severity)
+        descriptions.append(str(spec.get("description", "Market shock event")))
+        for signal_type in spec.get("signals", ()):
+            signals[str(signal_type).upper()] = t
+
+    decay_matrix = np.zeros((len(type_names), max(len(d) for d in schedules)))
+    for i, decay in enumerate(schedules):
+        decay_matrix[i, :len(decay)] = decay
+
+    # Valid: only now do the names become Sector / ShockType members.
+    sectors = tuple(Sector.register(s) for s in sector_names)
+    shock_types = tuple(ShockType.register(t) for t in type_names)
+    return Taxonomy(
+        version=version,
+        sectors=sectors,
+        shock_types=shock_types,
+        sector_index={s: j for j, s in enumerate(sectors)},
+        shock_type_index={t: i for i, t in enumerate(shock_types)},
+        beta_matrix=np.array(betas, dtype=np.float64),
+        decay_matrix=decay_matrix,
+        durations=np.array([len(d) for d in schedules], dtype=np.intp),
+        severities=np.array(severities, dtype=np.float64),
+        descriptions=tuple(descriptions),
+        signal_map={signal: ShockType.register(t) for signal, t in signals.items()},
+        max_tick_impact=max_tick_impact,
+        default_severity=default_severity,
+    )
+
+
+def _name(value, what: str) -> str:
+    if not isinstance(value, str) or not value:
+        raise TaxonomyError(f"Invalid {what} name {value!r}: must be a non-empty string")
+    return value
+
+
+def load_taxonomy(path: str | Path | None = TAXONOMY_CONFIG, version: int = 0) -> Taxonomy:
+    """Compile TAXONOMY_CONFIG (or `path`); the built-in taxonomy when neither is set."""
+    if not path:
+        return compile_taxonomy(builtin_config(), version)
+    try:
+        config = json.loads(Path(path).read_text())
+    except (OSError, ValueError) as e:
+        raise TaxonomyError(f"Cannot read taxonomy config {path}: {e}") from None
+    taxonomy = compile_taxonomy(config, version)
+    logger.info("Taxonomy v%d from %s: %d sectors, %d shock types",
+                version, path, len(taxonomy.sectors), len(taxonomy.shock_types))
+    return taxonomy
+
+
+_current = load_taxonomy()
+
+
+def current() -> Taxonomy:
+    """The taxonomy the running engine uses (for validation outside the tick)."""
+    return _current
+
+
+def set_current(taxonomy: Taxonomy) -> None:
+    global _current
+    _current = taxonomy